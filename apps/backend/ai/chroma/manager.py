@@ -55,16 +55,19 @@ class ChromaManager:
         persist_path: str | Path | None = None,
         db_path: Path | None = None,
         embedding_function: Any | None = None,
+        client: chromadb.ClientAPI | None = None,
     ) -> None:
-        base_dir = Path(persist_path or os.getenv("CHROMA_PERSIST_PATH", ""))
-        if not base_dir:
-            base_dir = Path(__file__).resolve().parents[4] / ".data" / "chroma"
-        self._persist_path = base_dir.resolve()
-        self._persist_path.mkdir(parents=True, exist_ok=True)
-
-        self._client: chromadb.ClientAPI = chromadb.PersistentClient(
-            path=str(self._persist_path)
-        )
+        if client is not None:
+            # Caller-provided client (e.g. chromadb.EphemeralClient in tests)
+            self._persist_path: Path | None = None
+            self._client: chromadb.ClientAPI = client
+        else:
+            base_dir = Path(persist_path or os.getenv("CHROMA_PERSIST_PATH", ""))
+            if not base_dir:
+                base_dir = Path(__file__).resolve().parents[4] / ".data" / "chroma"
+            self._persist_path = base_dir.resolve()
+            self._persist_path.mkdir(parents=True, exist_ok=True)
+            self._client = chromadb.PersistentClient(path=str(self._persist_path))
 
         self._embedding_function = embedding_function or OllamaEmbeddingFunction()
         self._media_collection = self._get_or_create_collection(MEDIA_COLLECTION_NAME)
@@ -165,20 +168,32 @@ class ChromaManager:
     async def store_voice_query(self, text: str, *, metadata: dict[str, Any] | None = None) -> None:
         """Persist a voice query transcript into the voice collection."""
 
-        payload_meta = dict(metadata or {})
-        payload_meta.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
+        await self.store_voice_queries([(text, metadata)])
 
-        doc_id = f"voice-{uuid.uuid4().hex}"
+    async def store_voice_queries(
+        self, queries: Sequence[tuple[str, dict[str, Any] | None]]
+    ) -> None:
+        """Persist several voice query transcripts with a single collection add."""
+
+        if not queries:
+            return
+
+        timestamp = datetime.now(timezone.utc).isoformat()
+        ids: list[str] = []
+        documents: list[str] = []
+        metadatas: list[dict[str, Any]] = []
+        for text, metadata in queries:
+            payload_meta = dict(metadata or {})
+            payload_meta.setdefault("timestamp", timestamp)
+            ids.append(f"voice-{uuid.uuid4().hex}")
+            documents.append(text or "")
+            metadatas.append(payload_meta)
 
         def _store() -> None:
             try:
-                self._voice_collection.add(
-                    ids=[doc_id],
-                    documents=[text or ""],
-                    metadatas=[payload_meta],
-                )
+                self._voice_collection.add(ids=ids, documents=documents, metadatas=metadatas)
             except Exception as exc:  # pragma: no cover - Chroma internal errors
-                logger.warning("Failed to persist voice query: %s", exc)
+                logger.warning("Failed to persist voice queries: %s", exc)
 
         await asyncio.to_thread(_store)
 
@@ -194,11 +209,15 @@ class ChromaManager:
 
             self._media_collection = self._get_or_create_collection(MEDIA_COLLECTION_NAME)
 
-            if documents:
+            # One add per client batch limit (a single call for typical
+            # libraries); larger catalogs would otherwise be rejected.
+            batch_size = self._client.get_max_batch_size()
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start : start + batch_size]
                 self._media_collection.add(
-                    ids=[doc.doc_id for doc in documents],
-                    documents=[doc.document for doc in documents],
-                    metadatas=[doc.metadata for doc in documents],
+                    ids=[doc.doc_id for doc in batch],
+                    documents=[doc.document for doc in batch],
+                    metadatas=[doc.metadata for doc in batch],
                 )
         except Exception as exc:  # pragma: no cover - Chroma internal errors
             logger.error("Failed to update media semantic index: %s", exc)
@@ -209,7 +228,8 @@ class ChromaManager:
             logger.debug("Media database missing at %s; skipping semantic index rebuild", self._db_path)
             return []
 
-        connection = sqlite3.connect(self._db_path)
+        # Read-only: the rebuild never writes, so skip journal and write locks
+        connection = sqlite3.connect(f"{self._db_path.as_uri()}?mode=ro", uri=True)
         connection.row_factory = sqlite3.Row
 
         sql = """
@@ -105,14 +105,21 @@ class IntentEngine:
             await self._client.aclose()
             self._client = None
 
-    async def list_models(self) -> list[OllamaModelInfo]:
-        """Return the models available in the local Ollama instance."""
+    async def list_models(self, *, raise_errors: bool = False) -> list[OllamaModelInfo]:
+        """Return the models available in the local Ollama instance.
+
+        Request failures are logged and give an empty list, unless
+        ``raise_errors`` is set, in which case the httpx error propagates so
+        callers can tell "no models" apart from "Ollama unreachable".
+        """
 
         client = await self._get_client()
         try:
             response = await client.get("/api/tags")
             response.raise_for_status()
         except httpx.HTTPError as exc:  # pragma: no cover - network issues
+            if raise_errors:
+                raise
             logger.warning("Failed to list Ollama models: %s", exc)
             return []
 
@@ -8,6 +8,7 @@ Supports multiple audio formats and buffering for speech recognition.
 import asyncio
 import logging
 import wave
+from collections import deque
 from datetime import UTC, datetime
 from io import BytesIO
 from pathlib import Path
@@ -24,11 +25,14 @@ class AudioBuffer:
         Args:
             max_duration_seconds: Maximum audio duration to buffer
         """
-        self.chunks: list[bytes] = []
+        self.chunks: deque[bytes] = deque()
+        self._total_bytes = 0
         self.max_duration = max_duration_seconds
         self.sample_rate = 16000  # 16kHz for Whisper
         self.channels = 1  # Mono
         self.sample_width = 2  # 16-bit PCM
+        self._bytes_per_second = self.sample_rate * self.channels * self.sample_width
+        self._max_bytes = int(self._bytes_per_second * max_duration_seconds)
         self.created_at = datetime.now(UTC)
 
     def add_chunk(self, chunk: bytes) -> None:
@@ -38,17 +42,12 @@ class AudioBuffer:
             chunk: Raw PCM audio data
         """
         self.chunks.append(chunk)
+        self._total_bytes += len(chunk)
 
-        # Limit buffer size
-        total_bytes = sum(len(c) for c in self.chunks)
-        bytes_per_second = self.sample_rate * self.channels * self.sample_width
-        max_bytes = int(bytes_per_second * self.max_duration)
-
-        if total_bytes > max_bytes:
-            # Remove oldest chunks
-            while total_bytes > max_bytes and self.chunks:
-                removed = self.chunks.pop(0)
-                total_bytes -= len(removed)
+        # Remove oldest chunks
+        while self._total_bytes > self._max_bytes and self.chunks:
+            removed = self.chunks.popleft()
+            self._total_bytes -= len(removed)
 
     def get_audio_bytes(self) -> bytes:
         """Get concatenated audio data.
@@ -64,13 +63,12 @@ class AudioBuffer:
         Returns:
             Duration in seconds
         """
-        total_bytes = sum(len(c) for c in self.chunks)
-        bytes_per_second = self.sample_rate * self.channels * self.sample_width
-        return total_bytes / bytes_per_second if bytes_per_second > 0 else 0.0
+        return self._total_bytes / self._bytes_per_second
 
     def clear(self) -> None:
         """Clear buffer."""
         self.chunks.clear()
+        self._total_bytes = 0
         self.created_at = datetime.now(UTC)
 
     def save_wav(self, file_path: Path | str) -> None:
@@ -79,16 +77,17 @@ class AudioBuffer:
         Args:
             file_path: Output file path
         """
-        audio_data = self.get_audio_bytes()
-        if not audio_data:
+        if not self._total_bytes:
             logger.warning("No audio data to save")
             return
 
+        # Chunks go to the file one by one; the header is patched on close
         with wave.open(str(file_path), "wb") as wav_file:
             wav_file.setnchannels(self.channels)
             wav_file.setsampwidth(self.sample_width)
             wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(audio_data)
+            for chunk in self.chunks:
+                wav_file.writeframesraw(chunk)
 
         logger.info(
             f"Saved {self.get_duration_seconds():.2f}s audio to {file_path}"
@@ -3,6 +3,7 @@ Tests for audio_relay module.
 """
 
 import asyncio
+import time
 from pathlib import Path
 
 import pytest
@@ -90,6 +91,20 @@ class TestAudioBuffer:
         duration = buffer.get_duration_seconds()
         assert duration <= 2.1  # Allow small margin
 
+    @pytest.mark.perf
+    def test_add_chunk_scaling(self):
+        """Test 100k appends to a full buffer stay linear (no per-append copies)."""
+        buffer = AudioBuffer(max_duration_seconds=30.0)
+        chunk = b"\x01\x00" * 160  # 10ms @ 16kHz mono
+
+        start = time.perf_counter()
+        for _ in range(100_000):
+            buffer.add_chunk(chunk)
+        elapsed = time.perf_counter() - start
+
+        assert buffer.get_duration_seconds() == pytest.approx(30.0)
+        assert elapsed < 1.0
+
     def test_clear(self):
         """Test clearing buffer."""
         buffer = AudioBuffer()
@@ -229,6 +229,20 @@ INSERT OR IGNORE INTO schema_metadata (key, value) VALUES ('version', '1');
 INSERT OR IGNORE INTO schema_metadata (key, value) VALUES ('created_at', datetime('now'));
 """
 
+# Connection setup applied before the schema. WAL mode gives better
+# concurrency and crash recovery.
+INIT_PRAGMAS_SQL = """
+PRAGMA journal_mode=WAL;
+PRAGMA wal_autocheckpoint=1000;
+PRAGMA auto_vacuum=FULL;
+PRAGMA synchronous=NORMAL;
+PRAGMA foreign_keys=ON;
+"""
+
+# Pragmas and schema are sent as one script: a single hop to the aiosqlite
+# worker thread and a single sqlite3_exec call per init_database.
+_INIT_SCRIPT = INIT_PRAGMAS_SQL + SCHEMA_SQL
+
 
 def get_db_path() -> Path:
     """Resolve path to the metadata database."""
@@ -240,25 +254,22 @@ def get_db_path() -> Path:
 
 
 async def init_database(db_path: Path | None = None) -> None:
-    """Initialize database with schema and enable WAL mode."""
+    """Initialize database with schema and enable WAL mode.
+
+    ``db_path`` may also be a SQLite ``file:`` URI (e.g. a shared-cache
+    in-memory database used by the test suite).
+    """
     resolved_path = db_path or get_db_path()
     resolved_path.parent.mkdir(parents=True, exist_ok=True)
-    async with aiosqlite.connect(resolved_path) as db:
-        # Enable WAL mode for better concurrency and crash recovery
-        await db.execute("PRAGMA journal_mode=WAL")
-        await db.execute("PRAGMA wal_autocheckpoint=1000")
-        await db.execute("PRAGMA auto_vacuum=FULL")
-        await db.execute("PRAGMA synchronous=NORMAL")
-        await db.execute("PRAGMA foreign_keys=ON")
-
-        await db.executescript(SCHEMA_SQL)
+    async with aiosqlite.connect(resolved_path, uri=True) as db:
+        await db.executescript(_INIT_SCRIPT)
         await db.commit()
 
 
 async def get_schema_version(db_path: Path) -> int | None:
     """Get current schema version."""
     try:
-        async with aiosqlite.connect(db_path) as db:
+        async with aiosqlite.connect(db_path, uri=True) as db:
             async with db.execute(
                 "SELECT value FROM schema_metadata WHERE key = 'version'"
             ) as cursor:
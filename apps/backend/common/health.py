@@ -1,23 +1,35 @@
 """Common health check endpoint for all services."""
 
-from fastapi import FastAPI
+from functools import lru_cache
 
+from fastapi import APIRouter, FastAPI
 
-def create_health_router(app: FastAPI, service_name: str, version: str = "0.1.0") -> None:
-    """Add health check and version endpoints to a FastAPI app.
 
-    Args:
-        app: FastAPI application instance
-        service_name: Name of the service (e.g., "indexer", "media")
-        version: Service version string
-    """
+@lru_cache(maxsize=None)
+def _build_health_router(service_name: str, version: str) -> APIRouter:
+    """Build the health and version routes once per (service, version)."""
+
+    router = APIRouter()
 
-    @app.get("/healthz")
+    @router.get("/healthz")
     async def health_check() -> dict[str, str]:
         """Health check endpoint."""
         return {"status": "healthy", "service": service_name}
 
-    @app.get("/version")
+    @router.get("/version")
     async def version_info() -> dict[str, str]:
         """Version information endpoint."""
         return {"service": service_name, "version": version}
+
+    return router
+
+
+def create_health_router(app: FastAPI, service_name: str, version: str = "0.1.0") -> None:
+    """Add health check and version endpoints to a FastAPI app.
+
+    Args:
+        app: FastAPI application instance
+        service_name: Name of the service (e.g., "indexer", "media")
+        version: Service version string
+    """
+    app.include_router(_build_health_router(service_name, version))
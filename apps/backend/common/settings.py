@@ -6,7 +6,9 @@ Includes settings for models, shares, privacy flags, theme, and more.
 
 import json
 import logging
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_SETTINGS = {
     # Voice/AI models
     "voice_model": "small",  # Whisper model size
+    "voice_compute_type": "auto",  # Whisper quantization (auto, int8, int8_float16, ...)
     "llm_model": "llama2",  # Local LLM for search assistance
     "stt_enabled": True,
     "tts_enabled": True,
@@ -70,6 +73,8 @@ class SettingsManager:
         self.settings_path = settings_path
         self._settings: dict[str, Any] = {}
         self._loaded = False
+        self._version = 0
+        self._snapshot: tuple[int, Mapping[str, Any]] | None = None
 
     async def load(self) -> None:
         """Load settings from JSON file."""
@@ -80,6 +85,7 @@ class SettingsManager:
         if not self.settings_path.exists():
             self._settings = DEFAULT_SETTINGS.copy()
             self._loaded = True
+            self._version += 1
             await self.save()
             logger.info(f"Created default settings at {self.settings_path}")
             return
@@ -95,6 +101,7 @@ class SettingsManager:
             self._settings.update(loaded)
 
         self._loaded = True
+        self._version += 1
         logger.debug("Settings refreshed from %s", self.settings_path)
 
     async def save(self) -> None:
@@ -137,6 +144,23 @@ class SettingsManager:
 
         return self._settings.copy()
 
+    def snapshot(self) -> Mapping[str, Any]:
+        """Get all settings as a shared snapshot reused until the next write.
+
+        Unlike get_all(), repeated calls return the same mapping while settings
+        are unchanged. It is a read-only view, so callers cannot corrupt the
+        cached copy.
+
+        Returns:
+            Read-only mapping of all settings
+        """
+        if not self._loaded:
+            raise RuntimeError("Settings not loaded. Call load() first.")
+
+        if self._snapshot is None or self._snapshot[0] != self._version:
+            self._snapshot = (self._version, MappingProxyType(self._settings.copy()))
+        return self._snapshot[1]
+
     async def set(self, key: str, value: Any) -> None:
         """Set a setting value.
 
@@ -148,6 +172,7 @@ class SettingsManager:
             raise RuntimeError("Settings not loaded. Call load() first.")
 
         self._settings[key] = value
+        self._version += 1
         await self.save()
         logger.info(f"Updated setting: {key} = {value}")
 
@@ -161,6 +186,7 @@ class SettingsManager:
             raise RuntimeError("Settings not loaded. Call load() first.")
 
         self._settings.update(updates)
+        self._version += 1
         await self.save()
         logger.info(f"Updated {len(updates)} settings")
 
@@ -170,6 +196,7 @@ class SettingsManager:
             raise RuntimeError("Settings not loaded. Call load() first.")
 
         self._settings = DEFAULT_SETTINGS.copy()
+        self._version += 1
         await self.save()
         logger.info("Reset all settings to defaults")
 
@@ -188,6 +215,7 @@ class SettingsManager:
                 self._settings[key] = DEFAULT_SETTINGS[key]
             else:
                 del self._settings[key]
+            self._version += 1
             await self.save()
             logger.info(f"Deleted setting: {key}")
 
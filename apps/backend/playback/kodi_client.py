@@ -4,24 +4,46 @@ Implements a bridge to Kodi's JSON-RPC API for controlling playback.
 Supports play, pause, stop, seek, and state queries.
 """
 
+import itertools
 import logging
+from functools import cached_property
 from typing import Any
 
 import httpx
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Remote input actions mapped to their Kodi JSON-RPC methods
+_ACTION_MAP: dict[str, str] = {
+    "up": "Input.Up",
+    "down": "Input.Down",
+    "left": "Input.Left",
+    "right": "Input.Right",
+    "select": "Input.Select",
+    "back": "Input.Back",
+    "context": "Input.ContextMenu",
+    "info": "Input.Info",
+    "home": "Input.Home",
+    "menu": "Input.ShowOSD",
+}
+
 
 class KodiConfig(BaseModel):
     """Kodi connection configuration."""
 
+    # Frozen so the cached base_url can never go stale
+    model_config = ConfigDict(frozen=True)
+
     host: str = Field(default="localhost", description="Kodi hostname or IP")
     port: int = Field(default=9090, description="Kodi JSON-RPC port")
     username: str | None = Field(default=None, description="Kodi username (if auth enabled)")
     password: str | None = Field(default=None, description="Kodi password (if auth enabled)")
 
-    @property
+    @cached_property
     def base_url(self) -> str:
         """Get the base JSON-RPC URL."""
         return f"http://{self.host}:{self.port}/jsonrpc"
@@ -44,33 +66,66 @@ class PlayerState(BaseModel):
 class KodiClient:
     """Client for communicating with Kodi via JSON-RPC."""
 
-    def __init__(self, config: KodiConfig | None = None):
+    def __init__(
+        self,
+        config: KodiConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         """Initialize Kodi client.
 
         Args:
             config: Kodi configuration. If None, uses defaults.
+            transport: Optional httpx transport override (e.g. a MockTransport in tests)
         """
         self.config = config or KodiConfig()
-        self._request_id = 0
+        self._transport = transport
+        # Bound C-level counter: no lock or Python arithmetic per request
+        self._next_id = itertools.count(1).__next__
         self._client: httpx.AsyncClient | None = None
 
+    async def connect(self) -> "KodiClient":
+        """Open the pooled HTTP client if it is not already open.
+
+        The connection pool is kept for the lifetime of the client, so
+        sequential commands reuse the same keep-alive connection to Kodi.
+        """
+        if self._client is None:
+            auth = None
+            if self.config.username and self.config.password:
+                auth = httpx.BasicAuth(self.config.username, self.config.password)
+
+            self._client = httpx.AsyncClient(
+                auth=auth,
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+                transport=self._transport,
+            )
+        return self
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
     async def __aenter__(self):
         """Context manager entry."""
-        auth = None
-        if self.config.username and self.config.password:
-            auth = httpx.BasicAuth(self.config.username, self.config.password)
-
-        self._client = httpx.AsyncClient(
-            base_url=self.config.base_url,
-            auth=auth,
-            timeout=10.0,
-        )
-        return self
+        return await self.connect()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        if self._client:
-            await self._client.aclose()
+        await self.close()
+
+    def _build_request(self, method: str, params: dict[str, Any] | None) -> dict[str, Any]:
+        """Build a JSON-RPC request object with a fresh request id."""
+        payload: dict[str, Any] = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "id": self._next_id(),
+        }
+        if params:
+            payload["params"] = params
+        return payload
 
     async def _call(self, method: str, params: dict[str, Any] | None = None) -> Any:
         """Call a Kodi JSON-RPC method.
@@ -87,28 +142,60 @@ class KodiClient:
             ValueError: If Kodi returns an error
         """
         if not self._client:
-            raise RuntimeError("Client not initialized. Use 'async with' context manager.")
+            raise RuntimeError("Client not initialized. Use 'async with' or call connect() first.")
 
-        self._request_id += 1
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "id": self._request_id,
-        }
-        if params:
-            payload["params"] = params
+        payload = self._build_request(method, params)
 
         logger.debug(f"Kodi RPC call: {method} with params {params}")
-        response = await self._client.post("", json=payload)
+        response = await self._client.post(
+            self.config.base_url, content=orjson.dumps(payload), headers=_JSON_HEADERS
+        )
         response.raise_for_status()
 
-        result = response.json()
+        result = orjson.loads(response.content)
         if "error" in result:
             error = result["error"]
             raise ValueError(f"Kodi error: {error.get('message', 'Unknown error')}")
 
         return result.get("result")
 
+    async def _call_batch(self, calls: list[tuple[str, dict[str, Any] | None]]) -> list[Any]:
+        """Call several Kodi JSON-RPC methods in one batch request.
+
+        Args:
+            calls: (method, params) pairs; the calls must not depend on each other
+
+        Returns:
+            The results from Kodi, in the same order as ``calls``
+
+        Raises:
+            httpx.HTTPError: If the request fails
+            ValueError: If Kodi returns an error for any call
+        """
+        if not self._client:
+            raise RuntimeError("Client not initialized. Use 'async with' or call connect() first.")
+
+        batch = [self._build_request(method, params) for method, params in calls]
+
+        logger.debug("Kodi RPC batch: %s", [method for method, _ in calls])
+        response = await self._client.post(
+            self.config.base_url, content=orjson.dumps(batch), headers=_JSON_HEADERS
+        )
+        response.raise_for_status()
+
+        # Batch replies may arrive in any order; match them back up by id
+        replies = {reply.get("id"): reply for reply in orjson.loads(response.content)}
+        results = []
+        for request in batch:
+            reply = replies.get(request["id"])
+            if reply is None:
+                raise ValueError(f"Kodi error: no response to {request['method']}")
+            if "error" in reply:
+                error = reply["error"]
+                raise ValueError(f"Kodi error: {error.get('message', 'Unknown error')}")
+            results.append(reply.get("result"))
+        return results
+
     async def application_quit(self) -> bool:
         """Request Kodi to terminate the application."""
 
@@ -166,10 +253,12 @@ class KodiClient:
         """
         try:
             players = await self.get_active_players()
-            for player in players:
-                player_id = player["playerid"]
-                await self._call("Player.Stop", {"playerid": player_id})
-                logger.info(f"Stopped player {player_id}")
+            if players:
+                player_ids = [player["playerid"] for player in players]
+                await self._call_batch(
+                    [("Player.Stop", {"playerid": player_id}) for player_id in player_ids]
+                )
+                logger.info(f"Stopped players {player_ids}")
             return True
         except Exception as e:
             logger.error(f"Failed to stop playback: {e}")
@@ -249,19 +338,21 @@ class KodiClient:
             player = players[0]
             player_id = player["playerid"]
 
-            # Get player properties
-            properties = await self._call(
-                "Player.GetProperties",
-                {
-                    "playerid": player_id,
-                    "properties": ["speed", "time", "totaltime", "position"],
-                },
-            )
-
-            # Get current item info
-            item = await self._call(
-                "Player.GetItem",
-                {"playerid": player_id, "properties": ["title", "file"]},
+            # Player properties and current item info in one round trip
+            properties, item = await self._call_batch(
+                [
+                    (
+                        "Player.GetProperties",
+                        {
+                            "playerid": player_id,
+                            "properties": ["speed", "time", "totaltime", "position"],
+                        },
+                    ),
+                    (
+                        "Player.GetItem",
+                        {"playerid": player_id, "properties": ["title", "file"]},
+                    ),
+                ]
             )
 
             # Calculate position in seconds
@@ -299,6 +390,11 @@ class KodiClient:
             logger.error(f"Failed to get player state: {e}")
             return PlayerState()
 
+    @staticmethod
+    def _validate_volume(volume: int) -> bool:
+        """Return True if ``volume`` is within Kodi's 0-100 range."""
+        return 0 <= volume <= 100
+
     async def set_volume(self, volume: int) -> bool:
         """Set the volume level.
 
@@ -309,7 +405,7 @@ class KodiClient:
             True if volume set successfully
         """
         try:
-            if not 0 <= volume <= 100:
+            if not self._validate_volume(volume):
                 raise ValueError("Volume must be between 0 and 100")
 
             await self._call("Application.SetVolume", {"volume": volume})
@@ -344,23 +440,10 @@ class KodiClient:
             True if the action was delivered, False otherwise
         """
         normalized = action.strip().lower()
-        input_methods: dict[str, str] = {
-            "up": "Input.Up",
-            "down": "Input.Down",
-            "left": "Input.Left",
-            "right": "Input.Right",
-            "select": "Input.Select",
-            "back": "Input.Back",
-            "context": "Input.ContextMenu",
-            "info": "Input.Info",
-            "home": "Input.Home",
-            "menu": "Input.ShowOSD",
-        }
-
         if normalized == "play_pause":
             return await self.pause()
 
-        method = input_methods.get(normalized)
+        method = _ACTION_MAP.get(normalized)
         if method is None:
             raise ValueError(f"Unsupported input action '{action}'")
 
@@ -4,6 +4,8 @@ Playback Service - Manages media playback via Kodi bridge or mpv.
 
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,10 +21,23 @@ __version__ = "0.1.0"
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Hold one pooled Kodi connection for the lifetime of the service."""
+
+    await kodi_client.connect()
+    try:
+        yield
+    finally:
+        await kodi_client.close()
+
+
 app = FastAPI(
     title="WomCast Playback Service",
     description="Media playback control via Kodi/mpv",
     version=__version__,
+    lifespan=lifespan,
 )
 
 _default_origins = (
@@ -53,6 +68,7 @@ kodi_config = KodiConfig(
     username=os.getenv("KODI_USERNAME"),
     password=os.getenv("KODI_PASSWORD"),
 )
+kodi_client = KodiClient(kodi_config)
 
 
 class PlayRequest(BaseModel):
@@ -109,16 +125,15 @@ async def play_media(request: PlayRequest):
     Returns:
         Success status
     """
-    async with KodiClient(kodi_config) as client:
-        # Test connection first
-        if not await client.ping():
-            raise HTTPException(status_code=503, detail="Kodi not available")
+    # Test connection first
+    if not await kodi_client.ping():
+        raise HTTPException(status_code=503, detail="Kodi not available")
 
-        success = await client.play_file(request.file_path)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to start playback")
+    success = await kodi_client.play_file(request.file_path)
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to start playback")
 
-        return {"success": True}
+    return {"success": True}
 
 
 @app.post("/v1/stop", response_model=dict[str, bool])
@@ -128,12 +143,11 @@ async def stop_playback():
     Returns:
         Success status
     """
-    async with KodiClient(kodi_config) as client:
-        success = await client.stop()
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to stop playback")
+    success = await kodi_client.stop()
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to stop playback")
 
-        return {"success": True}
+    return {"success": True}
 
 
 @app.post("/v1/pause", response_model=dict[str, bool])
@@ -143,14 +157,13 @@ async def pause_playback():
     Returns:
         Success status
     """
-    async with KodiClient(kodi_config) as client:
-        success = await client.pause()
-        if not success:
-            raise HTTPException(
-                status_code=404, detail="No active player to pause"
-            )
+    success = await kodi_client.pause()
+    if not success:
+        raise HTTPException(
+            status_code=404, detail="No active player to pause"
+        )
 
-        return {"success": True}
+    return {"success": True}
 
 
 @app.post("/v1/seek", response_model=dict[str, bool])
@@ -163,12 +176,11 @@ async def seek_playback(request: SeekRequest):
     Returns:
         Success status
     """
-    async with KodiClient(kodi_config) as client:
-        success = await client.seek(request.position_seconds)
-        if not success:
-            raise HTTPException(status_code=404, detail="No active player to seek")
+    success = await kodi_client.seek(request.position_seconds)
+    if not success:
+        raise HTTPException(status_code=404, detail="No active player to seek")
 
-        return {"success": True}
+    return {"success": True}
 
 
 @app.get("/v1/player/state", response_model=PlayerState)
@@ -178,8 +190,7 @@ async def get_player_state():
     Returns:
         Current player state with position, duration, etc.
     """
-    async with KodiClient(kodi_config) as client:
-        return await client.get_player_state()
+    return await kodi_client.get_player_state()
 
 
 @app.post("/v1/volume", response_model=dict[str, bool])
@@ -192,12 +203,11 @@ async def set_volume(request: VolumeRequest):
     Returns:
         Success status
     """
-    async with KodiClient(kodi_config) as client:
-        success = await client.set_volume(request.volume)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to set volume")
+    success = await kodi_client.set_volume(request.volume)
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to set volume")
 
-        return {"success": True}
+    return {"success": True}
 
 
 @app.get("/v1/volume", response_model=dict[str, int])
@@ -207,23 +217,21 @@ async def get_volume():
     Returns:
         Volume level (0-100)
     """
-    async with KodiClient(kodi_config) as client:
-        volume = await client.get_volume()
-        return {"volume": volume}
+    volume = await kodi_client.get_volume()
+    return {"volume": volume}
 
 
 @app.post("/v1/volume/adjust", response_model=dict[str, int])
 async def adjust_volume(request: VolumeAdjustRequest):
     """Adjust the volume by a relative delta."""
-    async with KodiClient(kodi_config) as client:
-        current_volume = await client.get_volume()
-        target_volume = max(0, min(100, current_volume + request.delta))
+    current_volume = await kodi_client.get_volume()
+    target_volume = max(0, min(100, current_volume + request.delta))
 
-        success = await client.set_volume(target_volume)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to adjust volume")
+    success = await kodi_client.set_volume(target_volume)
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to adjust volume")
 
-        return {"volume": target_volume}
+    return {"volume": target_volume}
 
 
 @app.post("/v1/input/{action}", response_model=dict[str, bool])
@@ -234,28 +242,26 @@ async def send_input_action(action: str):
     if normalized not in SUPPORTED_INPUT_ACTIONS:
         raise HTTPException(status_code=400, detail=f"Unsupported input action '{action}'")
 
-    async with KodiClient(kodi_config) as client:
-        try:
-            delivered = await client.input_action(normalized)
-        except ValueError as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    try:
+        delivered = await kodi_client.input_action(normalized)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-        if not delivered:
-            raise HTTPException(status_code=500, detail="Failed to send input action")
+    if not delivered:
+        raise HTTPException(status_code=500, detail="Failed to send input action")
 
-        return {"success": True}
+    return {"success": True}
 
 
 @app.post("/v1/application/quit", response_model=dict[str, bool])
 async def quit_application():
     """Close Kodi so the kiosk can return to the web UI."""
 
-    async with KodiClient(kodi_config) as client:
-        success = await client.application_quit()
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to quit Kodi")
+    success = await kodi_client.application_quit()
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to quit Kodi")
 
-        return {"success": True}
+    return {"success": True}
 
 
 @app.get("/v1/ping", response_model=dict[str, bool])
@@ -265,9 +271,8 @@ async def ping_kodi():
     Returns:
         Kodi availability status
     """
-    async with KodiClient(kodi_config) as client:
-        available = await client.ping()
-        return {"available": available}
+    available = await kodi_client.ping()
+    return {"available": available}
 
 
 @app.get("/v1/subtitles", response_model=list[dict])
@@ -277,8 +282,7 @@ async def get_subtitles():
     Returns:
         List of subtitle tracks with index, language, and current status
     """
-    async with KodiClient(kodi_config) as client:
-        return await client.get_subtitles()
+    return await kodi_client.get_subtitles()
 
 
 class SubtitleRequest(BaseModel):
@@ -297,12 +301,11 @@ async def set_subtitle(request: SubtitleRequest):
     Returns:
         Success status
     """
-    async with KodiClient(kodi_config) as client:
-        success = await client.set_subtitle(request.subtitle_index)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to set subtitle")
+    success = await kodi_client.set_subtitle(request.subtitle_index)
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to set subtitle")
 
-        return {"success": True}
+    return {"success": True}
 
 
 @app.post("/v1/subtitles/toggle", response_model=dict[str, bool])
@@ -312,12 +315,11 @@ async def toggle_subtitles():
     Returns:
         Success status
     """
-    async with KodiClient(kodi_config) as client:
-        success = await client.toggle_subtitles()
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to toggle subtitles")
+    success = await kodi_client.toggle_subtitles()
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to toggle subtitles")
 
-        return {"success": True}
+    return {"success": True}
 
 
 app.include_router(cec_router)
@@ -3,15 +3,16 @@
 import asyncio
 import base64
 import io
-import json
 import logging
 import os
 import sqlite3
+from collections.abc import Mapping
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import httpx
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
@@ -187,14 +188,16 @@ async def _fetch_voice_history() -> dict[str, Any]:
 
     try:
         async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{VOICE_SERVICE_URL}/v1/voice/history")
+            # The stream endpoint returns the whole history; the plain listing
+            # only returns the most recent entries
+            response = await client.get(f"{VOICE_SERVICE_URL}/v1/voice/history/stream")
             response.raise_for_status()
-            payload = response.json()
+            entries = [orjson.loads(line) for line in response.content.splitlines() if line]
     except Exception as exc:  # pragma: no cover - remote service issues
         logger.warning("Voice history export failed: %s", exc)
         return {"success": False, "error": str(exc)}
 
-    return {"success": True, "data": payload}
+    return {"success": True, "data": {"entries": entries, "total_entries": len(entries)}}
 
 
 async def _delete_voice_history() -> dict[str, Any]:
@@ -332,7 +335,7 @@ async def startup() -> None:
 
 
 @app.get("/v1/settings")
-async def get_settings() -> dict[str, Any]:
+async def get_settings() -> Mapping[str, Any]:
     """
     Get all settings.
 
@@ -340,7 +343,7 @@ async def get_settings() -> dict[str, Any]:
         Dictionary of all settings
     """
     manager = get_settings_manager(SETTINGS_PATH)
-    return manager.get_all()
+    return manager.snapshot()
 
 
 @app.get("/v1/settings/{key}")
@@ -449,16 +452,17 @@ async def export_privacy_data() -> StreamingResponse:
     voice_history = await voice_history_task
     cast_sessions = await cast_sessions_task
 
+    now = datetime.now(timezone.utc)
     payload = {
-        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "exported_at": now.isoformat(),
         "settings": settings_data,
         "voice_history": voice_history,
         "cast_sessions": cast_sessions,
         "database": database_dump,
     }
 
-    json_bytes = json.dumps(payload, indent=2).encode("utf-8")
-    filename = f"womcast-privacy-export-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    json_bytes = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    filename = f"womcast-privacy-export-{now:%Y%m%dT%H%M%SZ}.json"
 
     return StreamingResponse(
         io.BytesIO(json_bytes),
@@ -4,6 +4,8 @@ Provides REST API for configuring and mounting network shares.
 """
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
@@ -11,28 +13,40 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 
 from ..common.health import create_health_router
-from ..storage.network import NetworkShareManager
+from ..storage.network import NetworkShare, NetworkShareManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Initialize network share manager
+CONFIG_PATH = Path("/opt/womcast/data/network-shares.json")
+if not CONFIG_PATH.parent.exists():
+    # Development fallback
+    CONFIG_PATH = Path("network-shares.json")
+
+share_manager = NetworkShareManager(CONFIG_PATH)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start batched config persistence and flush pending writes on shutdown."""
+    await share_manager.start()
+    try:
+        yield
+    finally:
+        await share_manager.stop()
+
+
 app = FastAPI(
     title="WomCast Storage Service",
     description="Network share management (SMB/NFS)",
     version="0.2.0",
+    lifespan=lifespan,
 )
 
 # Health check endpoints
 create_health_router(app, "storage", "0.2.0")
 
-# Initialize network share manager
-CONFIG_PATH = Path("/opt/womcast/data/network-shares.json")
-if not CONFIG_PATH.parent.exists():
-    # Development fallback
-    CONFIG_PATH = Path("network-shares.json")
-
-share_manager = NetworkShareManager(CONFIG_PATH)
-
 
 # Request/Response Models
 class ShareCreateRequest(BaseModel):
@@ -74,26 +88,29 @@ class ShareResponse(BaseModel):
     is_mounted: bool
 
 
+def _to_response(share: NetworkShare, mounted: bool) -> ShareResponse:
+    """Build a share response from trusted manager state without re-validation."""
+    return ShareResponse.model_construct(
+        id=share.id,
+        name=share.name,
+        protocol=share.protocol,
+        host=share.host,
+        share_path=share.share_path,
+        mount_point=str(share.mount_point),
+        username=share.username,
+        enabled=share.enabled,
+        auto_index=share.auto_index,
+        is_mounted=mounted,
+    )
+
+
 # API Endpoints
 @app.get("/v1/shares", response_model=list[ShareResponse])
 async def list_shares() -> list[ShareResponse]:
     """List all configured network shares."""
     shares = share_manager.list_shares()
-    return [
-        ShareResponse(
-            id=share.id,
-            name=share.name,
-            protocol=share.protocol,
-            host=share.host,
-            share_path=share.share_path,
-            mount_point=str(share.mount_point),
-            username=share.username,
-            enabled=share.enabled,
-            auto_index=share.auto_index,
-            is_mounted=share_manager.is_mounted(share.id),
-        )
-        for share in shares
-    ]
+    mounted = share_manager.mounted_points()
+    return [_to_response(share, str(share.mount_point) in mounted) for share in shares]
 
 
 @app.post("/v1/shares", response_model=ShareResponse, status_code=201)
@@ -118,18 +135,7 @@ async def create_share(request: ShareCreateRequest) -> ShareResponse:
         auto_index=request.auto_index,
     )
 
-    return ShareResponse(
-        id=share.id,
-        name=share.name,
-        protocol=share.protocol,
-        host=share.host,
-        share_path=share.share_path,
-        mount_point=str(share.mount_point),
-        username=share.username,
-        enabled=share.enabled,
-        auto_index=share.auto_index,
-        is_mounted=share_manager.is_mounted(share.id),
-    )
+    return _to_response(share, share_manager.is_mounted(share.id))
 
 
 @app.get("/v1/shares/{share_id}", response_model=ShareResponse)
@@ -139,18 +145,7 @@ async def get_share(share_id: str) -> ShareResponse:
     if not share:
         raise HTTPException(status_code=404, detail="Share not found")
 
-    return ShareResponse(
-        id=share.id,
-        name=share.name,
-        protocol=share.protocol,
-        host=share.host,
-        share_path=share.share_path,
-        mount_point=str(share.mount_point),
-        username=share.username,
-        enabled=share.enabled,
-        auto_index=share.auto_index,
-        is_mounted=share_manager.is_mounted(share.id),
-    )
+    return _to_response(share, share_manager.is_mounted(share.id))
 
 
 @app.put("/v1/shares/{share_id}", response_model=ShareResponse)
@@ -163,24 +158,13 @@ async def update_share(share_id: str, request: ShareUpdateRequest) -> ShareRespo
     if not share:
         raise HTTPException(status_code=404, detail="Share not found")
 
-    return ShareResponse(
-        id=share.id,
-        name=share.name,
-        protocol=share.protocol,
-        host=share.host,
-        share_path=share.share_path,
-        mount_point=str(share.mount_point),
-        username=share.username,
-        enabled=share.enabled,
-        auto_index=share.auto_index,
-        is_mounted=share_manager.is_mounted(share.id),
-    )
+    return _to_response(share, share_manager.is_mounted(share.id))
 
 
 @app.delete("/v1/shares/{share_id}", status_code=204)
 async def delete_share(share_id: str) -> None:
     """Delete network share configuration."""
-    if not share_manager.remove_share(share_id):
+    if not await share_manager.remove_share(share_id):
         raise HTTPException(status_code=404, detail="Share not found")
 
 
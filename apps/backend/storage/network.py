@@ -5,12 +5,15 @@ Supports user-configured shares with credential management.
 """
 
 import asyncio
-import json
 import logging
-from dataclasses import dataclass
+import os
+import tempfile
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,14 +33,72 @@ class NetworkShare:
     auto_index: bool = False
 
 
+_SHARE_FIELDS = frozenset(field.name for field in fields(NetworkShare))
+
+
 class NetworkShareManager:
     """Manages network share mounting and configuration."""
 
-    def __init__(self, config_path: Path):
+    def __init__(self, config_path: Path, flush_interval: float = 0.5):
+        """Initialize share manager.
+
+        Args:
+            config_path: Path to the JSON share configuration file
+            flush_interval: Seconds between batched config writes once started
+        """
         self.config_path = config_path
         self.shares: dict[str, NetworkShare] = {}
+        self._flush_interval = flush_interval
+        self._dirty = False
+        self._flush_task: asyncio.Task[None] | None = None
         self._load_config()
 
+    async def start(self) -> None:
+        """Start the background config flusher."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+            logger.info("Network share config flusher started")
+
+    async def stop(self) -> None:
+        """Stop the background flusher and persist any pending changes."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write the config file now if there are unsaved changes."""
+        if self._dirty:
+            self._dirty = False
+            # Snapshot on the event loop so the writer thread never sees a
+            # shares dict that is being mutated.
+            payload = self._serialize_config()
+            if not await asyncio.to_thread(self._write_config, payload):
+                # Retry on the next flush rather than losing the changes
+                self._dirty = True
+
+    async def _flush_loop(self) -> None:
+        """Background task coalescing config writes."""
+        while True:
+            try:
+                await asyncio.sleep(self._flush_interval)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in config flush loop: {e}")
+
+    def _mark_dirty(self) -> None:
+        """Schedule a config write, or write immediately if the flusher is not running."""
+        if self._flush_task is None:
+            self._save_config()
+        else:
+            self._dirty = True
+
     def _load_config(self) -> None:
         """Load share configuration from JSON file."""
         if not self.config_path.exists():
@@ -45,52 +106,45 @@ class NetworkShareManager:
             return
 
         try:
-            with open(self.config_path) as f:
-                data = json.load(f)
-                for share_data in data.get("shares", []):
-                    share = NetworkShare(
-                        id=share_data["id"],
-                        name=share_data["name"],
-                        protocol=share_data["protocol"],
-                        host=share_data["host"],
-                        share_path=share_data["share_path"],
-                        mount_point=Path(share_data["mount_point"]),
-                        username=share_data.get("username"),
-                        password=share_data.get("password"),
-                        enabled=share_data.get("enabled", True),
-                        auto_index=share_data.get("auto_index", False),
-                    )
-                    self.shares[share.id] = share
+            data = orjson.loads(self.config_path.read_bytes())
+            for share_data in data.get("shares", []):
+                values = {k: v for k, v in share_data.items() if k in _SHARE_FIELDS}
+                values["mount_point"] = Path(values["mount_point"])
+                share = NetworkShare(**values)
+                self.shares[share.id] = share
             logger.info(f"Loaded {len(self.shares)} network shares from config")
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
 
-    def _save_config(self) -> None:
-        """Save share configuration to JSON file."""
+    def _serialize_config(self) -> bytes:
+        """Serialize the current share configuration to JSON bytes."""
+        # orjson encodes the dataclasses natively; only Path needs a fallback
+        return orjson.dumps(
+            {"shares": list(self.shares.values())},
+            default=str,
+            option=orjson.OPT_INDENT_2,
+        )
+
+    def _write_config(self, payload: bytes) -> bool:
+        """Atomically replace the config file with ``payload``.
+
+        Returns:
+            True if the file was written, False if the write failed (logged)
+        """
         try:
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            data = {
-                "shares": [
-                    {
-                        "id": share.id,
-                        "name": share.name,
-                        "protocol": share.protocol,
-                        "host": share.host,
-                        "share_path": share.share_path,
-                        "mount_point": str(share.mount_point),
-                        "username": share.username,
-                        "password": share.password,
-                        "enabled": share.enabled,
-                        "auto_index": share.auto_index,
-                    }
-                    for share in self.shares.values()
-                ]
-            }
-            with open(self.config_path, "w") as f:
-                json.dump(data, f, indent=2)
-            logger.info(f"Saved {len(self.shares)} network shares to config")
+            tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self.config_path)
+            logger.info(f"Saved network shares config to {self.config_path}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
+            return False
+
+    def _save_config(self) -> None:
+        """Save share configuration to JSON file."""
+        self._write_config(self._serialize_config())
 
     def add_share(
         self,
@@ -122,21 +176,21 @@ class NetworkShareManager:
             auto_index=auto_index,
         )
         self.shares[share_id] = share
-        self._save_config()
+        self._mark_dirty()
         logger.info(f"Added network share: {name} ({protocol}://{host}{share_path})")
         return share
 
-    def remove_share(self, share_id: str) -> bool:
-        """Remove a network share configuration."""
+    async def remove_share(self, share_id: str) -> bool:
+        """Remove a network share configuration, unmounting it first."""
         if share_id not in self.shares:
             return False
 
         share = self.shares[share_id]
         if self.is_mounted(share_id):
-            asyncio.create_task(self.unmount(share_id))
+            await self.unmount(share_id)
 
         del self.shares[share_id]
-        self._save_config()
+        self._mark_dirty()
         logger.info(f"Removed network share: {share.name}")
         return True
 
@@ -150,7 +204,7 @@ class NetworkShareManager:
             if hasattr(share, key):
                 setattr(share, key, value)
 
-        self._save_config()
+        self._mark_dirty()
         logger.info(f"Updated network share: {share.name}")
         return share
 
@@ -170,6 +224,27 @@ class NetworkShareManager:
 
         return share.mount_point.exists() and share.mount_point.is_mount()
 
+    def mounted_points(self) -> set[str]:
+        """Return mount points of all currently mounted shares.
+
+        Reads the kernel mount table once instead of stat-ing every share,
+        falling back to per-share checks where /proc is unavailable.
+        """
+        try:
+            with open("/proc/self/mounts") as f:
+                active = {line.split()[1].replace("\\040", " ") for line in f}
+        except OSError:
+            return {
+                str(share.mount_point)
+                for share_id, share in self.shares.items()
+                if self.is_mounted(share_id)
+            }
+        return {
+            str(share.mount_point)
+            for share in self.shares.values()
+            if str(share.mount_point.absolute()) in active
+        }
+
     async def mount(self, share_id: str) -> bool:
         """Mount a network share."""
         share = self.shares.get(share_id)
@@ -189,16 +264,14 @@ class NetworkShareManager:
         share.mount_point.mkdir(parents=True, exist_ok=True)
 
         # Build mount command
+        credentials_file: str | None = None
         if share.protocol == "smb":
             cmd = ["mount", "-t", "cifs"]
             source = f"//{share.host}{share.share_path}"
-            options = []
-            if share.username:
-                options.append(f"username={share.username}")
-            if share.password:
-                options.append(f"password={share.password}")
-            if options:
-                cmd.extend(["-o", ",".join(options)])
+            if share.username or share.password:
+                # Keep credentials out of argv so they never show up in ps
+                credentials_file = self._write_credentials_file(share)
+                cmd.extend(["-o", f"credentials={credentials_file}"])
             cmd.extend([source, str(share.mount_point)])
         elif share.protocol == "nfs":
             cmd = ["mount", "-t", "nfs"]
@@ -210,25 +283,41 @@ class NetworkShareManager:
 
         # Execute mount command
         try:
-            logger.info(f"Mounting {share.name}: {' '.join(cmd[:-2])} ...")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Mounting %s: %s ...", share.name, " ".join(cmd[:-2]))
             result = await asyncio.create_subprocess_exec(
                 *cmd,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await result.communicate()
+            _, stderr = await result.communicate()
 
-            if result.returncode == 0:
-                logger.info(f"Successfully mounted: {share.name}")
-                return True
-            else:
+            if result.returncode:
                 logger.error(
-                    f"Mount failed: {share.name} - {stderr.decode().strip()}"
+                    "Mount failed: %s - %s",
+                    share.name,
+                    stderr.decode(errors="replace").strip(),
                 )
                 return False
+            logger.info("Successfully mounted: %s", share.name)
+            return True
         except Exception as e:
             logger.error(f"Mount exception: {share.name} - {e}")
             return False
+        finally:
+            if credentials_file:
+                Path(credentials_file).unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_credentials_file(share: NetworkShare) -> str:
+        """Write a mount.cifs credentials file readable only by the owner."""
+        fd, path = tempfile.mkstemp(prefix="womcast-cifs-", suffix=".cred")
+        with os.fdopen(fd, "w") as f:
+            if share.username:
+                f.write(f"username={share.username}\n")
+            if share.password:
+                f.write(f"password={share.password}\n")
+        return path
 
     async def unmount(self, share_id: str) -> bool:
         """Unmount a network share."""
@@ -247,30 +336,29 @@ class NetworkShareManager:
             result = await asyncio.create_subprocess_exec(
                 "umount",
                 str(share.mount_point),
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await result.communicate()
+            _, stderr = await result.communicate()
 
-            if result.returncode == 0:
-                logger.info(f"Successfully unmounted: {share.name}")
-                return True
-            else:
+            if result.returncode:
                 logger.error(
-                    f"Unmount failed: {share.name} - {stderr.decode().strip()}"
+                    "Unmount failed: %s - %s",
+                    share.name,
+                    stderr.decode(errors="replace").strip(),
                 )
                 return False
+            logger.info("Successfully unmounted: %s", share.name)
+            return True
         except Exception as e:
             logger.error(f"Unmount exception: {share.name} - {e}")
             return False
 
     async def mount_all(self) -> dict[str, bool]:
-        """Mount all enabled network shares."""
-        results = {}
-        for share_id, share in self.shares.items():
-            if share.enabled:
-                results[share_id] = await self.mount(share_id)
-        return results
+        """Mount all enabled network shares concurrently."""
+        share_ids = [share_id for share_id, share in self.shares.items() if share.enabled]
+        outcomes = await asyncio.gather(*(self.mount(share_id) for share_id in share_ids))
+        return dict(zip(share_ids, outcomes, strict=True))
 
     async def unmount_all(self) -> dict[str, bool]:
         """Unmount all network shares."""
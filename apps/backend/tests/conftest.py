@@ -0,0 +1,128 @@
+"""Shared pytest fixtures for backend tests."""
+
+import asyncio
+import sqlite3
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator
+from pathlib import Path
+
+import aiosqlite
+import pytest
+from fastapi.testclient import TestClient
+
+from common import settings as common_settings
+from common.database import SCHEMA_SQL
+from common.settings import SettingsManager
+from settings import main as settings_main
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is optional and POSIX-only
+    uvloop = None
+
+
+# Per-connection settings trading durability for speed. EXCLUSIVE locking is
+# deliberately omitted: the code under test opens its own connections.
+_FAST_TEST_PRAGMAS = """
+PRAGMA foreign_keys=ON;
+PRAGMA journal_mode=MEMORY;
+PRAGMA synchronous=OFF;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+"""
+
+
+if uvloop is not None:
+
+    def pytest_asyncio_loop_factories(
+        config: pytest.Config, item: pytest.Item
+    ) -> dict[str, Callable[[], asyncio.AbstractEventLoop]]:
+        """Run async tests on uvloop when it is installed."""
+
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def _fast_init_database(connection: sqlite3.Connection) -> None:
+    """Apply the production schema in one executescript call.
+
+    Skips init_database's aiosqlite worker thread and WAL setup; tests that
+    exercise init_database itself still call it directly.
+    """
+
+    connection.executescript(SCHEMA_SQL)
+    connection.commit()
+
+
+@pytest.fixture(scope="session")
+def schema_template(tmp_path_factory: pytest.TempPathFactory) -> Iterator[sqlite3.Connection]:
+    """Initialize the media schema once per session for cloning into tests."""
+
+    template_path = tmp_path_factory.mktemp("schema") / "template.db"
+    connection = sqlite3.connect(template_path)
+    try:
+        _fast_init_database(connection)
+        yield connection
+    finally:
+        connection.close()
+
+
+@pytest.fixture()
+def memory_schema_db(schema_template: sqlite3.Connection) -> Iterator[Path]:
+    """Yield an in-memory database URI pre-populated with the media schema."""
+
+    uri = f"file:memdb_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    anchor = sqlite3.connect(uri, uri=True)
+    try:
+        schema_template.backup(anchor)
+        yield Path(uri)
+    finally:
+        anchor.close()
+
+
+@pytest.fixture()
+def schema_db(schema_template: sqlite3.Connection, tmp_path: Path) -> Path:
+    """Return an on-disk database cloned from the schema template."""
+
+    db_path = tmp_path / "test.db"
+    target = sqlite3.connect(db_path)
+    try:
+        schema_template.backup(target)
+    finally:
+        target.close()
+    return db_path
+
+
+@pytest.fixture()
+async def db_conn(schema_db: Path) -> AsyncIterator[aiosqlite.Connection]:
+    """Yield one connection to ``schema_db`` shared by a whole test."""
+
+    async with aiosqlite.connect(schema_db) as db:
+        await db.executescript(_FAST_TEST_PRAGMAS)
+        yield db
+
+
+@pytest.fixture(scope="session")
+def settings_client(tmp_path_factory: pytest.TempPathFactory) -> Iterator[TestClient]:
+    """Start the settings service once per session against a scratch settings file."""
+
+    with pytest.MonkeyPatch.context() as mp:
+        settings_path = tmp_path_factory.mktemp("settings") / "settings.json"
+        mp.setattr(settings_main, "SETTINGS_PATH", settings_path)
+        mp.setattr(common_settings, "_settings_manager", None)
+        with TestClient(settings_main.app) as client:
+            yield client
+
+
+@pytest.fixture()
+def settings_manager(
+    settings_client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> SettingsManager:
+    """Point the settings service at ``tmp_path`` with a freshly loaded manager."""
+
+    monkeypatch.setattr(settings_main, "SETTINGS_PATH", tmp_path / "settings.json")
+    monkeypatch.setattr(settings_main, "DATABASE_PATH", tmp_path / "womcast.db")
+    monkeypatch.setattr(common_settings, "_settings_manager", None)
+    manager = common_settings.get_settings_manager(settings_main.SETTINGS_PATH)
+    # Load on the app's event loop, as the startup hook would
+    settings_client.portal.call(manager.load)
+    return manager
@@ -1,44 +1,68 @@
 """Tests for HDMI-CEC FastAPI router."""
 
+from collections.abc import AsyncIterator, Iterator
 from unittest.mock import AsyncMock
 
+import httpx
 import pytest
 from fastapi import FastAPI
-from fastapi.testclient import TestClient
 
-from playback.cec_helper import CecDevice, CecDeviceType
+from playback.cec_helper import CecDevice, CecDeviceType, CecHelper
 from playback.cec_routes import router
 
 
-@pytest.fixture()
-def app_client(monkeypatch: pytest.MonkeyPatch) -> tuple[TestClient, AsyncMock]:
-    """Create a TestClient with a mocked CEC helper instance."""
+@pytest.fixture(scope="module")
+def cec_app() -> Iterator[tuple[FastAPI, AsyncMock]]:
+    """Create one app per module with a mocked CEC helper instance."""
 
-    helper = AsyncMock()
+    # spec limits the mock to real CecHelper methods and catches typos
+    helper = AsyncMock(spec=CecHelper)
     helper.cec_client_path = "cec-client"
 
-    monkeypatch.setattr("playback.cec_routes.get_cec_helper", lambda: helper)
-
     app = FastAPI()
     app.include_router(router)
 
-    return TestClient(app), helper
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("playback.cec_routes.get_cec_helper", lambda: helper)
+        yield app, helper
+
+
+@pytest.fixture(autouse=True)
+def reset_helper(cec_app: tuple[FastAPI, AsyncMock]) -> None:
+    """Clear recorded calls and configured results between tests."""
+
+    _, helper = cec_app
+    helper.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture()
+async def app_client(
+    cec_app: tuple[FastAPI, AsyncMock],
+) -> AsyncIterator[tuple[httpx.AsyncClient, AsyncMock]]:
+    """Create an in-process ASGI client bound to the module app."""
+
+    app, helper = cec_app
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client, helper
 
 
-def test_check_cec_available(app_client: tuple[TestClient, AsyncMock]) -> None:
+@pytest.mark.asyncio
+async def test_check_cec_available(app_client: tuple[httpx.AsyncClient, AsyncMock]) -> None:
     """CEC availability endpoint returns helper status."""
 
     client, helper = app_client
     helper.is_available.return_value = True
 
-    response = client.get("/v1/cec/available")
+    response = await client.get("/v1/cec/available")
 
     assert response.status_code == 200
     helper.is_available.assert_awaited_once()
     assert response.json() == {"available": True, "client_path": "cec-client"}
 
 
-def test_list_devices(app_client: tuple[TestClient, AsyncMock]) -> None:
+@pytest.mark.asyncio
+async def test_list_devices(app_client: tuple[httpx.AsyncClient, AsyncMock]) -> None:
     """Devices endpoint returns serialized helper data."""
 
     client, helper = app_client
@@ -53,7 +77,7 @@ def test_list_devices(app_client: tuple[TestClient, AsyncMock]) -> None:
         )
     ]
 
-    response = client.get("/v1/cec/devices")
+    response = await client.get("/v1/cec/devices")
 
     assert response.status_code == 200
     helper.scan_devices.assert_awaited_once()
@@ -69,17 +93,20 @@ def test_list_devices(app_client: tuple[TestClient, AsyncMock]) -> None:
     ]
 
 
-def test_switch_requires_parameters(app_client: tuple[TestClient, AsyncMock]) -> None:
+@pytest.mark.asyncio
+async def test_switch_requires_parameters(
+    app_client: tuple[httpx.AsyncClient, AsyncMock],
+) -> None:
     """Switch endpoint validates request body and triggers helper methods."""
 
     client, helper = app_client
     helper.switch_to_device.return_value = True
 
-    response = client.post("/v1/cec/switch", json={"address": 4})
+    response = await client.post("/v1/cec/switch", json={"address": 4})
 
     assert response.status_code == 200
     helper.switch_to_device.assert_awaited_once_with(4)
     assert response.json()["success"] is True
 
-    response_missing = client.post("/v1/cec/switch", json={})
+    response_missing = await client.post("/v1/cec/switch", json={})
     assert response_missing.status_code == 400
\ No newline at end of file
@@ -1,14 +1,17 @@
 import sqlite3
 from pathlib import Path
 
+import chromadb
+import numpy as np
 import pytest
+from chromadb.config import Settings
 
 from ai.chroma.manager import ChromaManager
 
 
 class _DeterministicEmbedding:
     def __call__(self, input):
-        return [[self._encode(text)] for text in input]
+        return self._encode_batch(input)
 
     def name(self) -> str:
         return "deterministic"
@@ -18,25 +21,36 @@ class _DeterministicEmbedding:
         return True
 
     def embed_documents(self, input):
-        return self.__call__(input)
+        return self._encode_batch(input)
 
     def embed_query(self, input):
         if isinstance(input, str):
-            return [[self._encode(input)]]
+            return self._encode_batch([input])
         if isinstance(input, list):
-            return [[self._encode(input[0] if input else "")]]
-        return [[self._encode(str(input))]]
+            return self._encode_batch(input[:1] or [""])
+        return self._encode_batch([str(input)])
 
     @staticmethod
-    def _encode(text: str) -> float:
-        return float(len(text or ""))
+    def _encode_batch(texts) -> np.ndarray:
+        # One float32 column of text lengths, built in a single C-level pass
+        lengths = np.fromiter(
+            (len(text or "") for text in texts), dtype=np.float32, count=len(texts)
+        )
+        return lengths.reshape(-1, 1)
 
 
 def _prepare_database(path: Path) -> None:
-    connection = sqlite3.connect(path)
+    connection = sqlite3.connect(path, isolation_level=None)
     try:
+        # Schema and fixture rows go in under a single transaction
         connection.executescript(
             """
+            PRAGMA journal_mode=MEMORY;
+            PRAGMA synchronous=OFF;
+            PRAGMA temp_store=MEMORY;
+
+            BEGIN IMMEDIATE;
+
             CREATE TABLE media_files (
                 id INTEGER PRIMARY KEY,
                 file_name TEXT NOT NULL,
@@ -83,7 +97,7 @@ def _prepare_database(path: Path) -> None:
             """
         )
 
-        connection.execute(
+        connection.executemany(
             """
             INSERT INTO media_files (
                 id, file_name, file_path, media_type, duration_seconds,
@@ -91,37 +105,41 @@ def _prepare_database(path: Path) -> None:
                 modified_at, indexed_at
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                1,
-                "chill_jazz.mp3",
-                "/media/music/chill_jazz.mp3",
-                "audio",
-                200,
-                0,
-                0,
-                "2025-01-01T00:00:00Z",
-                "2025-01-01T00:00:00Z",
-                "2025-01-01T00:00:00Z",
-            ),
+            [
+                (
+                    1,
+                    "chill_jazz.mp3",
+                    "/media/music/chill_jazz.mp3",
+                    "audio",
+                    200,
+                    0,
+                    0,
+                    "2025-01-01T00:00:00Z",
+                    "2025-01-01T00:00:00Z",
+                    "2025-01-01T00:00:00Z",
+                ),
+            ],
         )
 
-        connection.execute(
+        connection.executemany(
             """
             INSERT INTO audio_tracks (
                 media_file_id, title, artist, album, genre, year
             ) VALUES (?, ?, ?, ?, ?, ?)
             """,
-            (
-                1,
-                "Chill Jazz",
-                "Various Artists",
-                "Jazz Lounge",
-                "Jazz",
-                2024,
-            ),
+            [
+                (
+                    1,
+                    "Chill Jazz",
+                    "Various Artists",
+                    "Jazz Lounge",
+                    "Jazz",
+                    2024,
+                ),
+            ],
         )
 
-        connection.commit()
+        connection.execute("COMMIT")
     finally:
         connection.close()
 
@@ -129,13 +147,14 @@ def _prepare_database(path: Path) -> None:
 @pytest.mark.asyncio
 async def test_rebuild_and_search(tmp_path: Path) -> None:
     db_path = tmp_path / "library.db"
-    persist_path = tmp_path / "chroma"
     _prepare_database(db_path)
 
+    # In-memory Chroma; telemetry off so parallel workers stay offline
+    client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
     manager = ChromaManager(
-        persist_path=persist_path,
         db_path=db_path,
         embedding_function=_DeterministicEmbedding(),
+        client=client,
     )
 
     rebuilt = await manager.rebuild_media_index()
@@ -146,3 +165,20 @@ async def test_rebuild_and_search(tmp_path: Path) -> None:
     assert results[0].media_id == 1
     assert results[0].metadata["media_type"] == "audio"
     assert "Chill Jazz" in (results[0].title or "")
+
+
+@pytest.mark.asyncio
+async def test_store_voice_queries_adds_batch(tmp_path: Path) -> None:
+    client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
+    manager = ChromaManager(
+        db_path=tmp_path / "library.db",
+        embedding_function=_DeterministicEmbedding(),
+        client=client,
+    )
+
+    await manager.store_voice_queries([("play jazz", {"source": "voice-intent"}), ("pause", None)])
+    await manager.store_voice_query("stop")
+
+    stored = manager._voice_collection.get(include=["documents", "metadatas"])
+    assert sorted(stored["documents"]) == ["pause", "play jazz", "stop"]
+    assert all("timestamp" in metadata for metadata in stored["metadatas"])
@@ -1,18 +1,34 @@
 """Test suite for common health endpoints."""
 
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
 from fastapi import FastAPI
-from fastapi.testclient import TestClient
 
-from common.health import create_health_router
+from common.health import _build_health_router, create_health_router
 
 
-def test_health_check() -> None:
-    """Test health check endpoint returns healthy status."""
+@pytest.fixture(scope="module")
+def app() -> FastAPI:
+    """Create one health-enabled app for the module."""
     app = FastAPI()
     create_health_router(app, "test-service", "1.0.0")
-    client = TestClient(app)
+    return app
+
 
-    response = client.get("/healthz")
+@pytest.fixture()
+async def client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    """Create an in-process ASGI client bound to the module app."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_health_check(client: httpx.AsyncClient) -> None:
+    """Test health check endpoint returns healthy status."""
+    response = await client.get("/healthz")
 
     assert response.status_code == 200
     data = response.json()
@@ -20,15 +36,24 @@ def test_health_check() -> None:
     assert data["service"] == "test-service"
 
 
-def test_version_info() -> None:
+@pytest.mark.asyncio
+async def test_version_info(client: httpx.AsyncClient) -> None:
     """Test version endpoint returns correct service info."""
-    app = FastAPI()
-    create_health_router(app, "test-service", "1.0.0")
-    client = TestClient(app)
-
-    response = client.get("/version")
+    response = await client.get("/version")
 
     assert response.status_code == 200
     data = response.json()
     assert data["service"] == "test-service"
     assert data["version"] == "1.0.0"
+
+
+def test_health_router_reused_across_apps() -> None:
+    """Apps for the same service share one prebuilt health router."""
+    first, second = FastAPI(), FastAPI()
+    create_health_router(first, "shared-service", "1.0.0")
+    create_health_router(second, "shared-service", "1.0.0")
+
+    assert _build_health_router("shared-service", "1.0.0") is _build_health_router(
+        "shared-service", "1.0.0"
+    )
+    assert {"/healthz", "/version"} <= second.openapi()["paths"].keys()
@@ -1,13 +1,12 @@
 """Tests for media file indexer service."""
 
-import tempfile
+import os
 from datetime import UTC, datetime
 from pathlib import Path
 
 import aiosqlite
 import pytest
 
-from ..common.database import init_database
 from ..metadata.indexer import (
     detect_deleted_files,
     get_media_type,
@@ -18,6 +17,15 @@ from ..metadata.indexer import (
 )
 
 
+def _mkfile(path: Path, content: bytes) -> None:
+    """Create a small fixture file with raw os calls (no text encoding layer)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
+
+
 def test_get_media_type():
     """Test media type detection from file extensions."""
     assert get_media_type(Path("/test/movie.mkv")) == "video"
@@ -28,258 +36,233 @@ def test_get_media_type():
 
 
 @pytest.mark.asyncio
-async def test_initialize_mount_point():
+async def test_initialize_mount_point(schema_db: Path, db_conn: aiosqlite.Connection):
     """Test mount point registration."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        await init_database(db_path)
-
-        # Initialize new mount point
-        mount_id = await initialize_mount_point(
-            db_path, "/media/usb", "USB Drive"
-        )
-        assert mount_id is not None
-
-        # Verify mount point exists
-        async with aiosqlite.connect(db_path) as db:
-            async with db.execute(
-                "SELECT mount_path, label, is_active FROM mount_points WHERE id = ?",
-                (mount_id,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                assert row is not None
-                mount_path, label, is_active = row
-                assert mount_path == "/media/usb"
-                assert label == "USB Drive"
-                assert is_active == 1
-
-        # Initialize same mount point again (should reuse)
-        mount_id2 = await initialize_mount_point(
-            db_path, "/media/usb", "USB Drive"
-        )
-        assert mount_id2 == mount_id
+    # Initialize new mount point
+    mount_id = await initialize_mount_point(
+        schema_db, "/media/usb", "USB Drive"
+    )
+    assert mount_id is not None
+
+    # Verify mount point exists
+    async with db_conn.execute(
+        "SELECT mount_path, label, is_active FROM mount_points WHERE id = ?",
+        (mount_id,),
+    ) as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        mount_path, label, is_active = row
+        assert mount_path == "/media/usb"
+        assert label == "USB Drive"
+        assert is_active == 1
+
+    # Initialize same mount point again (should reuse)
+    mount_id2 = await initialize_mount_point(
+        schema_db, "/media/usb", "USB Drive"
+    )
+    assert mount_id2 == mount_id
 
 
 @pytest.mark.asyncio
-async def test_scan_directory():
+async def test_scan_directory(tmp_path: Path):
     """Test directory scanning for media files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        root = Path(tmpdir)
-
-        # Create test directory structure
-        (root / "videos").mkdir()
-        (root / "videos" / "movie1.mkv").touch()
-        (root / "videos" / "movie2.mp4").touch()
-        (root / "videos" / "readme.txt").touch()
-
-        (root / "music").mkdir()
-        (root / "music" / "song1.mp3").touch()
-        (root / "music" / "song2.flac").touch()
-
-        (root / "photos").mkdir()
-        (root / "photos" / "pic1.jpg").touch()
-
-        # Scan for all media files
-        files = []
-        async for file_path in scan_directory(root):
-            files.append(file_path.relative_to(root))
-
-        # Should find 5 media files, not readme.txt
-        assert len(files) == 5
-        assert Path("videos/movie1.mkv") in files
-        assert Path("videos/movie2.mp4") in files
-        assert Path("music/song1.mp3") in files
-        assert Path("music/song2.flac") in files
-        assert Path("photos/pic1.jpg") in files
-        assert Path("videos/readme.txt") not in files
+    root = tmp_path
+
+    # Create test directory structure
+    for rel in (
+        "videos/movie1.mkv",
+        "videos/movie2.mp4",
+        "videos/readme.txt",
+        "music/song1.mp3",
+        "music/song2.flac",
+        "photos/pic1.jpg",
+    ):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+    # Scan for all media files
+    files = [file_path.relative_to(root) async for file_path in scan_directory(root)]
+
+    # Should find 5 media files, not readme.txt
+    assert len(files) == 5
+    assert set(files) == {
+        Path("videos/movie1.mkv"),
+        Path("videos/movie2.mp4"),
+        Path("music/song1.mp3"),
+        Path("music/song2.flac"),
+        Path("photos/pic1.jpg"),
+    }
 
 
 @pytest.mark.asyncio
-async def test_index_file():
+async def test_index_file(
+    schema_db: Path, db_conn: aiosqlite.Connection, tmp_path: Path
+):
     """Test indexing a single media file."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        await init_database(db_path)
-
-        # Create test file
-        test_file = Path(tmpdir) / "test_video.mkv"
-        test_file.write_text("fake video content")
-
-        # Initialize mount point
-        mount_id = await initialize_mount_point(db_path, tmpdir, "Test Mount")
-
-        # Index the file
-        async with aiosqlite.connect(db_path) as db:
-            await db.execute("PRAGMA foreign_keys = ON")
-
-            media_file_id = await index_file(db, test_file, mount_id)
-            await db.commit()
-
-            assert media_file_id is not None
-
-            # Verify file was indexed
-            async with db.execute(
-                """
-                SELECT file_name, file_size, media_type, mount_point_id
-                FROM media_files
-                WHERE id = ?
-                """,
-                (media_file_id,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                assert row is not None
-                file_name, file_size, media_type, mp_id = row
-                assert file_name == "test_video.mkv"
-                assert file_size > 0
-                assert media_type == "video"
-                assert mp_id == mount_id
+    # Create test file
+    test_file = tmp_path / "test_video.mkv"
+    test_file.write_text("fake video content")
+
+    # Initialize mount point
+    mount_id = await initialize_mount_point(schema_db, str(tmp_path), "Test Mount")
+
+    # Index the file
+    media_file_id = await index_file(db_conn, test_file, mount_id)
+    await db_conn.commit()
+
+    assert media_file_id is not None
+
+    # Verify file was indexed
+    async with db_conn.execute(
+        """
+        SELECT file_name, file_size, media_type, mount_point_id
+        FROM media_files
+        WHERE id = ?
+        """,
+        (media_file_id,),
+    ) as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        file_name, file_size, media_type, mp_id = row
+        assert file_name == "test_video.mkv"
+        assert file_size > 0
+        assert media_type == "video"
+        assert mp_id == mount_id
 
 
 @pytest.mark.asyncio
-async def test_index_file_update():
+async def test_index_file_update(
+    schema_db: Path, db_conn: aiosqlite.Connection, tmp_path: Path
+):
     """Test that re-indexing unchanged file updates timestamp only."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        await init_database(db_path)
-
-        # Create test file
-        test_file = Path(tmpdir) / "test_video.mkv"
-        test_file.write_text("fake video content")
-
-        # Initialize mount point
-        mount_id = await initialize_mount_point(db_path, tmpdir, "Test Mount")
-
-        # Index the file twice
-        async with aiosqlite.connect(db_path) as db:
-            await db.execute("PRAGMA foreign_keys = ON")
-
-            media_file_id1 = await index_file(db, test_file, mount_id)
-            await db.commit()
-
-            # Get initial indexed_at timestamp
-            async with db.execute(
-                "SELECT indexed_at FROM media_files WHERE id = ?",
-                (media_file_id1,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                assert row is not None
-                indexed_at1 = row[0]
-
-            # Index again (file unchanged)
-            media_file_id2 = await index_file(db, test_file, mount_id)
-            await db.commit()
-
-            # Should return same ID
-            assert media_file_id2 == media_file_id1
-
-            # indexed_at should be updated
-            async with db.execute(
-                "SELECT indexed_at FROM media_files WHERE id = ?",
-                (media_file_id1,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                assert row is not None
-                indexed_at2 = row[0]
-
-            # Timestamps should be different (within reason)
-            assert indexed_at2 >= indexed_at1
+    # Create test file
+    test_file = tmp_path / "test_video.mkv"
+    test_file.write_text("fake video content")
+
+    # Initialize mount point
+    mount_id = await initialize_mount_point(schema_db, str(tmp_path), "Test Mount")
+
+    # Index the file twice
+    media_file_id1 = await index_file(db_conn, test_file, mount_id)
+    await db_conn.commit()
+
+    # Get initial indexed_at timestamp
+    async with db_conn.execute(
+        "SELECT indexed_at FROM media_files WHERE id = ?",
+        (media_file_id1,),
+    ) as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        indexed_at1 = row[0]
+
+    # Index again (file unchanged)
+    media_file_id2 = await index_file(db_conn, test_file, mount_id)
+    await db_conn.commit()
+
+    # Should return same ID
+    assert media_file_id2 == media_file_id1
+
+    # indexed_at should be updated
+    async with db_conn.execute(
+        "SELECT indexed_at FROM media_files WHERE id = ?",
+        (media_file_id1,),
+    ) as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        indexed_at2 = row[0]
+
+    # Timestamps should be different (within reason)
+    assert indexed_at2 >= indexed_at1
 
 
 @pytest.mark.asyncio
-async def test_scan_mount_point():
+async def test_scan_mount_point(
+    schema_db: Path, db_conn: aiosqlite.Connection, tmp_path: Path
+):
     """Test full mount point scanning."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        await init_database(db_path)
-
-        # Create test directory structure
-        root = Path(tmpdir) / "media"
-        root.mkdir()
-        (root / "movie1.mkv").write_text("movie 1")
-        (root / "movie2.mp4").write_text("movie 2")
-        (root / "song.mp3").write_text("song")
-        (root / "readme.txt").write_text("readme")
-
-        # Initialize mount point
-        mount_id = await initialize_mount_point(db_path, str(root), "Test Media")
-
-        # Scan mount point
-        scanned, indexed = await scan_mount_point(db_path, root, mount_id)
-
-        # Should scan 4 files, index 3 media files
-        assert scanned == 3  # Only media files are scanned
-        assert indexed == 3
-
-        # Verify scan_history was recorded
-        async with aiosqlite.connect(db_path) as db:
-            async with db.execute(
-                """
-                SELECT status, files_scanned, files_indexed
-                FROM scan_history
-                WHERE mount_point_id = ?
-                """,
-                (mount_id,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                assert row is not None
-                status, files_scanned, files_indexed = row
-                assert status == "completed"
-                assert files_scanned == 3
-                assert files_indexed == 3
+    # Create test directory structure
+    root = tmp_path / "media"
+    root.mkdir()
+    _mkfile(root / "movie1.mkv", b"movie 1")
+    _mkfile(root / "movie2.mp4", b"movie 2")
+    _mkfile(root / "song.mp3", b"song")
+    _mkfile(root / "readme.txt", b"readme")
+
+    # Initialize mount point
+    mount_id = await initialize_mount_point(schema_db, str(root), "Test Media")
+
+    # Scan mount point
+    scanned, indexed = await scan_mount_point(schema_db, root, mount_id)
+
+    # Should scan 4 files, index 3 media files
+    assert scanned == 3  # Only media files are scanned
+    assert indexed == 3
+
+    # Verify scan_history was recorded
+    async with db_conn.execute(
+        """
+        SELECT status, files_scanned, files_indexed
+        FROM scan_history
+        WHERE mount_point_id = ?
+        """,
+        (mount_id,),
+    ) as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        status, files_scanned, files_indexed = row
+        assert status == "completed"
+        assert files_scanned == 3
+        assert files_indexed == 3
 
 
 @pytest.mark.asyncio
-async def test_detect_deleted_files():
+async def test_detect_deleted_files(
+    schema_db: Path, db_conn: aiosqlite.Connection, tmp_path: Path
+):
     """Test detection and removal of deleted files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        await init_database(db_path)
-
-        # Create test files
-        root = Path(tmpdir) / "media"
-        root.mkdir()
-        file1 = root / "movie1.mkv"
-        file2 = root / "movie2.mp4"
-        file1.write_text("movie 1")
-        file2.write_text("movie 2")
-
-        # Initialize mount point and scan
-        mount_id = await initialize_mount_point(db_path, str(root), "Test Media")
-        await scan_mount_point(db_path, root, mount_id)
-
-        # Verify both files are indexed
-        async with aiosqlite.connect(db_path) as db:
-            async with db.execute(
-                "SELECT COUNT(*) FROM media_files WHERE mount_point_id = ?",
-                (mount_id,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                assert row is not None
-                count = row[0]
-                assert count == 2
-
-        # Delete one file
-        file1.unlink()
-
-        # Force old indexed_at timestamp for testing
-        async with aiosqlite.connect(db_path) as db:
-            old_timestamp = datetime.now(UTC).replace(year=2020).isoformat()
-            await db.execute(
-                "UPDATE media_files SET indexed_at = ?", (old_timestamp,)
-            )
-            await db.commit()
-
-        # Detect deleted files
-        deleted = await detect_deleted_files(db_path, mount_id, scan_threshold_hours=1)
-        assert deleted == 1
-
-        # Verify only one file remains
-        async with aiosqlite.connect(db_path) as db:
-            async with db.execute(
-                "SELECT file_name FROM media_files WHERE mount_point_id = ?",
-                (mount_id,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                assert row is not None
-                file_name = row[0]
-                assert file_name == "movie2.mp4"
+    # Create test files
+    root = tmp_path / "media"
+    root.mkdir()
+    file1 = root / "movie1.mkv"
+    file2 = root / "movie2.mp4"
+    _mkfile(file1, b"movie 1")
+    _mkfile(file2, b"movie 2")
+
+    # Initialize mount point and scan
+    mount_id = await initialize_mount_point(schema_db, str(root), "Test Media")
+    await scan_mount_point(schema_db, root, mount_id)
+
+    # Verify both files are indexed
+    async with db_conn.execute(
+        "SELECT COUNT(*) FROM media_files WHERE mount_point_id = ?",
+        (mount_id,),
+    ) as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        count = row[0]
+        assert count == 2
+
+    # Delete one file
+    file1.unlink()
+
+    # Force old indexed_at timestamp for testing
+    old_timestamp = datetime.now(UTC).replace(year=2020).isoformat()
+    await db_conn.execute(
+        "UPDATE media_files SET indexed_at = ?", (old_timestamp,)
+    )
+    await db_conn.commit()
+
+    # Detect deleted files
+    deleted = await detect_deleted_files(schema_db, mount_id, scan_threshold_hours=1)
+    assert deleted == 1
+
+    # Verify only one file remains
+    async with db_conn.execute(
+        "SELECT file_name FROM media_files WHERE mount_point_id = ?",
+        (mount_id,),
+    ) as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        file_name = row[0]
+        assert file_name == "movie2.mp4"
@@ -0,0 +1,57 @@
+"""Test suite for the orjson request route class."""
+
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from common.json_route import ORJSONRoute
+
+
+class _Echo(BaseModel):
+    text: str
+    count: int = 1
+
+
+@pytest.fixture(scope="module")
+def app() -> FastAPI:
+    """Create an app whose routes parse JSON with orjson."""
+    app = FastAPI()
+    app.router.route_class = ORJSONRoute
+
+    @app.post("/echo", response_model=_Echo)
+    async def echo(payload: _Echo) -> _Echo:
+        return payload
+
+    return app
+
+
+@pytest.fixture()
+async def client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    """Create an in-process ASGI client bound to the module app."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_json_body_is_validated(client: httpx.AsyncClient) -> None:
+    """Bodies decoded by orjson still go through the Pydantic model."""
+    response = await client.post("/echo", json={"text": "héllo", "count": 2})
+    assert response.status_code == 200
+    assert response.json() == {"text": "héllo", "count": 2}
+
+    response = await client.post("/echo", json={"count": "many"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_malformed_json_is_rejected(client: httpx.AsyncClient) -> None:
+    """Malformed JSON surfaces as a 422 validation error, not a 500."""
+    response = await client.post(
+        "/echo", content=b'{"text": ', headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
@@ -1,11 +1,96 @@
 """Tests for Kodi JSON-RPC client."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import json
+from collections import ChainMap
+from typing import Any
 
 import httpx
 import pytest
-
-from ..playback.kodi_client import KodiClient, KodiConfig
+from pydantic import ValidationError
+
+from ..playback.kodi_client import _ACTION_MAP, KodiClient, KodiConfig
+
+
+# Canned Kodi replies (the JSON-RPC envelope minus "jsonrpc" and "id")
+_PONG = {"result": "pong"}
+_OK = {"result": "OK"}
+_NO_PLAYERS = {"result": []}
+_VIDEO_PLAYER = {"result": [{"playerid": 1, "type": "video"}]}
+_FILE_NOT_FOUND = {"error": {"message": "File not found"}}
+_INVALID_PLAYER = {"error": {"message": "Invalid player"}}
+_PLAYER_PROPERTIES = {
+    "result": {
+        "speed": 1,
+        "time": {"hours": 0, "minutes": 5, "seconds": 30, "milliseconds": 500},
+        "totaltime": {"hours": 1, "minutes": 30, "seconds": 0, "milliseconds": 0},
+        "position": 0,
+    }
+}
+_PLAYER_ITEM = {"result": {"item": {"title": "Test Movie", "file": "/media/test/movie.mkv"}}}
+
+# Default Kodi replies keyed by JSON-RPC method; tests override entries as needed
+_DEFAULT_REPLIES: dict[str, dict[str, Any] | Exception] = {
+    "JSONRPC.Ping": _PONG,
+    "Player.GetActivePlayers": _VIDEO_PLAYER,
+    "Player.Open": _OK,
+    "Player.Stop": _OK,
+    "Player.PlayPause": _OK,
+    "Player.Seek": _OK,
+    "Player.GetProperties": _PLAYER_PROPERTIES,
+    "Player.GetItem": _PLAYER_ITEM,
+    "Application.SetVolume": {"result": 75},
+    "Application.GetProperties": {"result": {"volume": 85}},
+    "Input.Up": _OK,
+    "Input.Left": _OK,
+}
+
+
+class _KodiRpcStub:
+    """Answers posted JSON-RPC requests from a per-method reply table.
+
+    Per-test overrides sit in front of the module-level defaults, so a
+    reset only has to drop the overrides.
+    """
+
+    def __init__(self) -> None:
+        self.replies: ChainMap[str, dict[str, Any] | Exception] = ChainMap({}, _DEFAULT_REPLIES)
+        self.calls: list[dict[str, Any]] = []
+        self.posts = 0
+
+    def reset(self) -> None:
+        self.replies.maps[0].clear()
+        self.calls.clear()
+        self.posts = 0
+
+    def _reply(self, call: dict[str, Any]) -> dict[str, Any]:
+        self.calls.append(call)
+        reply = self.replies[call["method"]]
+        if isinstance(reply, Exception):
+            raise reply
+        return {"jsonrpc": "2.0", "id": call["id"], **reply}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.posts += 1
+        assert (request.method, request.url.path) == ("POST", "/jsonrpc")
+        assert request.headers["content-type"] == "application/json"
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            # JSON-RPC lets batch replies come back in any order; reverse them
+            # so the client has to match replies to calls by id
+            return httpx.Response(200, json=[self._reply(call) for call in body][::-1])
+        return httpx.Response(200, json=self._reply(body))
+
+
+@pytest.fixture(scope="module")
+def kodi_rpc() -> _KodiRpcStub:
+    """Reply table shared by every test in the module."""
+    return _KodiRpcStub()
+
+
+@pytest.fixture(scope="module")
+def kodi_transport(kodi_rpc: _KodiRpcStub) -> httpx.MockTransport:
+    """Mock transport routing Kodi requests to the reply table."""
+    return httpx.MockTransport(kodi_rpc)
 
 
 @pytest.fixture
@@ -15,10 +100,11 @@ def kodi_config():
 
 
 @pytest.fixture
-def mock_httpx_client():
-    """Mock httpx AsyncClient."""
-    client = AsyncMock(spec=httpx.AsyncClient)
-    return client
+async def kodi_client(kodi_config, kodi_rpc, kodi_transport):
+    """Connected Kodi client backed by the mock transport."""
+    kodi_rpc.reset()
+    async with KodiClient(kodi_config, transport=kodi_transport) as client:
+        yield client
 
 
 @pytest.mark.asyncio
@@ -33,244 +119,146 @@ async def test_kodi_config():
         host="192.168.1.100", port=8080, username="kodi", password="pass"
     )
     assert config_with_auth.base_url == "http://192.168.1.100:8080/jsonrpc"
+    assert config_with_auth.base_url is config_with_auth.base_url
+
+    with pytest.raises(ValidationError):
+        config_with_auth.port = 9091
 
 
 @pytest.mark.asyncio
-async def test_kodi_ping_success(kodi_config, mock_httpx_client):
+async def test_kodi_ping_success(kodi_client, kodi_rpc):
     """Test successful Kodi ping."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"jsonrpc": "2.0", "result": "pong", "id": 1}
-    mock_httpx_client.post.return_value = mock_response
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.ping()
-            assert result is True
-            mock_httpx_client.post.assert_called_once()
+    result = await kodi_client.ping()
+    assert result is True
+    assert [call["method"] for call in kodi_rpc.calls] == ["JSONRPC.Ping"]
 
 
 @pytest.mark.asyncio
-async def test_kodi_ping_failure(kodi_config, mock_httpx_client):
+async def test_kodi_ping_failure(kodi_client, kodi_rpc):
     """Test failed Kodi ping."""
-    mock_httpx_client.post.side_effect = httpx.HTTPError("Connection failed")
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.ping()
-            assert result is False
-
-
-@pytest.mark.asyncio
-async def test_play_file_success(kodi_config, mock_httpx_client):
-    """Test successful file playback."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"jsonrpc": "2.0", "result": "OK", "id": 1}
-    mock_httpx_client.post.return_value = mock_response
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.play_file("/media/test/movie.mkv")
-            assert result is True
-            assert mock_httpx_client.post.called
+    kodi_rpc.replies["JSONRPC.Ping"] = httpx.ConnectError("Connection failed")
+
+    result = await kodi_client.ping()
+    assert result is False
+
+
+_NO_ACTIVE_PLAYERS = {"Player.GetActivePlayers": _NO_PLAYERS}
+
+# (client method, args, reply overrides, expected result, expected RPC methods)
+_CONTROL_CASES = [
+    pytest.param(
+        "play_file", ("/media/test/movie.mkv",), {}, True, ["Player.Open"], id="play_file"
+    ),
+    pytest.param(
+        "play_file",
+        ("/invalid/path.mkv",),
+        {"Player.Open": _FILE_NOT_FOUND},
+        False,
+        ["Player.Open"],
+        id="play_file_error",
+    ),
+    pytest.param(
+        "stop", (), {}, True, ["Player.GetActivePlayers", "Player.Stop"], id="stop"
+    ),
+    pytest.param(
+        "pause", (), {}, True, ["Player.GetActivePlayers", "Player.PlayPause"], id="pause"
+    ),
+    pytest.param(
+        "pause",
+        (),
+        _NO_ACTIVE_PLAYERS,
+        False,
+        ["Player.GetActivePlayers"],
+        id="pause_no_active_players",
+    ),
+    # Seek to 1 hour, 30 minutes, 45 seconds (5445 seconds)
+    pytest.param(
+        "seek", (5445.5,), {}, True, ["Player.GetActivePlayers", "Player.Seek"], id="seek"
+    ),
+]
 
 
 @pytest.mark.asyncio
-async def test_play_file_error(kodi_config, mock_httpx_client):
-    """Test file playback error."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
-        "jsonrpc": "2.0",
-        "error": {"message": "File not found"},
-        "id": 1,
-    }
-    mock_httpx_client.post.return_value = mock_response
+@pytest.mark.parametrize("method,args,overrides,expected,rpc_methods", _CONTROL_CASES)
+async def test_playback_control(
+    kodi_client, kodi_rpc, method, args, overrides, expected, rpc_methods
+):
+    """Playback controls issue the expected RPCs and report success."""
+    kodi_rpc.replies.update(overrides)
 
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.play_file("/invalid/path.mkv")
-            assert result is False
+    result = await getattr(kodi_client, method)(*args)
+    assert result is expected
+    assert [call["method"] for call in kodi_rpc.calls] == rpc_methods
 
 
 @pytest.mark.asyncio
-async def test_stop_playback(kodi_config, mock_httpx_client):
-    """Test stopping playback."""
-    mock_response_players = MagicMock()
-    mock_response_players.json.return_value = {
-        "jsonrpc": "2.0",
-        "result": [{"playerid": 1, "type": "video"}],
-        "id": 1,
+async def test_stop_batches_all_active_players(kodi_client, kodi_rpc):
+    """Stopping several players sends every Player.Stop in one batch request."""
+    kodi_rpc.replies["Player.GetActivePlayers"] = {
+        "result": [{"playerid": 0, "type": "audio"}, {"playerid": 1, "type": "video"}]
     }
 
-    mock_response_stop = MagicMock()
-    mock_response_stop.json.return_value = {"jsonrpc": "2.0", "result": "OK", "id": 2}
-
-    mock_httpx_client.post.side_effect = [mock_response_players, mock_response_stop]
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.stop()
-            assert result is True
-            assert mock_httpx_client.post.call_count == 2
-
-
-@pytest.mark.asyncio
-async def test_pause_playback(kodi_config, mock_httpx_client):
-    """Test pausing playback."""
-    mock_response_players = MagicMock()
-    mock_response_players.json.return_value = {
-        "jsonrpc": "2.0",
-        "result": [{"playerid": 1, "type": "video"}],
-        "id": 1,
-    }
-
-    mock_response_pause = MagicMock()
-    mock_response_pause.json.return_value = {"jsonrpc": "2.0", "result": "OK", "id": 2}
-
-    mock_httpx_client.post.side_effect = [mock_response_players, mock_response_pause]
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.pause()
-            assert result is True
-
-
-@pytest.mark.asyncio
-async def test_pause_no_active_players(kodi_config, mock_httpx_client):
-    """Test pausing when no players are active."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"jsonrpc": "2.0", "result": [], "id": 1}
-    mock_httpx_client.post.return_value = mock_response
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.pause()
-            assert result is False
+    result = await kodi_client.stop()
+    assert result is True
+    assert kodi_rpc.posts == 2
+    assert [call["params"] for call in kodi_rpc.calls[1:]] == [{"playerid": 0}, {"playerid": 1}]
+    assert [call["id"] for call in kodi_rpc.calls] == [1, 2, 3]
 
 
 @pytest.mark.asyncio
-async def test_seek_playback(kodi_config, mock_httpx_client):
-    """Test seeking to a position."""
-    mock_response_players = MagicMock()
-    mock_response_players.json.return_value = {
-        "jsonrpc": "2.0",
-        "result": [{"playerid": 1, "type": "video"}],
-        "id": 1,
-    }
-
-    mock_response_seek = MagicMock()
-    mock_response_seek.json.return_value = {"jsonrpc": "2.0", "result": "OK", "id": 2}
-
-    mock_httpx_client.post.side_effect = [mock_response_players, mock_response_seek]
+async def test_call_batch_raises_on_error(kodi_client, kodi_rpc):
+    """An error reply for any call in a batch fails the whole batch."""
+    kodi_rpc.replies["Player.Stop"] = _INVALID_PLAYER
 
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            # Seek to 1 hour, 30 minutes, 45 seconds (5445 seconds)
-            result = await client.seek(5445.5)
-            assert result is True
+    with pytest.raises(ValueError, match="Invalid player"):
+        await kodi_client._call_batch([("JSONRPC.Ping", None), ("Player.Stop", {"playerid": 9})])
 
 
 @pytest.mark.asyncio
-async def test_get_player_state_active(kodi_config, mock_httpx_client):
+async def test_get_player_state_active(kodi_client, kodi_rpc):
     """Test getting player state when playing."""
-    mock_response_players = MagicMock()
-    mock_response_players.json.return_value = {
-        "jsonrpc": "2.0",
-        "result": [{"playerid": 1, "type": "video"}],
-        "id": 1,
-    }
-
-    mock_response_properties = MagicMock()
-    mock_response_properties.json.return_value = {
-        "jsonrpc": "2.0",
-        "result": {
-            "speed": 1,
-            "time": {"hours": 0, "minutes": 5, "seconds": 30, "milliseconds": 500},
-            "totaltime": {"hours": 1, "minutes": 30, "seconds": 0, "milliseconds": 0},
-            "position": 0,
-        },
-        "id": 2,
-    }
-
-    mock_response_item = MagicMock()
-    mock_response_item.json.return_value = {
-        "jsonrpc": "2.0",
-        "result": {
-            "item": {"title": "Test Movie", "file": "/media/test/movie.mkv"}
-        },
-        "id": 3,
-    }
-
-    mock_httpx_client.post.side_effect = [
-        mock_response_players,
-        mock_response_properties,
-        mock_response_item,
-    ]
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            state = await client.get_player_state()
-            assert state.player_id == 1
-            assert state.playing is True
-            assert state.paused is False
-            assert state.position_seconds == 330.5  # 5m 30.5s
-            assert state.duration_seconds == 5400.0  # 1h 30m
-            assert state.title == "Test Movie"
-            assert state.file_path == "/media/test/movie.mkv"
+    state = await kodi_client.get_player_state()
+    assert kodi_rpc.posts == 2  # GetActivePlayers, then one batch
+    assert state.player_id == 1
+    assert state.playing is True
+    assert state.paused is False
+    assert state.position_seconds == 330.5  # 5m 30.5s
+    assert state.duration_seconds == 5400.0  # 1h 30m
+    assert state.title == "Test Movie"
+    assert state.file_path == "/media/test/movie.mkv"
 
 
 @pytest.mark.asyncio
-async def test_get_player_state_inactive(kodi_config, mock_httpx_client):
+async def test_get_player_state_inactive(kodi_client, kodi_rpc):
     """Test getting player state when no players are active."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"jsonrpc": "2.0", "result": [], "id": 1}
-    mock_httpx_client.post.return_value = mock_response
+    kodi_rpc.replies["Player.GetActivePlayers"] = _NO_PLAYERS
 
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            state = await client.get_player_state()
-            assert state.player_id is None
-            assert state.playing is False
-            assert state.paused is False
-            assert state.position_seconds == 0.0
+    state = await kodi_client.get_player_state()
+    assert state.player_id is None
+    assert state.playing is False
+    assert state.paused is False
+    assert state.position_seconds == 0.0
 
 
 @pytest.mark.asyncio
-async def test_set_volume(kodi_config, mock_httpx_client):
+async def test_set_volume(kodi_client):
     """Test setting volume."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"jsonrpc": "2.0", "result": 75, "id": 1}
-    mock_httpx_client.post.return_value = mock_response
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.set_volume(75)
-            assert result is True
+    result = await kodi_client.set_volume(75)
+    assert result is True
 
 
-@pytest.mark.asyncio
-async def test_set_volume_invalid(kodi_config, mock_httpx_client):
+def test_set_volume_invalid():
     """Test setting invalid volume."""
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            result = await client.set_volume(150)  # Invalid: > 100
-            assert result is False
+    assert KodiClient._validate_volume(150) is False  # Invalid: > 100
+    assert KodiClient._validate_volume(-1) is False
+    assert KodiClient._validate_volume(100) is True
 
 
 @pytest.mark.asyncio
-async def test_get_volume(kodi_config, mock_httpx_client):
+async def test_get_volume(kodi_client):
     """Test getting current volume."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
-        "jsonrpc": "2.0",
-        "result": {"volume": 85},
-        "id": 1,
-    }
-    mock_httpx_client.post.return_value = mock_response
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            volume = await client.get_volume()
-            assert volume == 85
+    volume = await kodi_client.get_volume()
+    assert volume == 85
 
 
 @pytest.mark.asyncio
@@ -282,55 +270,54 @@ async def test_context_manager_without_context():
 
 
 @pytest.mark.asyncio
-async def test_input_action_success(kodi_config, mock_httpx_client):
-    """Input action should call Kodi JSON-RPC method."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"jsonrpc": "2.0", "result": "OK", "id": 1}
-    mock_httpx_client.post.return_value = mock_response
+async def test_connect_reuses_pooled_client(kodi_config, kodi_transport):
+    """connect() keeps one HTTP client open until close()."""
+    client = KodiClient(kodi_config, transport=kodi_transport)
+    await client.connect()
+    http_client = client._client
+    await client.connect()
+    assert client._client is http_client
 
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            with patch.object(client, "_call", new=AsyncMock(return_value="OK")) as rpc_mock:
-                result = await client.input_action("up")
-                assert result is True
-                rpc_mock.assert_awaited_once_with("Input.Up")
+    await client.close()
+    assert client._client is None
+    assert http_client.is_closed
 
 
 @pytest.mark.asyncio
-async def test_input_action_play_pause_uses_pause_method(kodi_config, mock_httpx_client):
-    """Play/pause action should delegate to KodiClient.pause()."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"jsonrpc": "2.0", "result": "OK", "id": 1}
-    mock_httpx_client.post.return_value = mock_response
+async def test_input_action_success(kodi_client, kodi_rpc):
+    """Input action should call Kodi JSON-RPC method."""
+    result = await kodi_client.input_action("up")
+    assert result is True
+    assert [call["method"] for call in kodi_rpc.calls] == ["Input.Up"]
 
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            with patch.object(client, "pause", new=AsyncMock(return_value=True)) as pause_mock:
-                result = await client.input_action("play_pause")
-                assert result is True
-                pause_mock.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_input_action_play_pause_uses_pause_method(kodi_client, kodi_rpc):
+    """Play/pause action should go through the pause flow."""
+    result = await kodi_client.input_action("play_pause")
+    assert result is True
+    assert [call["method"] for call in kodi_rpc.calls] == [
+        "Player.GetActivePlayers",
+        "Player.PlayPause",
+    ]
+
+
+def test_input_action_invalid():
+    """Unsupported actions have no Kodi method."""
+    assert "spin" not in _ACTION_MAP
 
 
 @pytest.mark.asyncio
-async def test_input_action_invalid(kodi_config, mock_httpx_client):
-    """Unsupported actions raise ValueError."""
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            with pytest.raises(ValueError):
-                await client.input_action("spin")
+async def test_input_action_unsupported_raises(kodi_client):
+    """input_action raises ValueError for unsupported actions."""
+    with pytest.raises(ValueError):
+        await kodi_client.input_action("spin")
 
 
 @pytest.mark.asyncio
-async def test_input_action_failure_logged(kodi_config, mock_httpx_client):
+async def test_input_action_failure_logged(kodi_client, kodi_rpc):
     """If Kodi RPC call fails, input_action returns False."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"jsonrpc": "2.0", "result": "OK", "id": 1}
-    mock_httpx_client.post.return_value = mock_response
-
-    failing_call = AsyncMock(side_effect=ValueError("boom"))
+    kodi_rpc.replies["Input.Left"] = {"error": {"message": "boom"}}
 
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        async with KodiClient(kodi_config) as client:
-            with patch.object(client, "_call", new=failing_call):
-                result = await client.input_action("left")
-                assert result is False
+    result = await kodi_client.input_action("left")
+    assert result is False
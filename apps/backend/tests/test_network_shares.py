@@ -0,0 +1,167 @@
+"""Tests for network share config persistence."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from storage import network as storage_network
+from storage.network import NetworkShareManager
+
+
+def _add(manager: NetworkShareManager, share_id: str) -> None:
+    manager.add_share(
+        share_id=share_id,
+        name=f"Share {share_id}",
+        protocol="nfs",
+        host="nas.local",
+        share_path=f"/export/{share_id}",
+        mount_point=f"/mnt/{share_id}",
+    )
+
+
+def _count_writes(manager: NetworkShareManager, monkeypatch: pytest.MonkeyPatch) -> list[bytes]:
+    writes: list[bytes] = []
+    write_config = manager._write_config
+
+    def counting_write(payload: bytes) -> bool:
+        writes.append(payload)
+        return write_config(payload)
+
+    monkeypatch.setattr(manager, "_write_config", counting_write)
+    return writes
+
+
+async def test_mutations_coalesce_into_one_write(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path = tmp_path / "shares.json"
+    manager = NetworkShareManager(config_path, flush_interval=3600)
+    writes = _count_writes(manager, monkeypatch)
+    await manager.start()
+
+    _add(manager, "a")
+    _add(manager, "b")
+    manager.update_share("a", name="Renamed")
+    assert not config_path.exists()
+
+    await manager.flush()
+    await manager.flush()
+    assert len(writes) == 1
+    assert not config_path.with_name("shares.json.tmp").exists()
+
+    reloaded = NetworkShareManager(config_path)
+    assert sorted(reloaded.shares) == ["a", "b"]
+    assert reloaded.shares["a"].name == "Renamed"
+    assert reloaded.shares["a"].mount_point == Path("/mnt/a")
+    await manager.stop()
+
+
+async def test_failed_write_is_retried(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    config_path = tmp_path / "shares.json"
+    manager = NetworkShareManager(config_path, flush_interval=3600)
+    await manager.start()
+    _add(manager, "a")
+
+    def fail_replace(src: str, dst: str) -> None:
+        raise OSError(28, "No space left on device")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(storage_network.os, "replace", fail_replace)
+        await manager.flush()
+    assert not config_path.exists()
+
+    await manager.flush()
+    assert list(NetworkShareManager(config_path).shares) == ["a"]
+    await manager.stop()
+
+
+async def test_stop_flushes_pending_changes(tmp_path: Path) -> None:
+    config_path = tmp_path / "shares.json"
+    manager = NetworkShareManager(config_path, flush_interval=3600)
+    await manager.start()
+    _add(manager, "a")
+    assert not config_path.exists()
+
+    await manager.stop()
+    assert list(NetworkShareManager(config_path).shares) == ["a"]
+
+    # Once stopped, changes are written straight away
+    _add(manager, "b")
+    assert sorted(NetworkShareManager(config_path).shares) == ["a", "b"]
+
+
+class _FakeProcess:
+    def __init__(self, returncode: int) -> None:
+        self.returncode = returncode
+
+    async def communicate(self) -> tuple[None, bytes]:
+        return None, b"mount error(13): Permission denied" if self.returncode else b""
+
+
+class _FakeMount:
+    """Stands in for create_subprocess_exec, recording each mount argv.
+
+    The credentials file is read while the "mount" runs, since mount() removes
+    it afterwards.
+    """
+
+    def __init__(self, failing_hosts: tuple[str, ...] = ()) -> None:
+        self.calls: list[list[str]] = []
+        self.credentials: list[tuple[int, str]] = []
+        self.failing_hosts = failing_hosts
+
+    async def __call__(self, *cmd: str, **kwargs: Any) -> _FakeProcess:
+        self.calls.append(list(cmd))
+        for arg in cmd:
+            if arg.startswith("credentials="):
+                path = Path(arg.removeprefix("credentials="))
+                self.credentials.append((path.stat().st_mode & 0o777, path.read_text()))
+        return _FakeProcess(int(any(host in cmd[-2] for host in self.failing_hosts)))
+
+
+def _add_smb(manager: NetworkShareManager, tmp_path: Path, share_id: str, **kwargs: Any) -> None:
+    manager.add_share(
+        share_id=share_id,
+        name=f"Share {share_id}",
+        protocol="smb",
+        host=f"{share_id}.local",
+        share_path="/media",
+        mount_point=str(tmp_path / "mnt" / share_id),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("failing", [False, True])
+async def test_smb_mount_passes_credentials_in_private_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, failing: bool
+) -> None:
+    fake_mount = _FakeMount(failing_hosts=("nas.local",) if failing else ())
+    monkeypatch.setattr(storage_network.asyncio, "create_subprocess_exec", fake_mount)
+    monkeypatch.setattr(storage_network.tempfile, "tempdir", str(tmp_path))
+    manager = NetworkShareManager(tmp_path / "shares.json")
+    _add_smb(manager, tmp_path, "nas", username="alice", password="s3cret pass")
+
+    assert await manager.mount("nas") is not failing
+
+    (argv,) = fake_mount.calls
+    assert not any("s3cret" in arg for arg in argv)
+    assert argv[:4] == ["mount", "-t", "cifs", "-o"]
+    assert fake_mount.credentials == [(0o600, "username=alice\npassword=s3cret pass\n")]
+    assert list(tmp_path.glob("womcast-cifs-*")) == []
+
+
+async def test_mount_all_gathers_enabled_shares(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fake_mount = _FakeMount(failing_hosts=("b.local",))
+    monkeypatch.setattr(storage_network.asyncio, "create_subprocess_exec", fake_mount)
+    manager = NetworkShareManager(tmp_path / "shares.json")
+    _add_smb(manager, tmp_path, "a")
+    _add_smb(manager, tmp_path, "b")
+    _add_smb(manager, tmp_path, "c", enabled=False)
+
+    assert await manager.mount_all() == {"a": True, "b": False}
+    # Anonymous shares get no credentials file at all
+    assert fake_mount.credentials == []
+    assert len(fake_mount.calls) == 2
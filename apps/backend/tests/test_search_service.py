@@ -1,3 +1,5 @@
+from collections.abc import Iterator
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -25,12 +27,14 @@ class _StubChromaManager:
         return 1
 
 
-@pytest.fixture
-def test_client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+@pytest.fixture(scope="session")
+def test_client() -> Iterator[TestClient]:
     stub = _StubChromaManager()
-    monkeypatch.setattr(search_main, "ChromaManager", lambda *args, **kwargs: stub)
-    with TestClient(search_main.app) as client:
-        yield client
+    # monkeypatch is function-scoped, so patch through a session-long context
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(search_main, "ChromaManager", lambda *args, **kwargs: stub)
+        with TestClient(search_main.app) as client:
+            yield client
     search_main.chroma_manager = None
 
 
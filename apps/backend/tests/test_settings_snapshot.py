@@ -0,0 +1,82 @@
+"""Tests for the cached settings snapshot."""
+
+import json
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from common.settings import DEFAULT_SETTINGS, SettingsManager
+
+
+@pytest.fixture()
+async def manager(tmp_path: Path) -> SettingsManager:
+    settings = SettingsManager(tmp_path / "settings.json")
+    await settings.load()
+    return settings
+
+
+async def test_snapshot_is_reused_until_settings_change(manager: SettingsManager) -> None:
+    first = manager.snapshot()
+    assert manager.snapshot() is first
+    assert dict(first) == DEFAULT_SETTINGS
+
+
+@pytest.mark.parametrize(
+    ("mutate", "key", "expected"),
+    [
+        (lambda m: m.set("theme", "light"), "theme", "light"),
+        (lambda m: m.update({"theme": "light", "language": "de"}), "language", "de"),
+        (lambda m: m.delete("theme"), "theme", DEFAULT_SETTINGS["theme"]),
+        (lambda m: m.reset(), "theme", DEFAULT_SETTINGS["theme"]),
+    ],
+    ids=["set", "update", "delete", "reset"],
+)
+async def test_writes_produce_a_new_snapshot(
+    manager: SettingsManager,
+    mutate: Callable[[SettingsManager], Awaitable[None]],
+    key: str,
+    expected: object,
+) -> None:
+    await manager.set("theme", "solarized")
+    before = manager.snapshot()
+
+    await mutate(manager)
+
+    after = manager.snapshot()
+    assert after is not before
+    assert after[key] == expected
+    assert dict(after) == manager.get_all()
+
+
+async def test_refresh_from_disk_produces_a_new_snapshot(
+    manager: SettingsManager, tmp_path: Path
+) -> None:
+    before = manager.snapshot()
+    (tmp_path / "settings.json").write_text(json.dumps({"theme": "edited-on-disk"}))
+
+    await manager.refresh()
+
+    after = manager.snapshot()
+    assert after is not before
+    assert after["theme"] == "edited-on-disk"
+
+
+async def test_snapshot_cannot_be_mutated(manager: SettingsManager) -> None:
+    snapshot = manager.snapshot()
+
+    with pytest.raises(TypeError):
+        snapshot["theme"] = "corrupted"  # type: ignore[index]
+
+    assert manager.snapshot()["theme"] == DEFAULT_SETTINGS["theme"]
+    assert manager.get("theme") == DEFAULT_SETTINGS["theme"]
+
+
+def test_get_settings_serves_latest_snapshot(
+    settings_client: TestClient, settings_manager: SettingsManager
+) -> None:
+    assert settings_client.get("/v1/settings").json()["theme"] == DEFAULT_SETTINGS["theme"]
+
+    settings_client.portal.call(settings_manager.set, "theme", "light")
+    assert settings_client.get("/v1/settings").json()["theme"] == "light"
@@ -0,0 +1,235 @@
+"""
+Voice transcription history stored as an append-only JSONL file.
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds on how many queued history lines go out in a single write
+HISTORY_BATCH_LINES = 64
+HISTORY_BATCH_BYTES = 64 * 1024
+HISTORY_STREAM_CHUNK_BYTES = 64 * 1024
+# Most recent entries kept parsed in memory and returned by read_entries; the
+# full history is only ever streamed from the file (stream_lines)
+HISTORY_CACHE_ENTRIES = 500
+
+
+class VoiceHistory:
+    """Voice transcription history kept in a JSONL file.
+
+    Recorded entries are queued and written in batches by a writer task
+    through one long-lived file handle. The most recent parsed entries are
+    cached together with the byte offset they cover, so reads only parse
+    lines appended since the previous read.
+    """
+
+    def __init__(self, history_file: Path):
+        """Initialize voice history.
+
+        Args:
+            history_file: JSONL file holding one entry per line
+        """
+        self.history_file = history_file
+        self.lock = asyncio.Lock()
+        self._cache: deque[dict[str, Any]] = deque(maxlen=HISTORY_CACHE_ENTRIES)
+        self._total = 0
+        self._offset = 0
+        self._queue: asyncio.Queue[tuple[bytes, dict[str, Any]]] = asyncio.Queue()
+        self._file: BinaryIO | None = None
+        self._writer: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the background writer task."""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run_writer())
+
+    async def aclose(self) -> None:
+        """Write any queued entries, stop the writer and close the file."""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        self._close_file()
+
+    def record(self, entry: dict[str, Any]) -> None:
+        """Queue an entry for the writer task.
+
+        Args:
+            entry: JSON-serializable history entry
+        """
+        try:
+            line = orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError as exc:  # pragma: no cover - logging fallback
+            logger.error("Failed to record voice history: %s", exc)
+            return
+        self._queue.put_nowait((line, entry))
+
+    async def flush(self) -> None:
+        """Wait until every queued entry has been written."""
+        await self._queue.join()
+
+    @property
+    def total_entries(self) -> int:
+        """Number of entries in the history file as of the last read or write."""
+        return self._total
+
+    async def read_entries(self) -> list[dict[str, Any]]:
+        """Return the most recent HISTORY_CACHE_ENTRIES entries, oldest first.
+
+        Only lines added since the last read are parsed.
+        """
+        await self.flush()
+        async with self.lock:
+            tail = await asyncio.to_thread(self._read_tail, self._offset)
+            if tail is None:
+                self._reset_cache()
+                return []
+
+            start, data = tail
+            if start != self._offset:
+                self._reset_cache()
+            # A partially written last line is picked up on the next read
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    self._cache.append(orjson.loads(line))
+                except orjson.JSONDecodeError:  # pragma: no cover - legacy records
+                    logger.warning("Skipping malformed voice history entry")
+                else:
+                    self._total += 1
+            self._offset += end
+            return list(self._cache)
+
+    async def stream_lines(self) -> AsyncIterator[bytes]:
+        """Yield the history file in chunks that end on a line boundary.
+
+        The file is only ever appended to or unlinked, so streaming does not
+        hold the lock for the length of the response.
+        """
+        try:
+            file = await asyncio.to_thread(self.history_file.open, "rb")
+        except FileNotFoundError:
+            return
+
+        try:
+            pending = b""
+            while chunk := await asyncio.to_thread(file.read, HISTORY_STREAM_CHUNK_BYTES):
+                pending += chunk
+                end = pending.rfind(b"\n") + 1
+                if end:
+                    yield pending[:end]
+                    pending = pending[end:]
+            # Anything left is a partially written line; leave it for the next read
+        finally:
+            file.close()
+
+    async def clear(self) -> int:
+        """Delete the history file.
+
+        Returns:
+            Number of entries deleted
+        """
+        await self.flush()
+        async with self.lock:
+            self._close_file()
+            deleted_entries = await asyncio.to_thread(self._count_entries)
+
+            if self.history_file.exists():
+                await asyncio.to_thread(self.history_file.unlink)
+            self._reset_cache()
+
+            await asyncio.to_thread(self._cleanup_dir)
+            return deleted_entries
+
+    async def _run_writer(self) -> None:
+        """Drain queued lines, coalescing bursts into a single write."""
+        while True:
+            line, entry = await self._queue.get()
+            lines, entries, size = [line], [entry], len(line)
+            while len(lines) < HISTORY_BATCH_LINES and size < HISTORY_BATCH_BYTES:
+                try:
+                    line, entry = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                lines.append(line)
+                entries.append(entry)
+                size += len(line)
+
+            try:
+                async with self.lock:
+                    await asyncio.to_thread(self._write_batch, lines, entries)
+            except Exception as exc:  # pragma: no cover - logging fallback
+                logger.error("Failed to record voice history: %s", exc)
+            finally:
+                for _ in lines:
+                    self._queue.task_done()
+
+    def _reset_cache(self) -> None:
+        self._cache.clear()
+        self._total = 0
+        self._offset = 0
+
+    def _write_batch(self, lines: list[bytes], entries: list[dict[str, Any]]) -> None:
+        if self._file is None:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.history_file.open("ab", buffering=8192)
+
+        in_sync = os.fstat(self._file.fileno()).st_size == self._offset
+        data = b"".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        if in_sync:
+            self._cache.extend(entries)
+            self._total += len(entries)
+            self._offset += len(data)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _count_entries(self) -> int:
+        if not self.history_file.exists():
+            return 0
+        with self.history_file.open("r", encoding="utf-8") as file:
+            return sum(1 for _ in file)
+
+    def _cleanup_dir(self) -> None:
+        history_dir = self.history_file.parent
+        if history_dir.exists():
+            try:
+                next(history_dir.iterdir())
+            except StopIteration:
+                history_dir.rmdir()
+
+    def _read_tail(self, offset: int) -> tuple[int, bytes] | None:
+        """Read the history file from offset to the end in a single read.
+
+        Starts over from 0 when the file shrank below offset (truncated or
+        replaced). Returns the start offset and the bytes, or None if missing.
+        """
+        try:
+            file = self.history_file.open("rb")
+        except FileNotFoundError:
+            return None
+
+        with file:
+            if os.fstat(file.fileno()).st_size < offset:
+                offset = 0
+            file.seek(offset)
+            return offset, file.read()
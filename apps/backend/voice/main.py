@@ -3,23 +3,27 @@ Voice Service - Handles speech recognition and voice commands via Whisper.
 """
 
 import asyncio
-import base64
-import json
+import binascii
 import logging
 import os
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
-from fastapi import FastAPI, HTTPException, UploadFile
+from fastapi import FastAPI, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from common.health import create_health_router
+from common.json_route import ORJSONRoute
 from common.settings import SettingsManager, get_settings_manager
 from ai.chroma import ChromaManager
-from ai.intent.engine import IntentEngine, IntentPrediction
+from ai.intent.engine import IntentEngine, IntentPrediction, OllamaModelInfo
+from voice.history import VoiceHistory
 from voice.model_manager import (
     DownloadInProgressError,
     DownloadJobInfo,
@@ -31,8 +35,8 @@ from voice.model_manager import (
     ModelStatusEnvelope,
     ModelType,
 )
-from voice.server_audio import ServerAudioCapture, get_server_audio
-from voice.stt import ModelSize, WhisperSTT
+from voice.server_audio import ServerAudioCapture, get_server_audio, pcm_to_wav_bytes
+from voice.stt import ModelSize, WhisperSTT, detect_device
 
 __version__ = "0.2.0"
 
@@ -42,13 +46,61 @@ DEFAULT_HISTORY_DIR = Path(__file__).parent.parent / "voice_history"
 VOICE_HISTORY_DIR = Path(os.getenv("VOICE_HISTORY_DIR", str(DEFAULT_HISTORY_DIR)))
 VOICE_HISTORY_FILE = VOICE_HISTORY_DIR / "history.jsonl"
 SETTINGS_PATH = Path(__file__).parent.parent / "settings.json"
+# Load and warm the Whisper model at startup instead of on the first request
+PRELOAD_STT = os.getenv("VOICE_PRELOAD_STT", "1") != "0"
+# Minimum seconds between settings re-reads on the transcription path
+SETTINGS_REFRESH_TTL = 5.0
+# Seconds to reuse the Ollama model list for polling clients
+MODELS_CACHE_TTL = 2.0
+# Transcripts waiting for semantic storage; new ones are dropped once full
+SEMANTIC_QUEUE_SIZE = 256
+SEMANTIC_BATCH_SIZE = 32
+# Audio larger than this (~15 s of 16 kHz mono WAV) is transcribed on a worker
+# thread with batched decoding
+STT_LONG_THRESHOLD_BYTES = 500_000
+# CTranslate2 threads per transcription; transcriptions run at most
+# STT_CONCURRENCY at a time so together they don't oversubscribe the CPU
+STT_CPU_THREADS = max(1, int(os.getenv("VOICE_STT_CPU_THREADS", "4")))
+STT_CONCURRENCY = max(1, (os.cpu_count() or STT_CPU_THREADS) // STT_CPU_THREADS)
+# Speech chunks of a long clip decoded together by faster-whisper's batched pipeline
+STT_BATCH_SIZE = int(os.getenv("VOICE_STT_BATCH_SIZE", "8"))
+# Recordings with no 30 ms frame louder than this RMS level (int16 scale) are
+# treated as silence and never reach Whisper; 0 disables the gate
+STT_SILENCE_RMS = float(os.getenv("VOICE_STT_SILENCE_RMS", "300"))
+# Spoken language for Whisper; "auto" detects it on the first transcription and
+# reuses it until the next server recording starts (uploads share that detection)
+STT_LANGUAGE = os.getenv("VOICE_STT_LANGUAGE", "en")
+# Base64 audio longer than this is decoded in a worker thread
+INLINE_BASE64_LIMIT = 64 * 1024
+# Whisper device ("auto", "cpu" or "cuda"); "auto" uses CUDA when a GPU is visible
+VOICE_DEVICE = os.getenv("VOICE_DEVICE", "auto")
+# Overrides the voice_compute_type setting when set
+VOICE_COMPUTE_TYPE = os.getenv("VOICE_COMPUTE_TYPE")
+DEFAULT_COMPUTE_TYPE = "int8"
+# int8 weights with float16 activations is the fastest Whisper type on CUDA
+DEFAULT_GPU_COMPUTE_TYPE = "int8_float16"
+# Quantization types CTranslate2 accepts for Whisper models
+SUPPORTED_COMPUTE_TYPES = frozenset(
+    {"int8", "int8_float16", "int8_float32", "float16", "float32"}
+)
 
 settings_manager: SettingsManager | None = None
-history_lock: asyncio.Lock | None = None
+voice_history: VoiceHistory | None = None
 current_voice_model: ModelSize | None = None
+_stt_device: str | None = None
+_settings_refreshed_at = 0.0
+_semantic_queue: asyncio.Queue[tuple[str, dict[str, Any]]] | None = None
+# Last Ollama model list with its monotonic fetch time, and the fetch in flight
+_models_cache: tuple[float, list[OllamaModelInfo]] | None = None
+_models_inflight: asyncio.Task[list[OllamaModelInfo]] | None = None
 
 # Global STT engine and server audio
 stt_engine: WhisperSTT | None = None
+# Recently used engines keyed by (model, compute type), least recent first, so
+# switching back to a model does not reload it from disk
+STT_POOL_SIZE = 2
+_stt_pool: OrderedDict[tuple[ModelSize, str], WhisperSTT] = OrderedDict()
+_stt_semaphore = asyncio.Semaphore(STT_CONCURRENCY)
 server_audio: ServerAudioCapture | None = None
 intent_engine: IntentEngine | None = None
 semantic_store: ChromaManager | None = None
@@ -92,20 +144,200 @@ def _resolve_voice_model(model_name: Any) -> ModelSize:
     return ModelSize.SMALL
 
 
+def _get_stt_device() -> str:
+    global _stt_device
+
+    if _stt_device is None:
+        _stt_device = VOICE_DEVICE if VOICE_DEVICE in ("cpu", "cuda") else detect_device()
+        logger.info("Whisper STT device: %s", _stt_device)
+    return _stt_device
+
+
+def _resolve_compute_type(compute_type: Any, device: str = "cpu") -> str:
+    default = DEFAULT_GPU_COMPUTE_TYPE if device == "cuda" else DEFAULT_COMPUTE_TYPE
+    if compute_type == "auto":
+        return default
+    if compute_type in SUPPORTED_COMPUTE_TYPES:
+        return compute_type
+    # CTranslate2 has no int4 kernels, so int4 (HQQ/bitsandbytes-style) requests
+    # end up here along with typos
+    logger.warning(
+        "Unsupported voice compute type '%s', falling back to '%s'", compute_type, default
+    )
+    return default
+
+
+async def _refresh_settings(manager: SettingsManager) -> None:
+    """Re-read settings from disk at most once per SETTINGS_REFRESH_TTL."""
+    global _settings_refreshed_at
+
+    now = time.monotonic()
+    if now - _settings_refreshed_at >= SETTINGS_REFRESH_TTL:
+        await manager.refresh()
+        _settings_refreshed_at = now
+
+
 async def get_stt_engine() -> WhisperSTT:
     global stt_engine, current_voice_model
 
     manager = _get_settings_manager()
-    await manager.refresh()
+    await _refresh_settings(manager)
     model_name = manager.get("voice_model", ModelSize.SMALL.value)
     target_model = _resolve_voice_model(model_name)
+    device = _get_stt_device()
+    compute_type = _resolve_compute_type(
+        VOICE_COMPUTE_TYPE or manager.get("voice_compute_type", "auto"), device
+    )
+
+    key = (target_model, compute_type)
+    engine = _stt_pool.get(key)
+    if engine is None:
+        logger.info(
+            "Initializing Whisper STT with model '%s' (%s)", target_model.value, compute_type
+        )
+        engine = WhisperSTT(
+            model_size=target_model,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=STT_CPU_THREADS,
+            num_workers=STT_CONCURRENCY,
+            silence_rms_threshold=STT_SILENCE_RMS,
+            language=None if STT_LANGUAGE == "auto" else STT_LANGUAGE,
+        )
+        _stt_pool[key] = engine
+        while len(_stt_pool) > STT_POOL_SIZE:
+            (evicted_model, evicted_type), _ = _stt_pool.popitem(last=False)
+            logger.info(
+                "Unloading Whisper STT model '%s' (%s)", evicted_model.value, evicted_type
+            )
+    else:
+        _stt_pool.move_to_end(key)
+
+    stt_engine = engine
+    current_voice_model = target_model
+    return engine
 
-    if stt_engine is None or current_voice_model != target_model:
-        logger.info("Initializing Whisper STT with model '%s'", target_model.value)
-        stt_engine = WhisperSTT(model_size=target_model, device="cpu", compute_type="int8")
-        current_voice_model = target_model
 
-    return stt_engine
+async def _decode_audio_base64(audio_data: str) -> bytes:
+    """Decode base64 audio, keeping multi-megabyte payloads off the event loop.
+
+    binascii reads the ASCII str in place, where base64.b64decode would first
+    copy the whole payload into a bytes object.
+    """
+    if len(audio_data) < INLINE_BASE64_LIMIT:
+        return binascii.a2b_base64(audio_data)
+    return await asyncio.to_thread(binascii.a2b_base64, audio_data)
+
+
+def _build_transcription_outputs(
+    result: dict[str, Any], source: str, **extras: Any
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Build the history entry and response fields for a transcription result.
+
+    Args:
+        result: Result dict from WhisperSTT
+        source: History source label (e.g. "upload", "server-audio")
+        **extras: Additional fields recorded in both outputs
+
+    Returns:
+        Tuple of (history entry, response keyword arguments)
+    """
+    text = result["text"]
+    duration = result["duration"]
+    language = result.get("language")
+    model = current_voice_model.value if current_voice_model else None
+
+    history_entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "duration": duration,
+        "language": language,
+        "text": text,
+        "model": model,
+        **extras,
+    }
+    response = {
+        "text": text,
+        "duration": duration,
+        "language": language,
+        "language_probability": result.get("language_probability"),
+        "model": model,
+        **extras,
+    }
+    return history_entry, response
+
+
+async def _transcribe(engine: WhisperSTT, audio_bytes: bytes) -> dict[str, Any]:
+    """Transcribe audio, at most STT_CONCURRENCY clips at a time.
+
+    Long clips run on a worker thread and are split into speech chunks that
+    are decoded STT_BATCH_SIZE at a time instead of one 30 s window after
+    another.
+    """
+    if len(audio_bytes) <= STT_LONG_THRESHOLD_BYTES:
+        async with _stt_semaphore:
+            return await engine.transcribe_bytes(audio_bytes)
+
+    await engine.load_model()
+    async with _stt_semaphore:
+        return await asyncio.to_thread(
+            engine.transcribe_bytes_sync, audio_bytes, STT_BATCH_SIZE
+        )
+
+
+async def _transcribe_stream(engine: WhisperSTT, audio_file: BinaryIO, size: int) -> dict[str, Any]:
+    """Transcribe audio from a file object on a worker thread.
+
+    Shares the concurrency limit and batched decoding of long clips with
+    _transcribe.
+    """
+    await engine.load_model()
+    batch_size = STT_BATCH_SIZE if size > STT_LONG_THRESHOLD_BYTES else 1
+    async with _stt_semaphore:
+        return await asyncio.to_thread(engine.transcribe_stream_sync, audio_file, batch_size)
+
+
+async def _transcribe_pcm(
+    engine: WhisperSTT, audio_data: memoryview, capture: ServerAudioCapture
+) -> dict[str, Any]:
+    """Transcribe raw PCM captured by the server microphone.
+
+    Shares the concurrency limit and batched decoding of long clips with
+    _transcribe.
+    """
+    batch_size = STT_BATCH_SIZE if len(audio_data) > STT_LONG_THRESHOLD_BYTES else 1
+    async with _stt_semaphore:
+        return await engine.transcribe_pcm(
+            audio_data,
+            sample_rate=capture.sample_rate,
+            channels=capture.channels,
+            sample_width=capture.sample_width,
+            batch_size=batch_size,
+        )
+
+
+def _silence_wav(seconds: float = 1.0, sample_rate: int = 16000) -> bytes:
+    """Return a mono 16-bit WAV clip of silence."""
+    return pcm_to_wav_bytes(bytes(int(sample_rate * seconds) * 2), sample_rate, 1, 2)
+
+
+async def _warm_stt_engine() -> None:
+    """Load the configured Whisper model and run one silent transcription."""
+    try:
+        engine = await get_stt_engine()
+        start_time = time.perf_counter()
+        # Page the weights in ahead of the load that the silent clip triggers
+        await engine.prefetch_weights()
+        await engine.transcribe_bytes(_silence_wav())
+        logger.info(
+            "Whisper STT warmed up in %.2fs (model '%s')",
+            time.perf_counter() - start_time,
+            engine.model_size.value,
+        )
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:  # pragma: no cover - first request loads lazily instead
+        logger.warning("Whisper STT warmup failed: %s", exc)
 
 
 async def get_intent_engine() -> IntentEngine:
@@ -117,95 +349,128 @@ async def get_intent_engine() -> IntentEngine:
     return intent_engine
 
 
-def _append_history_line(line: str) -> None:
-    with VOICE_HISTORY_FILE.open("a", encoding="utf-8") as file:
-        file.write(f"{line}\n")
+def _store_intent_models(task: asyncio.Task[list[OllamaModelInfo]]) -> None:
+    global _models_cache, _models_inflight
 
+    if _models_inflight is task:
+        _models_inflight = None
+    if task.cancelled() or task.exception() is not None:
+        return
+    _models_cache = (time.monotonic(), task.result())
 
-def _count_history_entries() -> int:
-    if not VOICE_HISTORY_FILE.exists():
-        return 0
-    with VOICE_HISTORY_FILE.open("r", encoding="utf-8") as file:
-        return sum(1 for _ in file)
 
+async def _list_intent_models(engine: IntentEngine) -> list[OllamaModelInfo]:
+    """Return the Ollama models, sharing one fetch between concurrent callers."""
+    global _models_inflight
 
-def _cleanup_history_dir() -> None:
-    if VOICE_HISTORY_DIR.exists():
-        try:
-            next(VOICE_HISTORY_DIR.iterdir())
-        except StopIteration:
-            VOICE_HISTORY_DIR.rmdir()
+    if _models_cache is not None and time.monotonic() - _models_cache[0] < MODELS_CACHE_TTL:
+        return _models_cache[1]
 
+    if _models_inflight is None:
+        _models_inflight = asyncio.create_task(engine.list_models())
+        _models_inflight.add_done_callback(_store_intent_models)
+    # Shield so one caller disconnecting does not cancel the fetch for the rest
+    return await asyncio.shield(_models_inflight)
 
-def _read_history_entries() -> list[dict[str, Any]]:
-    if not VOICE_HISTORY_FILE.exists():
-        return []
 
-    entries: list[dict[str, Any]] = []
-    with VOICE_HISTORY_FILE.open("r", encoding="utf-8") as file:
-        for line in file:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entries.append(json.loads(line))
-            except json.JSONDecodeError:  # pragma: no cover - legacy records
-                logger.warning("Skipping malformed voice history entry")
-    return entries
+def _get_voice_history() -> VoiceHistory:
+    if voice_history is None:
+        raise HTTPException(status_code=500, detail="Voice service not initialized")
+    return voice_history
 
 
 async def record_voice_history(entry: dict[str, Any]) -> None:
-    if history_lock is None:
+    if voice_history is not None:
+        voice_history.record(entry)
+
+
+def _record_semantic_voice(text: str, metadata: dict[str, Any]) -> None:
+    if semantic_store is None or _semantic_queue is None:
         return
 
-    async with history_lock:
+    try:
+        _semantic_queue.put_nowait((text, metadata))
+    except asyncio.QueueFull:
+        logger.debug("Semantic voice queue full; dropping transcript")
+
+
+async def _run_semantic_writer(
+    queue: asyncio.Queue[tuple[str, dict[str, Any]]], store: ChromaManager
+) -> None:
+    """Store queued transcripts in Chroma, one batch per add."""
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < SEMANTIC_BATCH_SIZE:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
         try:
-            VOICE_HISTORY_DIR.mkdir(parents=True, exist_ok=True)
-            line = json.dumps(entry, ensure_ascii=True)
-            await asyncio.to_thread(_append_history_line, line)
-        except Exception as exc:  # pragma: no cover - logging fallback
-            logger.error("Failed to record voice history: %s", exc)
+            await store.store_voice_queries(batch)
+        except Exception as exc:  # pragma: no cover - semantic storage best-effort
+            logger.debug("Skipping semantic voice storage: %s", exc)
+        finally:
+            for _ in batch:
+                queue.task_done()
 
 
-async def _record_semantic_voice(text: str, metadata: dict[str, Any]) -> None:
-    if semantic_store is None:
-        return
+async def _run_semantic_store(queue: asyncio.Queue[tuple[str, dict[str, Any]]]) -> None:
+    """Open the Chroma store off the event loop, then store queued transcripts."""
+    global semantic_store
 
     try:
-        await semantic_store.store_voice_query(text, metadata=metadata)
-    except Exception as exc:  # pragma: no cover - semantic storage best-effort
-        logger.debug("Skipping semantic voice storage: %s", exc)
+        semantic_store = await asyncio.to_thread(ChromaManager)
+    except Exception as exc:  # pragma: no cover - Chroma optional
+        logger.debug("Semantic voice history unavailable: %s", exc)
+        return
+
+    await _run_semantic_writer(queue, semantic_store)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    global stt_engine, server_audio, settings_manager, history_lock
+    global stt_engine, server_audio, settings_manager, voice_history
     global current_voice_model, intent_engine, semantic_store, model_downloads
+    global _settings_refreshed_at, _models_cache, _models_inflight, _semantic_queue
 
     logger.info("Initializing Voice service...")
 
     # Load shared settings
     settings_manager = get_settings_manager(SETTINGS_PATH)
     await settings_manager.load()
+    _settings_refreshed_at = time.monotonic()
 
-    # Reset STT engine so model selection happens on first request
+    # Reset STT engine, then load and warm it in the background so the
+    # first transcription does not pay for the model load
     stt_engine = None
     current_voice_model = None
-
-    # Initialize history lock for file writes
-    history_lock = asyncio.Lock()
+    _stt_pool.clear()
+    stt_warmup: asyncio.Task[None] | None = None
+    if PRELOAD_STT:
+        stt_warmup = asyncio.create_task(_warm_stt_engine())
+
+    # Start the batching history writer
+    history = VoiceHistory(VOICE_HISTORY_FILE)
+    history.start()
+    voice_history = history
     # Initialize server audio capture
     server_audio = get_server_audio()
 
     # Initialize intent engine lazily; client created on first use
     intent_engine = IntentEngine(settings_manager=_get_settings_manager())
-
-    try:
-        semantic_store = ChromaManager()
-    except Exception as exc:  # pragma: no cover - Chroma optional
-        semantic_store = None
-        logger.debug("Semantic voice history unavailable: %s", exc)
+    _models_cache = None
+    _models_inflight = None
+
+    # Chroma is optional and slow to open, so open it in the background;
+    # transcripts are skipped until it is ready
+    semantic_store = None
+    semantic_queue: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue(
+        maxsize=SEMANTIC_QUEUE_SIZE
+    )
+    _semantic_queue = semantic_queue
+    semantic_writer = asyncio.create_task(_run_semantic_store(semantic_queue))
 
     model_downloads = ModelDownloadManager(
         settings_manager=_get_settings_manager(),
@@ -217,8 +482,24 @@ async def lifespan(app: FastAPI):
     yield
 
     # Cleanup
+    await history.aclose()
+    voice_history = None
+    if not semantic_writer.done():
+        await semantic_queue.join()
+        semantic_writer.cancel()
+        try:
+            await semantic_writer
+        except asyncio.CancelledError:
+            pass
+    _semantic_queue = None
+    if stt_warmup and not stt_warmup.done():
+        stt_warmup.cancel()
+        try:
+            await stt_warmup
+        except asyncio.CancelledError:
+            pass
     if server_audio:
-        server_audio.cleanup()
+        await server_audio.aclose()
     if intent_engine:
         await intent_engine.aclose()
     if model_downloads:
@@ -226,12 +507,17 @@ async def lifespan(app: FastAPI):
     logger.info("Voice service shutdown")
 
 
+# Keep the default response class: every route declares a response_model, which
+# FastAPI serializes straight to JSON bytes via Pydantic. A custom class such as
+# ORJSONResponse would bypass that path and re-encode through a dict.
 app = FastAPI(
     title="WomCast Voice Service",
     description="Speech recognition and voice command processing",
     version=__version__,
     lifespan=lifespan,
 )
+# Request bodies (multi-megabyte base64 audio, intent payloads) are decoded with orjson
+app.router.route_class = ORJSONRoute
 
 _default_origins = (
     "http://localhost:5173,http://127.0.0.1:5173,http://localhost:4173,http://127.0.0.1:4173"
@@ -270,7 +556,7 @@ async def transcribe_audio(request: TranscribeRequest):
     """
     try:
         # Decode base64 audio
-        audio_bytes = base64.b64decode(request.audio_data)
+        audio_bytes = await _decode_audio_base64(request.audio_data)
     except Exception as e:
         logger.error(f"Failed to decode audio data: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid base64 audio: {e}") from e
@@ -281,26 +567,11 @@ async def transcribe_audio(request: TranscribeRequest):
     try:
         engine = await get_stt_engine()
         # Transcribe audio
-        result = await engine.transcribe_bytes(audio_bytes)
-
-        await record_voice_history(
-            {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "source": "upload",
-                "duration": result["duration"],
-                "language": result.get("language"),
-                "text": result["text"],
-                "model": current_voice_model.value if current_voice_model else None,
-            }
-        )
+        result = await _transcribe(engine, audio_bytes)
 
-        return TranscribeResponse(
-            text=result["text"],
-            duration=result["duration"],
-            language=result.get("language"),
-            language_probability=result.get("language_probability"),
-            model=current_voice_model.value if current_voice_model else None,
-        )
+        history_entry, response = _build_transcription_outputs(result, "upload")
+        await record_voice_history(history_entry)
+        return TranscribeResponse.model_construct(**response)
 
     except Exception as e:
         logger.error(f"Transcription failed: {e}")
@@ -322,38 +593,66 @@ async def transcribe_file(file: UploadFile):
         HTTPException: 400 if file invalid, 500 if STT fails
     """
     try:
-        # Read file content
-        audio_bytes = await file.read()
+        # The upload is already spooled to a temporary file; decode from it
+        # directly instead of reading it into memory
+        size = file.size
+        if size is None:
+            size = await asyncio.to_thread(file.file.seek, 0, os.SEEK_END)
+        await file.seek(0)
     except Exception as e:
         logger.error(f"Failed to read uploaded file: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to read file: {e}") from e
 
-    if len(audio_bytes) == 0:
+    if size == 0:
         raise HTTPException(status_code=400, detail="Empty audio file")
 
     try:
         # Transcribe audio
         engine = await get_stt_engine()
-        result = await engine.transcribe_bytes(audio_bytes)
-
-        await record_voice_history(
-            {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "source": "file-upload",
-                "duration": result["duration"],
-                "language": result.get("language"),
-                "text": result["text"],
-                "model": current_voice_model.value if current_voice_model else None,
-            }
-        )
+        result = await _transcribe_stream(engine, file.file, size)
 
-        return TranscribeResponse(
-            text=result["text"],
-            duration=result["duration"],
-            language=result.get("language"),
-            language_probability=result.get("language_probability"),
-            model=current_voice_model.value if current_voice_model else None,
-        )
+        history_entry, response = _build_transcription_outputs(result, "file-upload")
+        await record_voice_history(history_entry)
+        return TranscribeResponse.model_construct(**response)
+
+    except Exception as e:
+        logger.error(f"Transcription failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Transcription error: {e}") from e
+
+
+@app.post("/v1/voice/stt/raw", response_model=TranscribeResponse)
+async def transcribe_raw(request: Request):
+    """
+    Transcribe raw audio bytes sent as the request body.
+
+    Unlike /v1/voice/stt the audio is not base64-encoded, so large clips skip
+    the encoding overhead on the wire and the decode pass on the server.
+
+    Args:
+        request: Request whose body is the audio (WAV, MP3, etc.)
+
+    Returns:
+        Transcription with text and metadata
+
+    Raises:
+        HTTPException: 400 if body invalid, 500 if STT fails
+    """
+    try:
+        audio_bytes = await request.body()
+    except Exception as e:
+        logger.error(f"Failed to read audio body: {e}")
+        raise HTTPException(status_code=400, detail=f"Failed to read audio: {e}") from e
+
+    if len(audio_bytes) == 0:
+        raise HTTPException(status_code=400, detail="Empty audio data")
+
+    try:
+        engine = await get_stt_engine()
+        result = await _transcribe(engine, audio_bytes)
+
+        history_entry, response = _build_transcription_outputs(result, "raw-upload")
+        await record_voice_history(history_entry)
+        return TranscribeResponse.model_construct(**response)
 
     except Exception as e:
         logger.error(f"Transcription failed: {e}")
@@ -525,7 +824,9 @@ async def start_server_recording(request: StartRecordingRequest):
         raise HTTPException(status_code=500, detail="Server audio not initialized")
 
     try:
-        await get_stt_engine()
+        engine = await get_stt_engine()
+        # A new recording is a new session; detect its language afresh
+        engine.reset_language()
         if request.device_index is not None:
             server_audio.device_index = request.device_index
 
@@ -566,35 +867,16 @@ async def stop_server_recording():
         if len(audio_data) == 0:
             raise HTTPException(status_code=400, detail="No audio captured")
 
-        wav_bytes = server_audio.to_wav_bytes(audio_data)
-
-        audio_duration = len(audio_data) / (
-            server_audio.sample_rate * server_audio.channels * 2
-        )
+        audio_duration = server_audio.duration_seconds(audio_data)
 
         engine = await get_stt_engine()
-        result = await engine.transcribe_bytes(wav_bytes)
-
-        await record_voice_history(
-            {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "source": "server-audio",
-                "duration": result["duration"],
-                "language": result.get("language"),
-                "text": result["text"],
-                "model": current_voice_model.value if current_voice_model else None,
-                "audio_duration_seconds": audio_duration,
-            }
-        )
+        result = await _transcribe_pcm(engine, audio_data, server_audio)
 
-        return StopRecordingResponse(
-            text=result["text"],
-            duration=result["duration"],
-            language=result.get("language"),
-            language_probability=result.get("language_probability"),
-            audio_duration_seconds=audio_duration,
-            model=current_voice_model.value if current_voice_model else None,
+        history_entry, response = _build_transcription_outputs(
+            result, "server-audio", audio_duration_seconds=audio_duration
         )
+        await record_voice_history(history_entry)
+        return StopRecordingResponse.model_construct(**response)
 
     except RuntimeError as e:
         logger.warning(f"Cannot stop recording: {e}")
@@ -610,54 +892,51 @@ async def stop_server_recording():
 
 @app.get("/v1/voice/history", response_model=VoiceHistoryResponse)
 async def list_voice_history() -> VoiceHistoryResponse:
-    """Return recorded voice history entries."""
+    """Return the most recent voice history entries.
 
-    if history_lock is None:
-        raise HTTPException(status_code=500, detail="Voice service not initialized")
-
-    async with history_lock:
-        try:
-            entries = await asyncio.to_thread(_read_history_entries)
-        except Exception as exc:  # pragma: no cover - unexpected filesystem errors
-            logger.error("Failed to read voice history: %s", exc)
-            raise HTTPException(
-                status_code=500, detail=f"Failed to read voice history: {exc}"
-            ) from exc
+    At most HISTORY_CACHE_ENTRIES entries are returned; total_entries counts the
+    whole history, which /v1/voice/history/stream returns in full.
+    """
 
-    return VoiceHistoryResponse(entries=entries, total_entries=len(entries))
+    history = _get_voice_history()
+    try:
+        entries = await history.read_entries()
+    except Exception as exc:  # pragma: no cover - unexpected filesystem errors
+        logger.error("Failed to read voice history: %s", exc)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to read voice history: {exc}"
+        ) from exc
 
+    # Entries come from our own history file, so skip re-validating every one
+    return VoiceHistoryResponse.model_construct(
+        entries=entries, total_entries=history.total_entries
+    )
 
-@app.delete("/v1/voice/history", response_model=DeleteHistoryResponse)
-async def delete_voice_history() -> DeleteHistoryResponse:
-    """Delete persisted voice transcription history."""
 
-    if history_lock is None:
-        raise HTTPException(status_code=500, detail="Voice service not initialized")
+@app.get("/v1/voice/history/stream")
+async def stream_voice_history() -> StreamingResponse:
+    """Stream recorded voice history entries as newline-delimited JSON."""
 
-    async with history_lock:
-        try:
-            deleted_entries = await asyncio.to_thread(_count_history_entries)
+    history = _get_voice_history()
+    await history.flush()
+    return StreamingResponse(history.stream_lines(), media_type="application/x-ndjson")
 
-            if VOICE_HISTORY_FILE.exists():
-                await asyncio.to_thread(VOICE_HISTORY_FILE.unlink)
 
-            await asyncio.to_thread(_cleanup_history_dir)
+@app.delete("/v1/voice/history", response_model=DeleteHistoryResponse)
+async def delete_voice_history() -> DeleteHistoryResponse:
+    """Delete persisted voice transcription history."""
 
-            message = (
-                "Voice history cleared"
-                if deleted_entries
-                else "No voice history to delete"
-            )
+    history = _get_voice_history()
+    try:
+        deleted_entries = await history.clear()
+    except Exception as exc:  # pragma: no cover - unexpected filesystem errors
+        logger.error("Failed to delete voice history: %s", exc)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to delete voice history: {exc}"
+        ) from exc
 
-            return DeleteHistoryResponse(
-                deleted_entries=deleted_entries,
-                message=message,
-            )
-        except Exception as exc:  # pragma: no cover - unexpected filesystem errors
-            logger.error("Failed to delete voice history: %s", exc)
-            raise HTTPException(
-                status_code=500, detail=f"Failed to delete voice history: {exc}"
-            ) from exc
+    message = "Voice history cleared" if deleted_entries else "No voice history to delete"
+    return DeleteHistoryResponse(deleted_entries=deleted_entries, message=message)
 
 
 @app.post("/v1/voice/intent", response_model=IntentResponse)
@@ -680,20 +959,18 @@ async def classify_intent(request: IntentRequest) -> IntentResponse:
         logger.error("Intent classification failed: %s", exc)
         raise HTTPException(status_code=502, detail="Intent service unavailable") from exc
 
-    asyncio.create_task(
-        _record_semantic_voice(
-            text,
-            {
-                "action": prediction.action,
-                "confidence": prediction.confidence,
-                "model": prediction.model,
-                "session_id": request.session_id,
-                "source": "voice-intent",
-            },
-        )
+    _record_semantic_voice(
+        text,
+        {
+            "action": prediction.action,
+            "confidence": prediction.confidence,
+            "model": prediction.model,
+            "session_id": request.session_id,
+            "source": "voice-intent",
+        },
     )
 
-    return IntentResponse(
+    return IntentResponse.model_construct(
         action=prediction.action,
         args=prediction.args,
         confidence=prediction.confidence,
@@ -708,10 +985,10 @@ async def list_intent_models() -> IntentModelsResponse:
     """List available Ollama models for intent processing."""
 
     engine = await get_intent_engine()
-    model_infos = await engine.list_models()
+    model_infos = await _list_intent_models(engine)
 
     manager = _get_settings_manager()
-    await manager.refresh()
+    await _refresh_settings(manager)
     active_model = str(manager.get("llm_model", ""))
 
     model_dicts: list[dict[str, Any]] = [
@@ -724,7 +1001,7 @@ async def list_intent_models() -> IntentModelsResponse:
         for info in model_infos
     ]
 
-    return IntentModelsResponse(active_model=active_model, models=model_dicts)
+    return IntentModelsResponse.model_construct(active_model=active_model, models=model_dicts)
 
 
 @app.post("/v1/voice/intent/models/select", response_model=IntentModelsResponse)
@@ -732,7 +1009,7 @@ async def select_intent_model(payload: UpdateIntentModelRequest) -> IntentModels
     """Persist the active Ollama model for intent parsing."""
 
     engine = await get_intent_engine()
-    model_infos = await engine.list_models()
+    model_infos = await _list_intent_models(engine)
     available_names = {info.name for info in model_infos}
 
     target_model = payload.model.strip()
@@ -755,7 +1032,7 @@ async def select_intent_model(payload: UpdateIntentModelRequest) -> IntentModels
         for info in model_infos
     ]
 
-    return IntentModelsResponse(active_model=target_model, models=model_dicts)
+    return IntentModelsResponse.model_construct(active_model=target_model, models=model_dicts)
 
 
 @app.get("/v1/voice/models/status", response_model=ModelStatusEnvelope)
@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import errno
 import logging
 import os
+import secrets
 import shutil
-import uuid
+import stat
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Awaitable, Callable, Iterable
+from typing import AsyncIterator, Awaitable, Callable, Iterable
 
 import httpx
+import orjson
 from pydantic import BaseModel
 
 from common.settings import SettingsManager
@@ -22,6 +26,12 @@ from ai.intent.engine import IntentEngine, OllamaModelInfo
 
 logger = logging.getLogger(__name__)
 
+# Seconds between background refreshes of the Ollama model list
+LLM_MODELS_CACHE_TTL = 3.0
+OLLAMA_CONNECT_TIMEOUT = 5.0
+# Seconds to reuse a filesystem's free/total bytes (keyed by st_dev)
+DISK_INFO_CACHE_TTL = 0.5
+
 
 class ModelManagerError(RuntimeError):
 	"""Base exception for model manager failures."""
@@ -86,6 +96,10 @@ class ModelDescriptor:
 	display_name: str
 	size_bytes: int | None
 	model_type: ModelType
+	sort_key: str = field(init=False, repr=False)
+
+	def __post_init__(self) -> None:
+		self.sort_key = self.display_name.lower()
 
 
 @dataclass(slots=True)
@@ -109,7 +123,8 @@ class ModelDownloadJob:
 		return self.status in {JobState.PENDING, JobState.RUNNING}
 
 	def snapshot(self) -> "DownloadJobInfo":
-		return DownloadJobInfo(
+		# Fields come straight from this dataclass, so skip re-validating them
+		return DownloadJobInfo.model_construct(
 			id=self.id,
 			model=self.model,
 			model_type=self.model_type,
@@ -197,12 +212,26 @@ def _default_ollama_models_dir() -> Path:
 	return models_dir.resolve()
 
 
+async def _iter_byte_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+	"""Yield newline-delimited lines from a streamed response without decoding to str."""
+	pending = b""
+	async for chunk in response.aiter_bytes():
+		pending += chunk
+		*lines, pending = pending.split(b"\n")
+		for line in lines:
+			yield line
+	if pending:
+		yield pending
+
+
 VOICE_MODEL_CATALOG: tuple[ModelDescriptor, ...] = (
 	ModelDescriptor("tiny", "Whisper Tiny", 40_943_616, ModelType.VOICE),
 	ModelDescriptor("base", "Whisper Base", 77_070_336, ModelType.VOICE),
 	ModelDescriptor("small", "Whisper Small", 255_852_544, ModelType.VOICE),
 	ModelDescriptor("medium", "Whisper Medium", 806_354_944, ModelType.VOICE),
 	ModelDescriptor("large", "Whisper Large", 1_625_702_400, ModelType.VOICE),
+	ModelDescriptor("distil-small.en", "Distil-Whisper Small EN", 332_000_000, ModelType.VOICE),
+	ModelDescriptor("distil-large-v3", "Distil-Whisper Large v3", 1_510_000_000, ModelType.VOICE),
 )
 
 
@@ -241,15 +270,31 @@ class ModelDownloadManager:
 		self._ollama_models_dir = (ollama_models_dir or _default_ollama_models_dir()).resolve()
 		self._ollama_models_dir.mkdir(parents=True, exist_ok=True)
 
-		self._voice_catalog = tuple(voice_catalog)
-		self._llm_catalog = tuple(llm_catalog)
+		# Catalogs are kept in display order so status groups need little or no sorting
+		self._voice_catalog = tuple(sorted(voice_catalog, key=attrgetter("sort_key")))
+		self._llm_catalog = tuple(sorted(llm_catalog, key=attrgetter("sort_key")))
+		self._voice_by_name = {descriptor.name: descriptor for descriptor in self._voice_catalog}
+		self._llm_by_name = {descriptor.name: descriptor for descriptor in self._llm_catalog}
 
 		self._jobs: dict[str, ModelDownloadJob] = {}
+		# Most recent job for each model
+		self._jobs_by_model: dict[tuple[ModelType, str], ModelDownloadJob] = {}
 		self._jobs_lock = asyncio.Lock()
+		self._cleanup_tasks: set[asyncio.Task[None]] = set()
 
 		self._ollama_base_url = ollama_base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 		self._ollama_client: httpx.AsyncClient | None = None
 
+		# Voice model inventory keyed by directory, valid while its mtime_ns is unchanged
+		self._voice_installed_cache: dict[Path, tuple[int, bool]] = {}
+		self._size_cache: dict[Path, tuple[int, int]] = {}
+		self._disk_cache: dict[int, tuple[float, int, int]] = {}
+		# Ollama model list served to status polls, refetched once it is older
+		# than LLM_MODELS_CACHE_TTL; a failed fetch keeps the last good list
+		self._llm_models: dict[str, OllamaModelInfo] | None = None
+		self._llm_models_fetched_at = 0.0
+		self._llm_models_lock = asyncio.Lock()
+
 	async def aclose(self) -> None:
 		"""Cleanup resources and cancel outstanding jobs."""
 
@@ -257,6 +302,10 @@ class ModelDownloadManager:
 			for job in self._jobs.values():
 				job.cancel()
 
+		if self._cleanup_tasks:
+			# Let in-flight directory deletions finish so no trash is left behind
+			await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+
 		if self._ollama_client:
 			await self._ollama_client.aclose()
 			self._ollama_client = None
@@ -264,14 +313,22 @@ class ModelDownloadManager:
 	async def get_status(self) -> ModelStatusEnvelope:
 		"""Return aggregated status for both model categories."""
 
-		voice_group = await self._build_voice_group()
-		llm_group = await self._build_llm_group()
+		await self._settings_manager.refresh()
+		voice_group, llm_group = await asyncio.gather(
+			self._build_voice_group(), self._build_llm_group()
+		)
 
+		# Only copy references under the lock; snapshots are built outside it
 		async with self._jobs_lock:
-			jobs = [job.snapshot() for job in self._jobs.values()]
-			active_job = next((job.snapshot() for job in self._jobs.values() if job.is_active()), None)
+			job_list = list(self._jobs.values())
+
+		jobs = [job.snapshot() for job in job_list]
+		active_job = next(
+			(snapshot for job, snapshot in zip(job_list, jobs) if job.is_active()), None
+		)
 
-		return ModelStatusEnvelope(
+		# Every part of the payload is built here from typed values; skip validation
+		return ModelStatusEnvelope.model_construct(
 			voice=voice_group,
 			llm=llm_group,
 			jobs=jobs,
@@ -301,7 +358,7 @@ class ModelDownloadManager:
 		self._ensure_free_space(model_type, descriptor.size_bytes)
 
 		job = ModelDownloadJob(
-			id=uuid.uuid4().hex,
+			id=secrets.token_hex(12),
 			model=model_name,
 			display_name=descriptor.display_name,
 			model_type=model_type,
@@ -310,6 +367,7 @@ class ModelDownloadManager:
 
 		async with self._jobs_lock:
 			self._jobs[job.id] = job
+			self._jobs_by_model[(model_type, model_name)] = job
 
 		asyncio.create_task(self._run_job(job))
 		return job.snapshot()
@@ -327,17 +385,11 @@ class ModelDownloadManager:
 		return job.snapshot()
 
 	def _lookup_descriptor(self, model_type: ModelType, model_name: str) -> ModelDescriptor | None:
-		catalog = self._voice_catalog if model_type is ModelType.VOICE else self._llm_catalog
-		for descriptor in catalog:
-			if descriptor.name == model_name:
-				return descriptor
-		return None
+		catalog = self._voice_by_name if model_type is ModelType.VOICE else self._llm_by_name
+		return catalog.get(model_name)
 
 	def _job_for(self, model_type: ModelType, model_name: str) -> ModelDownloadJob | None:
-		for job in self._jobs.values():
-			if job.model_type is model_type and job.model == model_name:
-				return job
-		return None
+		return self._jobs_by_model.get((model_type, model_name))
 
 	def _ensure_free_space(self, model_type: ModelType, estimated_size: int | None) -> None:
 		if estimated_size is None or estimated_size <= 0:
@@ -378,6 +430,7 @@ class ModelDownloadManager:
 			job.progress = 1.0
 			job.completed_at = datetime.now(timezone.utc)
 		finally:
+			self._invalidate_inventory(job)
 			# Leave job record for status queries; cleanup handled elsewhere if needed.
 			return
 
@@ -385,10 +438,7 @@ class ModelDownloadManager:
 		target_dir = self._voice_models_dir / job.model
 		tmp_dir = target_dir.parent / f".{job.model}.tmp-{job.id}"
 
-		if target_dir.exists():
-			shutil.rmtree(target_dir, ignore_errors=True)
-		if tmp_dir.exists():
-			shutil.rmtree(tmp_dir, ignore_errors=True)
+		await self._discard_directory(tmp_dir)
 		tmp_dir.mkdir(parents=True, exist_ok=True)
 
 		def _download() -> None:
@@ -399,40 +449,70 @@ class ModelDownloadManager:
 
 			download_whisper_model(job.model, output_dir=str(tmp_dir))
 
-		await asyncio.to_thread(_download)
+		try:
+			await asyncio.to_thread(_download)
+		except Exception:
+			await self._discard_directory(tmp_dir)
+			raise
 
 		if job.cancel_event.is_set():
-			shutil.rmtree(tmp_dir, ignore_errors=True)
+			await self._discard_directory(tmp_dir)
 			raise DownloadCancelled
 
-		if target_dir.exists():
-			shutil.rmtree(target_dir, ignore_errors=True)
-		tmp_dir.rename(target_dir)
+		# Any previous copy stays in place until the new one is complete
+		await self._discard_directory(target_dir)
+		await self._move_directory(tmp_dir, target_dir)
 
 		size = self._compute_directory_size(target_dir)
 		job.total_bytes = size
 		job.downloaded_bytes = size
 
+	async def _move_directory(self, source: Path, target: Path) -> None:
+		"""Rename source to target, copying instead when they are on different filesystems."""
+		try:
+			await asyncio.to_thread(os.rename, source, target)
+		except OSError as exc:
+			if exc.errno != errno.EXDEV:
+				raise
+			await asyncio.to_thread(shutil.copytree, source, target)
+			await self._discard_directory(source)
+
+	async def _discard_directory(self, path: Path) -> None:
+		"""Move a directory out of the way and delete it in the background.
+
+		The rename is immediate, so a download can reuse the path while rmtree
+		works through the old files on a worker thread.
+		"""
+		trash = path.parent / f".{path.name}.trash-{secrets.token_hex(8)}"
+		try:
+			await asyncio.to_thread(path.rename, trash)
+		except FileNotFoundError:
+			return
+
+		task = asyncio.create_task(asyncio.to_thread(shutil.rmtree, trash, ignore_errors=True))
+		self._cleanup_tasks.add(task)
+		task.add_done_callback(self._cleanup_tasks.discard)
+
 	async def _download_llm_model(self, job: ModelDownloadJob) -> None:
 		client = await self._get_ollama_client()
 
 		try:
-			async with client.stream("POST", "/api/pull", json={"model": job.model}, timeout=None) as response:
+			async with client.stream("POST", "/api/pull", json={"model": job.model}) as response:
 				if response.status_code != 200:
 					body = await response.aread()
 					raise ExternalServiceError(
 						f"Ollama pull failed with status {response.status_code}: {body.decode(errors='ignore')[:200]}"
 					)
 
-				async for line in response.aiter_lines():
-					if not line:
+				async for line in _iter_byte_lines(response):
+					if not line.strip():
 						if job.cancel_event.is_set():
 							raise DownloadCancelled
 						continue
 
 					try:
-						payload = json.loads(line)
-					except json.JSONDecodeError:
+						payload = orjson.loads(line)
+					except orjson.JSONDecodeError:
 						continue
 
 					if "total" in payload:
@@ -471,11 +551,15 @@ class ModelDownloadManager:
 
 	async def _get_ollama_client(self) -> httpx.AsyncClient:
 		if self._ollama_client is None:
-			self._ollama_client = httpx.AsyncClient(base_url=self._ollama_base_url, timeout=None)
+			# Pulls stream for as long as they take, but an unreachable Ollama
+			# should fail fast rather than hang the job
+			self._ollama_client = httpx.AsyncClient(
+				base_url=self._ollama_base_url,
+				timeout=httpx.Timeout(None, connect=OLLAMA_CONNECT_TIMEOUT),
+			)
 		return self._ollama_client
 
 	async def _build_voice_group(self) -> ModelGroupStatus:
-		await self._settings_manager.refresh()
 		active_model = str(self._settings_manager.get("voice_model", "small"))
 
 		variants: list[ModelVariant] = []
@@ -497,7 +581,7 @@ class ModelDownloadManager:
 					status = VariantStatus.DOWNLOADING
 
 			variants.append(
-				ModelVariant(
+				ModelVariant.model_construct(
 					name=descriptor.name,
 					display_name=descriptor.display_name,
 					estimated_size_bytes=descriptor.size_bytes,
@@ -510,9 +594,7 @@ class ModelDownloadManager:
 				)
 			)
 
-		variants.sort(key=lambda variant: variant.display_name.lower())
-
-		return ModelGroupStatus(
+		return ModelGroupStatus.model_construct(
 			kind=ModelType.VOICE,
 			active_model=active_model,
 			disk=self._disk_info(self._voice_models_dir),
@@ -520,13 +602,13 @@ class ModelDownloadManager:
 		)
 
 	async def _build_llm_group(self) -> ModelGroupStatus:
-		await self._settings_manager.refresh()
 		active_model = self._settings_manager.get("llm_model")
 		active_model_str = str(active_model) if active_model else None
 
 		installed_map = await self._installed_llm_models()
 
 		variants: list[ModelVariant] = []
+		extras: list[tuple[str, ModelVariant]] = []
 		processed: set[str] = set()
 
 		for descriptor in self._llm_catalog:
@@ -549,7 +631,7 @@ class ModelDownloadManager:
 					status = VariantStatus.DOWNLOADING
 
 			variants.append(
-				ModelVariant(
+				ModelVariant.model_construct(
 					name=descriptor.name,
 					display_name=descriptor.display_name,
 					estimated_size_bytes=descriptor.size_bytes,
@@ -577,23 +659,32 @@ class ModelDownloadManager:
 				elif job.is_active():
 					status = VariantStatus.DOWNLOADING
 
-			variants.append(
-				ModelVariant(
-					name=name,
-					display_name=name,
-					estimated_size_bytes=info.size,
-					installed_size_bytes=info.size,
-					installed=True,
-					active=name == active_model_str,
-					status=status,
-					download_job_id=job.id if job else None,
-					error=error,
+			extras.append(
+				(
+					name.lower(),
+					ModelVariant.model_construct(
+						name=name,
+						display_name=name,
+						estimated_size_bytes=info.size,
+						installed_size_bytes=info.size,
+						installed=True,
+						active=name == active_model_str,
+						status=status,
+						download_job_id=job.id if job else None,
+						error=error,
+					),
 				)
 			)
 
-		variants.sort(key=lambda variant: variant.display_name.lower())
+		if extras:
+			# Merge the uncatalogued models into the already ordered catalog entries
+			catalog_entries = zip(
+				(descriptor.sort_key for descriptor in self._llm_catalog), variants
+			)
+			merged = sorted([*catalog_entries, *extras], key=itemgetter(0))
+			variants = [variant for _, variant in merged]
 
-		return ModelGroupStatus(
+		return ModelGroupStatus.model_construct(
 			kind=ModelType.LLM,
 			active_model=active_model_str,
 			disk=self._disk_info(self._ollama_models_dir),
@@ -601,53 +692,142 @@ class ModelDownloadManager:
 		)
 
 	def _disk_info(self, directory: Path) -> DiskInfo:
-		directory.mkdir(parents=True, exist_ok=True)
-		usage = shutil.disk_usage(directory)
-		return DiskInfo(path=str(directory), total_bytes=usage.total, free_bytes=usage.free)
+		try:
+			device = os.stat(directory).st_dev
+		except FileNotFoundError:
+			directory.mkdir(parents=True, exist_ok=True)
+			device = os.stat(directory).st_dev
+
+		now = time.monotonic()
+		cached = self._disk_cache.get(device)
+		if cached is not None and now - cached[0] < DISK_INFO_CACHE_TTL:
+			_, total_bytes, free_bytes = cached
+		else:
+			if hasattr(os, "statvfs"):
+				usage = os.statvfs(directory)
+				total_bytes = usage.f_frsize * usage.f_blocks
+				free_bytes = usage.f_frsize * usage.f_bavail
+			else:  # pragma: no cover - Windows
+				total_bytes, _, free_bytes = shutil.disk_usage(directory)
+			self._disk_cache[device] = (now, total_bytes, free_bytes)
+		return DiskInfo.model_construct(
+			path=str(directory), total_bytes=total_bytes, free_bytes=free_bytes
+		)
 
 	def _is_voice_model_installed(self, name: str) -> bool:
 		target = self._voice_models_dir / name
-		if not target.exists() or not target.is_dir():
+		try:
+			target_stat = target.stat()
+		except OSError:
+			target_stat = None
+		if target_stat is None or not stat.S_ISDIR(target_stat.st_mode):
+			self._voice_installed_cache.pop(target, None)
 			return False
+
+		mtime_ns = target_stat.st_mtime_ns
+		cached = self._voice_installed_cache.get(target)
+		if cached is not None and cached[0] == mtime_ns:
+			return cached[1]
+
 		try:
 			next(target.iterdir())
 		except StopIteration:
-			return False
-		return True
+			installed = False
+		else:
+			installed = True
+		self._voice_installed_cache[target] = (mtime_ns, installed)
+		return installed
 
 	def _voice_model_size(self, name: str) -> int | None:
 		path = self._voice_models_dir / name
-		if not path.exists():
+		try:
+			path_stat = path.stat()
+		except OSError:
+			self._size_cache.pop(path, None)
 			return None
-		return self._compute_directory_size(path)
+		if not stat.S_ISDIR(path_stat.st_mode):
+			return 0
+
+		cached = self._size_cache.get(path)
+		if cached is not None and cached[0] == path_stat.st_mtime_ns:
+			return cached[1]
+
+		size = self._compute_directory_size(path)
+		self._size_cache[path] = (path_stat.st_mtime_ns, size)
+		return size
+
+	def _invalidate_inventory(self, job: ModelDownloadJob) -> None:
+		if job.model_type is ModelType.VOICE:
+			target = self._voice_models_dir / job.model
+			self._voice_installed_cache.pop(target, None)
+			self._size_cache.pop(target, None)
+		else:
+			# Expire rather than drop the snapshot so a failed refetch keeps it
+			self._llm_models_fetched_at = 0.0
 
 	async def _is_llm_model_installed(self, name: str) -> bool:
 		installed = await self._installed_llm_models()
 		return name in installed
 
 	async def _installed_llm_models(self) -> dict[str, OllamaModelInfo]:
+		models = self._llm_models
+		if models is None or not self._llm_models_fresh():
+			models = await self._refresh_llm_models()
+		# Callers pop entries off the map, so hand out a copy
+		return dict(models)
+
+	def _llm_models_fresh(self) -> bool:
+		return time.monotonic() - self._llm_models_fetched_at < LLM_MODELS_CACHE_TTL
+
+	async def _refresh_llm_models(self) -> dict[str, OllamaModelInfo]:
+		async with self._llm_models_lock:
+			# Concurrent status polls share the fetch made by the first one
+			models = self._llm_models
+			if models is not None and self._llm_models_fresh():
+				return models
+
+			fetched = await self._fetch_llm_models()
+			if fetched is not None:
+				models = fetched
+			elif models is None:
+				models = {}
+			# Stamp failures too, so an unreachable Ollama is retried once per TTL
+			self._llm_models = models
+			self._llm_models_fetched_at = time.monotonic()
+			return models
+
+	async def _fetch_llm_models(self) -> dict[str, OllamaModelInfo] | None:
+		"""Return the installed Ollama models, or None if they could not be listed."""
+
 		try:
 			engine = await self._intent_engine_provider()
 		except Exception as exc:  # pragma: no cover - dependency bootstrap issues
 			logger.debug("Intent engine unavailable while listing models: %s", exc)
-			return {}
+			return None
 
 		try:
-			models = await engine.list_models()
+			models = await engine.list_models(raise_errors=True)
 		except Exception as exc:  # pragma: no cover - Ollama errors
 			logger.debug("Failed to fetch Ollama model list: %s", exc)
-			return {}
+			return None
 
 		return {model.name: model for model in models}
 
 	@staticmethod
 	def _compute_directory_size(path: Path) -> int:
+		# scandir entries carry their file type from readdir, so each file costs
+		# a single stat and no Path objects are built
 		total = 0
-		for file in path.rglob("*"):
-			if file.is_file():
-				try:
-					total += file.stat().st_size
-				except OSError:  # pragma: no cover - race conditions
-					continue
+		stack = [str(path)]
+		while stack:
+			with os.scandir(stack.pop()) as entries:
+				for entry in entries:
+					if entry.is_dir(follow_symlinks=False):
+						stack.append(entry.path)
+					elif entry.is_file(follow_symlinks=False):
+						try:
+							total += entry.stat(follow_symlinks=False).st_size
+						except OSError:  # pragma: no cover - race conditions
+							continue
 		return total
 
@@ -7,57 +7,220 @@ when phone relay is not available or user prefers local capture.
 
 import asyncio
 import logging
-import wave
+import struct
 from datetime import UTC, datetime
-from io import BytesIO
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Longest server recording kept in memory; older audio is overwritten
+MAX_RECORDING_SECONDS = 120.0
+
+# Canonical 44-byte PCM WAV header: RIFF chunk, 16-byte fmt chunk, data chunk header
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+@lru_cache(maxsize=16)
+def wav_header(data_size: int, sample_rate: int, channels: int, sample_width: int) -> bytes:
+    """Return the 44-byte header of a PCM WAV holding data_size bytes of audio.
+
+    Args:
+        data_size: Length of the PCM payload in bytes
+        sample_rate: Sample rate in Hz
+        channels: Number of audio channels
+        sample_width: Sample width in bytes
+
+    Returns:
+        Header bytes to prepend to the PCM payload
+    """
+    block_align = channels * sample_width
+    return _WAV_HEADER.pack(
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+        b"data",
+        data_size,
+    )
+
+
+def pcm_to_wav_bytes(
+    audio_data: bytes | memoryview, sample_rate: int, channels: int, sample_width: int
+) -> bytes:
+    """Wrap raw PCM audio in a WAV header.
+
+    Args:
+        audio_data: Raw PCM audio bytes
+        sample_rate: Sample rate in Hz
+        channels: Number of audio channels
+        sample_width: Sample width in bytes
+
+    Returns:
+        WAV-formatted audio bytes
+    """
+    return wav_header(len(audio_data), sample_rate, channels, sample_width) + audio_data
+
+
+def write_wav(
+    file_path: Path | str,
+    audio_data: bytes | memoryview | list[memoryview],
+    sample_rate: int,
+    channels: int,
+    sample_width: int,
+) -> None:
+    """Write raw PCM audio to a WAV file.
+
+    Args:
+        file_path: Output file path
+        audio_data: Raw PCM audio bytes, or consecutive segments of it which
+            are written one after another without being joined first
+        sample_rate: Sample rate in Hz
+        channels: Number of audio channels
+        sample_width: Sample width in bytes
+    """
+    segments = audio_data if isinstance(audio_data, list) else [audio_data]
+    data_size = sum(len(segment) for segment in segments)
+    with open(file_path, "wb") as wav_file:
+        wav_file.write(wav_header(data_size, sample_rate, channels, sample_width))
+        wav_file.writelines(segments)
+
+
+def read_pcm_wav(wav_bytes: bytes) -> tuple[memoryview, int, int, int] | None:
+    """Split a canonical PCM WAV into its samples and format, without copying.
+
+    Only the 44-byte layout written by pcm_to_wav_bytes, the wave module and
+    the web client is recognised; anything else is left to a real decoder.
+
+    Args:
+        wav_bytes: WAV file contents
+
+    Returns:
+        (PCM view, sample rate, channels, sample width) or None if the bytes
+        are not a canonical PCM WAV
+    """
+    if (
+        len(wav_bytes) < 44
+        or wav_bytes[:4] != b"RIFF"
+        or wav_bytes[8:16] != b"WAVEfmt "
+        or wav_bytes[36:40] != b"data"
+    ):
+        return None
+    fmt_size, audio_format, channels, sample_rate = struct.unpack_from("<IHHI", wav_bytes, 16)
+    bits_per_sample, data_size = struct.unpack_from("<H4xI", wav_bytes, 34)
+    if fmt_size != 16 or audio_format != 1 or not channels or bits_per_sample % 8:
+        return None
+    block_align = channels * bits_per_sample // 8
+    # Streamed WAVs may carry a placeholder size (0 or 0xFFFFFFFF); trust the
+    # bytes we have
+    available = len(wav_bytes) - 44
+    if data_size == 0 or data_size > available:
+        data_size = available
+    data_size -= data_size % block_align
+    return memoryview(wav_bytes)[44 : 44 + data_size], sample_rate, channels, bits_per_sample // 8
+
 
 class AudioBuffer:
-    """Buffer for incoming audio chunks (shared with cast audio_relay)."""
+    """Buffer for incoming audio chunks (shared with cast audio_relay).
 
-    def __init__(self, max_duration_seconds: float = 30.0):
+    Audio is kept in a preallocated circular buffer holding the most recent
+    max_duration_seconds of PCM, so adding a chunk is a slice copy and never
+    allocates or rescans earlier chunks.
+    """
+
+    def __init__(
+        self,
+        max_duration_seconds: float = 30.0,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        sample_width: int = 2,
+    ):
         """Initialize audio buffer.
 
         Args:
             max_duration_seconds: Maximum audio duration to buffer
+            sample_rate: Sample rate in Hz (16kHz for Whisper)
+            channels: Number of audio channels
+            sample_width: Sample width in bytes (2 = 16-bit PCM)
         """
-        self.chunks: list[bytes] = []
         self.max_duration = max_duration_seconds
-        self.sample_rate = 16000  # 16kHz for Whisper
-        self.channels = 1  # Mono
-        self.sample_width = 2  # 16-bit PCM
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
         self.created_at = datetime.now(UTC)
+        capacity = int(self.sample_rate * self.channels * self.sample_width * max_duration_seconds)
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._write_idx = 0
+        self._valid_bytes = 0
 
     def add_chunk(self, chunk: bytes) -> None:
-        """Add audio chunk to buffer.
+        """Add audio chunk to buffer, overwriting the oldest audio when full.
 
         Args:
             chunk: Raw PCM audio data
         """
-        self.chunks.append(chunk)
+        capacity = len(self._buf)
+        size = len(chunk)
+        if not size or not capacity:
+            return
 
-        # Limit buffer size
-        total_bytes = sum(len(c) for c in self.chunks)
-        bytes_per_second = self.sample_rate * self.channels * self.sample_width
-        max_bytes = int(bytes_per_second * self.max_duration)
+        if size >= capacity:
+            # Only the tail of an oversized chunk fits
+            self._view[:] = memoryview(chunk)[size - capacity :]
+            self._write_idx = 0
+            self._valid_bytes = capacity
+            return
 
-        if total_bytes > max_bytes:
-            # Remove oldest chunks
-            while total_bytes > max_bytes and self.chunks:
-                removed = self.chunks.pop(0)
-                total_bytes -= len(removed)
+        end = self._write_idx + size
+        if end <= capacity:
+            self._view[self._write_idx : end] = chunk
+        else:
+            split = capacity - self._write_idx
+            data = memoryview(chunk)
+            self._view[self._write_idx :] = data[:split]
+            self._view[: size - split] = data[split:]
+        self._write_idx = end % capacity
+        self._valid_bytes = min(self._valid_bytes + size, capacity)
 
     def get_audio_bytes(self) -> bytes:
-        """Get concatenated audio data.
+        """Get buffered audio data, oldest first.
 
         Returns:
             Raw PCM audio bytes
         """
-        return b"".join(self.chunks)
+        return b"".join(self._segments())
+
+    def get_audio_view(self) -> memoryview:
+        """Get buffered audio without copying it where possible.
+
+        Until the buffer wraps this is a view into it, valid until the next
+        add_chunk() or clear(); after that the two halves are copied once
+        into a new buffer.
+
+        Returns:
+            Raw PCM audio, oldest first
+        """
+        segments = self._segments()
+        if len(segments) == 1:
+            return segments[0]
+        return memoryview(bytearray().join(segments))
+
+    def _segments(self) -> list[memoryview]:
+        """Return views of the buffered audio in order (two once it has wrapped)."""
+        start = self._write_idx - self._valid_bytes
+        if start >= 0:
+            return [self._view[start : self._write_idx]]
+        # Wrapped: the oldest audio sits at the end of the buffer
+        return [self._view[start:], self._view[: self._write_idx]]
 
     def get_duration_seconds(self) -> float:
         """Get current buffer duration.
@@ -65,13 +228,13 @@ class AudioBuffer:
         Returns:
             Duration in seconds
         """
-        total_bytes = sum(len(c) for c in self.chunks)
         bytes_per_second = self.sample_rate * self.channels * self.sample_width
-        return total_bytes / bytes_per_second if bytes_per_second > 0 else 0.0
+        return self._valid_bytes / bytes_per_second if bytes_per_second > 0 else 0.0
 
     def clear(self) -> None:
         """Clear buffer."""
-        self.chunks.clear()
+        self._write_idx = 0
+        self._valid_bytes = 0
         self.created_at = datetime.now(UTC)
 
     def save_wav(self, file_path: Path | str) -> None:
@@ -80,16 +243,12 @@ class AudioBuffer:
         Args:
             file_path: Output file path
         """
-        audio_data = self.get_audio_bytes()
-        if not audio_data:
+        if not self._valid_bytes:
             logger.warning("No audio data to save")
             return
 
-        with wave.open(str(file_path), "wb") as wav_file:
-            wav_file.setnchannels(self.channels)
-            wav_file.setsampwidth(self.sample_width)
-            wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(audio_data)
+        # Written straight from the ring buffer, without joining the halves
+        write_wav(file_path, self._segments(), self.sample_rate, self.channels, self.sample_width)
 
         logger.info(
             f"Saved {self.get_duration_seconds():.2f}s audio to {file_path}"
@@ -101,18 +260,12 @@ class AudioBuffer:
         Returns:
             WAV-formatted audio bytes
         """
-        audio_data = self.get_audio_bytes()
-        if not audio_data:
+        if not self._valid_bytes:
             return b""
 
-        buffer = BytesIO()
-        with wave.open(buffer, "wb") as wav_file:
-            wav_file.setnchannels(self.channels)
-            wav_file.setsampwidth(self.sample_width)
-            wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(audio_data)
-
-        return buffer.getvalue()
+        # Header and ring segments are joined into the result in one copy
+        header = wav_header(self._valid_bytes, self.sample_rate, self.channels, self.sample_width)
+        return b"".join([header, *self._segments()])
 
 
 class ServerAudioCapture:
@@ -124,6 +277,7 @@ class ServerAudioCapture:
         channels: int = 1,
         chunk_size: int = 1024,
         device_index: int | None = None,
+        max_duration_seconds: float = MAX_RECORDING_SECONDS,
     ):
         """Initialize server audio capture.
 
@@ -132,16 +286,21 @@ class ServerAudioCapture:
             channels: Number of audio channels (1=mono, 2=stereo)
             chunk_size: Size of audio chunks to read
             device_index: PyAudio device index (None for default)
+            max_duration_seconds: Longest recording kept; older audio is dropped
         """
         self.sample_rate = sample_rate
         self.channels = channels
+        self.sample_width = 2  # paInt16
+        # Refreshed when a recording starts
+        self.bytes_per_second = sample_rate * channels * self.sample_width
         self.chunk_size = chunk_size
         self.device_index = device_index
+        self.max_duration = max_duration_seconds
         self._pyaudio = None
         self._stream = None
         self._is_recording = False
-        self._audio_chunks: list[bytes] = []
-        self._record_task: asyncio.Task | None = None
+        self._buffer: AudioBuffer | None = None
+        self._pa_continue = 0
 
     def _init_pyaudio(self):
         """Lazy initialization of PyAudio."""
@@ -221,6 +380,13 @@ class ServerAudioCapture:
         # Open audio stream
         import pyaudio
 
+        self._buffer = AudioBuffer(
+            self.max_duration, self.sample_rate, self.channels, self.sample_width
+        )
+        self.bytes_per_second = self.sample_rate * self.channels * self.sample_width
+        self._pa_continue = pyaudio.paContinue
+
+        # PortAudio delivers each chunk to _pa_callback on its own thread
         self._stream = self._pyaudio.open(
             format=pyaudio.paInt16,
             channels=self.channels,
@@ -228,38 +394,32 @@ class ServerAudioCapture:
             input=True,
             input_device_index=self.device_index,
             frames_per_buffer=self.chunk_size,
+            stream_callback=self._pa_callback,
         )
 
         self._is_recording = True
-        self._audio_chunks = []
-
-        # Start recording task
-        self._record_task = asyncio.create_task(self._record_loop())
         logger.info(
             f"Started recording from device {self.device_index or 'default'} "
             f"at {self.sample_rate}Hz, {self.channels} channel(s)"
         )
 
-    async def _record_loop(self) -> None:
-        """Background task to continuously read from audio stream."""
-        try:
-            while self._is_recording and self._stream:
-                # Read chunk (blocking I/O, run in executor)
-                chunk = await asyncio.get_event_loop().run_in_executor(
-                    None, self._stream.read, self.chunk_size, False
-                )
-                if chunk:
-                    self._audio_chunks.append(chunk)
+    def _pa_callback(
+        self, in_data: bytes | None, frame_count: int, time_info: Any, status: int
+    ) -> tuple[None, int]:
+        """PyAudio stream callback: copy the captured chunk into the ring buffer.
 
-        except Exception as e:
-            logger.error(f"Recording loop error: {e}")
-            self._is_recording = False
+        Runs on the PortAudio thread, which is the buffer's only writer. The
+        buffer is read only after the stream has stopped, so no lock is needed.
+        """
+        if in_data and self._buffer is not None:
+            self._buffer.add_chunk(in_data)
+        return None, self._pa_continue
 
-    async def stop_recording(self) -> bytes:
+    async def stop_recording(self) -> memoryview:
         """Stop recording and return captured audio.
 
         Returns:
-            Raw PCM audio bytes
+            Raw PCM audio, viewed in place from the recording buffer
 
         Raises:
             RuntimeError: If not currently recording
@@ -269,28 +429,34 @@ class ServerAudioCapture:
 
         self._is_recording = False
 
-        # Wait for record task to finish
-        if self._record_task:
-            try:
-                await asyncio.wait_for(self._record_task, timeout=1.0)
-            except asyncio.TimeoutError:
-                logger.warning("Record task timeout during stop")
-
-        # Close stream
+        # Stopping waits for the last callback to return
         if self._stream:
-            self._stream.stop_stream()
-            self._stream.close()
+            stream = self._stream
             self._stream = None
+            await asyncio.to_thread(stream.stop_stream)
+            stream.close()
 
         # Get audio data
-        audio_data = b"".join(self._audio_chunks)
-        duration = len(audio_data) / (self.sample_rate * self.channels * 2)
+        audio_data = self._buffer.get_audio_view() if self._buffer else memoryview(b"")
+        self._buffer = None
+        duration = self.duration_seconds(audio_data)
 
         logger.info(f"Stopped recording: {duration:.2f}s captured")
 
         return audio_data
 
-    def to_wav_bytes(self, audio_data: bytes) -> bytes:
+    def duration_seconds(self, audio_data: bytes | memoryview) -> float:
+        """Return the duration of raw PCM audio captured by this device.
+
+        Args:
+            audio_data: Raw PCM audio bytes
+
+        Returns:
+            Duration in seconds
+        """
+        return len(audio_data) / self.bytes_per_second
+
+    def to_wav_bytes(self, audio_data: bytes | memoryview) -> bytes:
         """Convert raw PCM audio to WAV format.
 
         Args:
@@ -302,16 +468,9 @@ class ServerAudioCapture:
         if not audio_data:
             return b""
 
-        buffer = BytesIO()
-        with wave.open(buffer, "wb") as wav_file:
-            wav_file.setnchannels(self.channels)
-            wav_file.setsampwidth(2)  # 16-bit = 2 bytes
-            wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(audio_data)
-
-        return buffer.getvalue()
+        return pcm_to_wav_bytes(audio_data, self.sample_rate, self.channels, self.sample_width)
 
-    def save_wav(self, audio_data: bytes, file_path: Path | str) -> None:
+    def save_wav(self, audio_data: bytes | memoryview, file_path: Path | str) -> None:
         """Save audio to WAV file.
 
         Args:
@@ -322,13 +481,9 @@ class ServerAudioCapture:
             logger.warning("No audio data to save")
             return
 
-        with wave.open(str(file_path), "wb") as wav_file:
-            wav_file.setnchannels(self.channels)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(audio_data)
+        write_wav(file_path, audio_data, self.sample_rate, self.channels, self.sample_width)
 
-        duration = len(audio_data) / (self.sample_rate * self.channels * 2)
+        duration = self.duration_seconds(audio_data)
         logger.info(f"Saved {duration:.2f}s audio to {file_path}")
 
     def cleanup(self) -> None:
@@ -343,10 +498,18 @@ class ServerAudioCapture:
             self._pyaudio.terminate()
             self._pyaudio = None
 
-    def __del__(self):
-        """Cleanup on deletion."""
+    async def aclose(self) -> None:
+        """Stop any recording in progress and release PyAudio."""
+        if self._is_recording:
+            await self.stop_recording()
         self.cleanup()
 
+    async def __aenter__(self) -> "ServerAudioCapture":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
 
 # Global server audio capture instance
 _server_audio: ServerAudioCapture | None = None
@@ -7,14 +7,38 @@ Optimized for Raspberry Pi 5 with quantization support.
 
 import asyncio
 import logging
-import tempfile
+import os
+import threading
 import time
+import weakref
+from collections.abc import AsyncIterator, Callable, Iterable
 from enum import Enum
+from io import BytesIO
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+import numpy as np
+
+from voice.server_audio import MAX_RECORDING_SECONDS, pcm_to_wav_bytes, read_pcm_wav
 
 logger = logging.getLogger(__name__)
 
+# Sample rate Whisper models expect; arrays are passed to the model as-is
+WHISPER_SAMPLE_RATE = 16000
+
+_INT16_SCALE = np.float32(1 / 32768)
+# Frame length (30 ms at WHISPER_SAMPLE_RATE) used by the silence gate
+SILENCE_FRAME_SAMPLES = 480
+# Longest clip whose float32 samples are kept in the reusable scratch buffer
+SCRATCH_MAX_SAMPLES = int(MAX_RECORDING_SECONDS * WHISPER_SAMPLE_RATE)
+
+# Loaded models shared by every WhisperSTT with the same configuration. Entries
+# are weak, so a model is freed once the last instance using it is dropped.
+_shared_models: weakref.WeakValueDictionary[tuple[str, str, str, int, int], Any] = (
+    weakref.WeakValueDictionary()
+)
+_shared_models_lock = threading.Lock()
+
 
 class ModelSize(str, Enum):
     """Whisper model sizes."""
@@ -24,16 +48,129 @@ class ModelSize(str, Enum):
     SMALL = "small"
     MEDIUM = "medium"
     LARGE = "large"
+    # Distilled checkpoints: far fewer decoder layers, close to the WER of the
+    # model they were distilled from (English only)
+    DISTIL_SMALL_EN = "distil-small.en"
+    DISTIL_LARGE_V3 = "distil-large-v3"
+
+
+def _pcm_to_float32(pcm_int16: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """Scale int16 samples to float32 in [-1, 1) in a single ufunc pass.
+
+    The cast happens inside np.multiply, so no intermediate float array is
+    allocated and numpy's SIMD loops do the work. Writes into ``out`` when given.
+    """
+    if out is None:
+        out = np.empty(pcm_int16.shape, dtype=np.float32)
+    np.multiply(pcm_int16, _INT16_SCALE, out=out, dtype=np.float32)
+    return out
+
+
+def _peak_frame_rms(pcm_int16: np.ndarray, frame_samples: int) -> float:
+    """Return the RMS level of the loudest frame of int16 samples.
+
+    Args:
+        pcm_int16: Interleaved int16 samples
+        frame_samples: Samples per frame (a trailing partial frame is ignored
+            unless the clip is shorter than one frame)
+
+    Returns:
+        RMS of the loudest frame on the int16 scale (0 for empty audio)
+    """
+    size = pcm_int16.size
+    if size == 0:
+        return 0.0
+    if size < frame_samples:
+        frames = pcm_int16.reshape(1, size)
+    else:
+        frames = pcm_int16[: size - size % frame_samples].reshape(-1, frame_samples)
+    mean_squares = np.square(frames.astype(np.float32)).mean(axis=1)
+    return float(np.sqrt(mean_squares.max()))
+
+
+def _get_whisper_model(
+    model_size: str,
+    device: str,
+    compute_type: str,
+    cpu_threads: int,
+    num_workers: int,
+    factory: Callable[..., Any] | None = None,
+) -> Any:
+    """Return the loaded WhisperModel for a configuration, loading it only once.
+
+    Blocks while loading, so call it from a worker thread. ``factory`` replaces
+    faster_whisper.WhisperModel when given.
+    """
+    if factory is None:
+        from faster_whisper import WhisperModel
+
+        factory = WhisperModel
+
+    key = (model_size, device, compute_type, cpu_threads, num_workers)
+    with _shared_models_lock:
+        model = _shared_models.get(key)
+        if model is None:
+            model = factory(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+            )
+            _shared_models[key] = model
+        return model
+
+
+def detect_device() -> str:
+    """Return "cuda" when CTranslate2 can see a GPU, otherwise "cpu"."""
+    try:
+        import ctranslate2
+    except ImportError:
+        return "cpu"
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
+def prefetch_model_files(model_dir: Path) -> int:
+    """Ask the kernel to start reading a model's weight files into the page cache.
+
+    CTranslate2 reads model.bin in full when it loads, so having the pages
+    cached (or in flight) turns a cold, disk-bound load into a warm one.
+
+    Args:
+        model_dir: Directory of a converted CTranslate2 model
+
+    Returns:
+        Number of bytes scheduled for readahead (0 where unsupported)
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return 0
+
+    total = 0
+    for path in model_dir.glob("*.bin"):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            total += os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+    return total
 
 
 class WhisperSTT:
     """Speech-to-text using Whisper."""
 
+    # Builds the model instead of faster_whisper.WhisperModel when set
+    _model_factory: Callable[..., Any] | None = None
+
     def __init__(
         self,
         model_size: ModelSize = ModelSize.SMALL,
         device: str = "cpu",
         compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        silence_rms_threshold: float = 0.0,
+        language: str | None = "en",
     ):
         """Initialize Whisper STT.
 
@@ -41,17 +178,48 @@ class WhisperSTT:
             model_size: Size of Whisper model to use
             device: Device to run on ('cpu' or 'cuda')
             compute_type: Quantization type ('int8', 'float16', 'float32')
+            cpu_threads: Threads per transcription on CPU (0 = CTranslate2 default)
+            num_workers: Transcriptions the model can run in parallel
+            silence_rms_threshold: PCM whose loudest 30 ms frame is below this
+                RMS level (int16 scale) is returned as empty text without
+                running the model (0 = disabled)
+            language: Spoken language code, or None to detect it on the first
+                transcription and reuse it until reset_language(), which the
+                service calls when a server recording starts
         """
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.silence_rms_threshold = silence_rms_threshold
+        self.language = language
+        self._detected_language: str | None = None
         self.model: Any = None
+        self._batched_pipeline: Any = None
+        # float32 buffer for PCM input, reused by one transcription at a time
+        self._float_scratch: np.ndarray | None = None
+        self._float_scratch_lock = threading.Lock()
         self._model_load_lock = asyncio.Lock()
 
         logger.info(
             f"WhisperSTT initialized: model={model_size}, device={device}, compute_type={compute_type}"
         )
 
+    @property
+    def transcribe_language(self) -> str | None:
+        """Language passed to Whisper; None means it will be detected."""
+        return self.language or self._detected_language
+
+    def reset_language(self) -> None:
+        """Forget the detected language so the next transcription detects it again."""
+        self._detected_language = None
+
+    def _remember_language(self, info: Any) -> None:
+        if self.language is None and self._detected_language is None:
+            self._detected_language = info.language
+            logger.info(f"Detected spoken language: {info.language}")
+
     async def load_model(self) -> None:
         """Load Whisper model (lazy loading)."""
         if self.model is not None:
@@ -65,18 +233,18 @@ class WhisperSTT:
             start_time = time.perf_counter()
 
             try:
-                # Import faster-whisper for quantized inference
-                from faster_whisper import WhisperModel
-
-                # Load model in executor to avoid blocking
-                loop = asyncio.get_event_loop()
+                # Load model in executor to avoid blocking; instances with the
+                # same configuration share one model
+                loop = asyncio.get_running_loop()
                 self.model = await loop.run_in_executor(
                     None,
-                    lambda: WhisperModel(
-                        self.model_size.value,
-                        device=self.device,
-                        compute_type=self.compute_type,
-                    ),
+                    _get_whisper_model,
+                    self.model_size.value,
+                    self.device,
+                    self.compute_type,
+                    self.cpu_threads,
+                    self.num_workers,
+                    self._model_factory,
                 )
 
                 load_time = time.perf_counter() - start_time
@@ -88,6 +256,27 @@ class WhisperSTT:
                     "faster-whisper required for STT. Install with: pip install faster-whisper"
                 ) from e
 
+    async def prefetch_weights(self) -> int:
+        """Start reading this model's weights from disk ahead of load_model().
+
+        Only models already downloaded to the local cache are prefetched.
+
+        Returns:
+            Number of bytes scheduled for readahead
+        """
+
+        def _prefetch() -> int:
+            try:
+                from faster_whisper.utils import download_model
+
+                model_dir = download_model(self.model_size.value, local_files_only=True)
+            except Exception as e:
+                logger.debug(f"No cached Whisper model to prefetch: {e}")
+                return 0
+            return prefetch_model_files(Path(model_dir))
+
+        return await asyncio.to_thread(_prefetch)
+
     async def transcribe_file(self, audio_path: Path) -> dict[str, str | float]:
         """Transcribe audio file to text.
 
@@ -100,45 +289,99 @@ class WhisperSTT:
         Raises:
             RuntimeError: If model loading fails
         """
+        start_time = time.perf_counter()
+        segments, info = await self._start_file_transcription(audio_path)
+        try:
+            decoded = [segment async for segment in self._iter_segments(segments)]
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            raise RuntimeError(f"Transcription error: {e}") from e
+
+        return self._collect_transcript(decoded, info, start_time)
+
+    async def transcribe_file_stream(self, audio_path: Path) -> AsyncIterator[Any]:
+        """Transcribe audio file, yielding Whisper segments as they are decoded.
+
+        Whisper decodes lazily, so the first segment is available long before
+        the whole clip is done.
+
+        Args:
+            audio_path: Path to audio file (WAV, MP3, etc.)
+
+        Yields:
+            Segments with 'text', 'start' and 'end' (seconds)
+
+        Raises:
+            RuntimeError: If model loading or transcription fails
+        """
+        segments, _info = await self._start_file_transcription(audio_path)
+        try:
+            async for segment in self._iter_segments(segments):
+                yield segment
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            raise RuntimeError(f"Transcription error: {e}") from e
+
+    async def _start_file_transcription(self, audio_path: Path) -> tuple[Any, Any]:
+        """Start transcribing a file; returns the lazy segment generator and info."""
         await self.load_model()
 
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
         logger.info(f"Transcribing audio file: {audio_path}")
-        start_time = time.perf_counter()
 
         try:
             # Run transcription in executor
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
+            language = self.transcribe_language
             segments, info = await loop.run_in_executor(
-                None, lambda: self.model.transcribe(str(audio_path), language="en")
+                None, lambda: self.model.transcribe(str(audio_path), language=language)
             )
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            raise RuntimeError(f"Transcription error: {e}") from e
 
-            # Collect all segments
-            text_parts = []
-            for segment in segments:
-                text_parts.append(segment.text)
+        self._remember_language(info)
+        return segments, info
 
-            transcript = " ".join(text_parts).strip()
-            duration = time.perf_counter() - start_time
+    @staticmethod
+    async def _iter_segments(segments: Iterable[Any]) -> AsyncIterator[Any]:
+        """Decode segments on a worker thread, yielding each one as it is ready."""
+        iterator = iter(segments)
+        loop = asyncio.get_running_loop()
+        while (segment := await loop.run_in_executor(None, next, iterator, None)) is not None:
+            yield segment
 
-            logger.info(f"Transcription complete in {duration:.2f}s: '{transcript[:50]}'")
+    @staticmethod
+    def _collect_transcript(
+        segments: Any, info: Any, start_time: float
+    ) -> dict[str, str | float]:
+        """Join Whisper segments into the transcription result dict."""
+        # Collect all segments
+        text_parts = []
+        for segment in segments:
+            text_parts.append(segment.text)
 
-            return {
-                "text": transcript,
-                "duration": duration,
-                "language": info.language,
-                "language_probability": info.language_probability,
-            }
+        transcript = " ".join(text_parts).strip()
+        duration = time.perf_counter() - start_time
 
-        except Exception as e:
-            logger.error(f"Transcription failed: {e}")
-            raise RuntimeError(f"Transcription error: {e}") from e
+        logger.info(f"Transcription complete in {duration:.2f}s: '{transcript[:50]}'")
+
+        return {
+            "text": transcript,
+            "duration": duration,
+            "language": info.language,
+            "language_probability": info.language_probability,
+        }
 
     async def transcribe_bytes(self, audio_bytes: bytes) -> dict[str, str | float]:
         """Transcribe audio from bytes to text.
 
+        Canonical 16 kHz 16-bit PCM WAVs skip the decoder entirely (see
+        transcribe_bytes_sync); other audio is decoded in memory by
+        faster-whisper (PyAV), without a temp file.
+
         Args:
             audio_bytes: Audio data (WAV format with header)
 
@@ -148,35 +391,189 @@ class WhisperSTT:
         Raises:
             RuntimeError: If model loading fails
         """
-        # Write to temp file for faster-whisper
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_path = Path(tmp_file.name)
-            tmp_file.write(audio_bytes)
+        await self.load_model()
+        return await asyncio.to_thread(self.transcribe_bytes_sync, audio_bytes)
+
+    def transcribe_bytes_sync(
+        self, audio_bytes: bytes, batch_size: int = 1
+    ) -> dict[str, str | float]:
+        """Transcribe audio from bytes on the calling thread.
+
+        Blocks for the whole decode, so run it in a worker thread. The model
+        must already be loaded with load_model().
+
+        Args:
+            audio_bytes: Audio data (WAV format with header)
+            batch_size: Speech chunks decoded together; above 1 the clip goes
+                through faster-whisper's BatchedInferencePipeline
+
+        Returns:
+            Dict with 'text' (transcript) and 'duration' (seconds)
+
+        Raises:
+            RuntimeError: If the model is not loaded or transcription fails
+        """
+        if self.model is None:
+            raise RuntimeError("Whisper model not loaded. Call load_model() first.")
+
+        # A plain PCM WAV at Whisper's rate needs no decoding: read the samples
+        # straight out of the bytes. Encoded audio is never silence-gated, so
+        # neither is this.
+        wav = read_pcm_wav(audio_bytes)
+        if wav is not None:
+            pcm, sample_rate, channels, sample_width = wav
+            if sample_rate == WHISPER_SAMPLE_RATE and sample_width == 2:
+                samples = np.frombuffer(pcm, dtype=np.int16)
+                return self.transcribe_pcm_array(
+                    samples, channels, batch_size, skip_silence=False
+                )
+
+        return self._transcribe_sync(BytesIO(audio_bytes), batch_size)
+
+    def transcribe_stream_sync(
+        self, audio_file: BinaryIO, batch_size: int = 1
+    ) -> dict[str, str | float]:
+        """Transcribe audio read from a file object on the calling thread.
+
+        The decoder reads the file incrementally, so a large upload is never
+        held in memory as a single bytes object. Blocks for the whole decode;
+        the model must already be loaded with load_model().
+
+        Args:
+            audio_file: Binary file object positioned at the start of the audio
+            batch_size: Speech chunks decoded together (see transcribe_bytes_sync)
+
+        Returns:
+            Dict with 'text' (transcript) and 'duration' (seconds)
+
+        Raises:
+            RuntimeError: If the model is not loaded or transcription fails
+        """
+        if self.model is None:
+            raise RuntimeError("Whisper model not loaded. Call load_model() first.")
+
+        return self._transcribe_sync(audio_file, batch_size)
+
+    def transcribe_pcm_array(
+        self,
+        pcm_int16: np.ndarray,
+        channels: int = 1,
+        batch_size: int = 1,
+        skip_silence: bool = True,
+    ) -> dict[str, str | float]:
+        """Transcribe 16 kHz 16-bit PCM samples on the calling thread.
+
+        The samples go to the model as a float32 array, skipping the WAV
+        encode, temp file and decoder pass. Blocks for the whole decode; the
+        model must already be loaded with load_model().
+
+        Args:
+            pcm_int16: Interleaved int16 samples at WHISPER_SAMPLE_RATE
+            channels: Number of interleaved channels, downmixed to mono
+            batch_size: Speech chunks decoded together (see transcribe_bytes_sync)
+            skip_silence: Apply the silence_rms_threshold gate
+
+        Returns:
+            Dict with 'text' (transcript) and 'duration' (seconds)
 
+        Raises:
+            RuntimeError: If the model is not loaded or transcription fails
+        """
+        if self.model is None:
+            raise RuntimeError("Whisper model not loaded. Call load_model() first.")
+
+        if skip_silence and self.silence_rms_threshold > 0:
+            level = _peak_frame_rms(pcm_int16, SILENCE_FRAME_SAMPLES * channels)
+            if level < self.silence_rms_threshold:
+                logger.info(f"Skipping transcription of silent audio (peak RMS {level:.0f})")
+                return {
+                    "text": "",
+                    "duration": 0.0,
+                    "language": self.transcribe_language or "en",
+                    "language_probability": 0.0,
+                }
+
+        samples = pcm_int16.size // channels
+        # Only one transcription at a time uses the scratch buffer; concurrent
+        # ones and clips longer than a server recording get their own array
+        reuse = samples <= SCRATCH_MAX_SAMPLES and self._float_scratch_lock.acquire(
+            blocking=False
+        )
         try:
-            result = await self.transcribe_file(tmp_path)
-            return result
+            audio = self._float_buffer(samples) if reuse else np.empty(samples, np.float32)
+            if channels > 1:
+                # Sum the interleaved channels into one float32 array and scale
+                # once; strided adds are much faster than a mean over axis 1
+                audio[...] = pcm_int16[0::channels][:samples]
+                for channel in range(1, channels):
+                    audio += pcm_int16[channel::channels][:samples]
+                audio *= np.float32(_INT16_SCALE / channels)
+            else:
+                _pcm_to_float32(pcm_int16, out=audio)
+            return self._transcribe_sync(audio, batch_size)
         finally:
-            # Cleanup temp file
-            try:
-                tmp_path.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to delete temp file {tmp_path}: {e}")
+            if reuse:
+                self._float_scratch_lock.release()
+
+    def _float_buffer(self, samples: int) -> np.ndarray:
+        """Return a float32 view of ``samples`` length over the scratch buffer.
+
+        Call with _float_scratch_lock held. The buffer grows up to
+        SCRATCH_MAX_SAMPLES, so repeated transcriptions stop allocating once
+        it fits the longest clip; the model consumes the audio before
+        _transcribe_sync returns, so the next holder can overwrite it.
+        """
+        buffer = self._float_scratch
+        if buffer is None or buffer.size < samples:
+            buffer = np.empty(samples, dtype=np.float32)
+            self._float_scratch = buffer
+        return buffer[:samples]
+
+    def _transcribe_sync(
+        self, audio: str | BinaryIO | np.ndarray, batch_size: int
+    ) -> dict[str, str | float]:
+        try:
+            start_time = time.perf_counter()
+            language = self.transcribe_language
+            if batch_size > 1:
+                segments, info = self._get_batched_pipeline().transcribe(
+                    audio, language=language, batch_size=batch_size
+                )
+            else:
+                segments, info = self.model.transcribe(audio, language=language)
+            self._remember_language(info)
+            return self._collect_transcript(segments, info, start_time)
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            raise RuntimeError(f"Transcription error: {e}") from e
+
+    def _get_batched_pipeline(self) -> Any:
+        """Wrap the loaded model in a BatchedInferencePipeline (created once)."""
+        if self._batched_pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+
+            self._batched_pipeline = BatchedInferencePipeline(model=self.model)
+        return self._batched_pipeline
 
     async def transcribe_pcm(
         self,
-        pcm_data: bytes,
+        pcm_data: bytes | memoryview,
         sample_rate: int = 16000,
         channels: int = 1,
         sample_width: int = 2,
+        batch_size: int = 1,
     ) -> dict[str, str | float]:
-        """Transcribe raw PCM audio to text.
+        """Transcribe raw PCM audio to text on a worker thread.
+
+        16-bit audio at WHISPER_SAMPLE_RATE is handed to the model as an
+        array; anything else is wrapped in a WAV so the decoder resamples it.
 
         Args:
-            pcm_data: Raw PCM audio data
+            pcm_data: Raw PCM audio data; a memoryview is read in place
             sample_rate: Sample rate in Hz
             channels: Number of audio channels
             sample_width: Sample width in bytes
+            batch_size: Speech chunks decoded together (see transcribe_bytes_sync)
 
         Returns:
             Dict with 'text' (transcript) and 'duration' (seconds)
@@ -184,16 +581,13 @@ class WhisperSTT:
         Raises:
             RuntimeError: If model loading fails
         """
-        # Convert PCM to WAV format
-        import wave
-        from io import BytesIO
-
-        wav_buffer = BytesIO()
-        with wave.open(wav_buffer, "wb") as wav_file:
-            wav_file.setnchannels(channels)
-            wav_file.setsampwidth(sample_width)
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(pcm_data)
-
-        wav_bytes = wav_buffer.getvalue()
-        return await self.transcribe_bytes(wav_bytes)
+        await self.load_model()
+
+        if sample_rate == WHISPER_SAMPLE_RATE and sample_width == 2:
+            samples = np.frombuffer(pcm_data, dtype=np.int16)
+            return await asyncio.to_thread(
+                self.transcribe_pcm_array, samples, channels, batch_size
+            )
+
+        wav_bytes = pcm_to_wav_bytes(pcm_data, sample_rate, channels, sample_width)
+        return await asyncio.to_thread(self.transcribe_bytes_sync, wav_bytes, batch_size)
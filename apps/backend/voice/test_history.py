@@ -1,10 +1,14 @@
+import asyncio
 import json
 from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
 from fastapi.testclient import TestClient
 
+from voice import history as voice_history
 from voice import main as voice_main
+from voice.history import VoiceHistory
 
 
 @contextmanager
@@ -20,7 +24,8 @@ def override_history_dir(tmp_path: Path):
         voice_main.VOICE_HISTORY_FILE = original_file
 
 
-def test_voice_history_endpoints(tmp_path):
+def test_voice_history_endpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_main, "PRELOAD_STT", False)
     with override_history_dir(tmp_path):
         with TestClient(voice_main.app) as client:
             response = client.get("/v1/voice/history")
@@ -41,9 +46,162 @@ def test_voice_history_endpoints(tmp_path):
             assert payload["total_entries"] == 1
             assert payload["entries"][0]["text"] == "hello"
 
+            response = client.get("/v1/voice/history/stream")
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            assert [json.loads(line)["text"] for line in response.iter_lines()] == ["hello"]
+
             response = client.delete("/v1/voice/history")
             payload = response.json()
             assert response.status_code == 200
             assert payload["deleted_entries"] == 1
 
+            response = client.get("/v1/voice/history/stream")
+            assert response.status_code == 200
+            assert response.content == b""
+
             assert not voice_main.VOICE_HISTORY_FILE.exists()
+
+
+@pytest.mark.asyncio
+async def test_read_history_parses_only_new_lines(tmp_path):
+    history_file = tmp_path / "history.jsonl"
+    history = VoiceHistory(history_file)
+    history_file.write_text(json.dumps({"text": "one"}) + "\n", encoding="utf-8")
+    first = await history.read_entries()
+    assert [entry["text"] for entry in first] == ["one"]
+
+    history._write_batch([b'{"text": "two"}\n'], [{"text": "two"}])
+    history._close_file()
+    with history_file.open("a", encoding="utf-8") as file:
+        file.write(json.dumps({"text": "three"}) + "\n")
+        file.write('{"text": "partial')
+
+    entries = await history.read_entries()
+    assert [entry["text"] for entry in entries] == ["one", "two", "three"]
+    assert entries[0] is first[0]
+
+    # A rewritten, shorter file is parsed from the start
+    history_file.write_text(json.dumps({"text": "fresh"}) + "\n", encoding="utf-8")
+    assert [entry["text"] for entry in await history.read_entries()] == ["fresh"]
+
+
+@pytest.mark.asyncio
+async def test_read_history_keeps_only_recent_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_history, "HISTORY_CACHE_ENTRIES", 3)
+    history_file = tmp_path / "history.jsonl"
+    history = VoiceHistory(history_file)
+    history_file.write_text(
+        "".join(json.dumps({"text": f"entry {index}"}) + "\n" for index in range(5)),
+        encoding="utf-8",
+    )
+
+    entries = await history.read_entries()
+    assert [entry["text"] for entry in entries] == ["entry 2", "entry 3", "entry 4"]
+    assert history.total_entries == 5
+
+    history._write_batch([b'{"text": "entry 5"}\n'], [{"text": "entry 5"}])
+    history._close_file()
+    entries = await history.read_entries()
+    assert [entry["text"] for entry in entries] == ["entry 3", "entry 4", "entry 5"]
+    assert history.total_entries == 6
+
+
+def test_recorded_history_is_batched_through_writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_main, "PRELOAD_STT", False)
+    with override_history_dir(tmp_path):
+        with TestClient(voice_main.app) as client:
+            for index in range(3):
+                client.portal.call(voice_main.record_voice_history, {"text": f"entry {index}"})
+
+            payload = client.get("/v1/voice/history").json()
+            assert [entry["text"] for entry in payload["entries"]] == [
+                "entry 0",
+                "entry 1",
+                "entry 2",
+            ]
+
+            assert client.delete("/v1/voice/history").json()["deleted_entries"] == 3
+            client.portal.call(voice_main.record_voice_history, {"text": "after delete"})
+            payload = client.get("/v1/voice/history").json()
+            assert [entry["text"] for entry in payload["entries"]] == ["after delete"]
+
+        lines = voice_main.VOICE_HISTORY_FILE.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["text"] for line in lines] == ["after delete"]
+
+
+class _RecordingStore:
+    def __init__(self) -> None:
+        self.batches: list[list[tuple[str, dict]]] = []
+
+    async def store_voice_queries(self, queries):
+        self.batches.append(list(queries))
+
+
+@pytest.mark.asyncio
+async def test_semantic_writer_batches_queued_transcripts(monkeypatch):
+    store = _RecordingStore()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    monkeypatch.setattr(voice_main, "semantic_store", store)
+    monkeypatch.setattr(voice_main, "_semantic_queue", queue)
+
+    for text in ("one", "two", "dropped"):
+        voice_main._record_semantic_voice(text, {"source": "voice-intent"})
+
+    writer = asyncio.create_task(voice_main._run_semantic_writer(queue, store))
+    await queue.join()
+    writer.cancel()
+
+    assert [[text for text, _ in batch] for batch in store.batches] == [["one", "two"]]
+
+
+@pytest.mark.asyncio
+async def test_stream_history_lines_splits_on_line_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_history, "HISTORY_STREAM_CHUNK_BYTES", 7)
+    history = VoiceHistory(tmp_path / "history.jsonl")
+    lines = [json.dumps({"text": f"entry {index}"}) + "\n" for index in range(3)]
+    history.history_file.write_text("".join(lines) + '{"text": "par', encoding="utf-8")
+
+    chunks = [chunk async for chunk in history.stream_lines()]
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert b"".join(chunks).decode() == "".join(lines)
+
+
+@pytest.mark.asyncio
+async def test_voice_history_records_and_clears(tmp_path):
+    history = VoiceHistory(tmp_path / "voice" / "history.jsonl")
+    history.start()
+    try:
+        for index in range(3):
+            history.record({"text": f"entry {index}"})
+        entries = await history.read_entries()
+        assert [entry["text"] for entry in entries] == ["entry 0", "entry 1", "entry 2"]
+
+        assert await history.clear() == 3
+        assert await history.read_entries() == []
+        assert not history.history_file.parent.exists()
+    finally:
+        await history.aclose()
+
+
+@pytest.mark.asyncio
+async def test_semantic_store_opens_in_background(monkeypatch):
+    store = _RecordingStore()
+    queue: asyncio.Queue = asyncio.Queue()
+    monkeypatch.setattr(voice_main, "ChromaManager", lambda: store)
+    monkeypatch.setattr(voice_main, "semantic_store", None)
+    monkeypatch.setattr(voice_main, "_semantic_queue", queue)
+
+    # Transcripts are skipped until the store is open
+    voice_main._record_semantic_voice("early", {})
+    assert queue.empty()
+
+    writer = asyncio.create_task(voice_main._run_semantic_store(queue))
+    while voice_main.semantic_store is None:
+        await asyncio.sleep(0)
+    voice_main._record_semantic_voice("ready", {})
+    await queue.join()
+    writer.cancel()
+
+    assert voice_main.semantic_store is store
+    assert [[text for text, _ in batch] for batch in store.batches] == [["ready"]]
@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+import errno
+import os
 from datetime import datetime, timezone
-from typing import Any
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
+from ai.intent.engine import OllamaModelInfo
+from common.settings import SettingsManager
 from voice import main as voice_main
+from voice import model_manager as voice_model_manager
 from voice.model_manager import (
 	DiskInfo,
+	DownloadInProgressError,
 	DownloadJobInfo,
 	JobState,
+	ModelDownloadJob,
+	ModelDownloadManager,
 	ModelGroupStatus,
 	ModelStatusEnvelope,
 	ModelType,
@@ -67,6 +78,12 @@ class DummyManager:
 		self.started: list[tuple[ModelType, str]] = []
 		self.cancelled: list[str] = []
 
+	def reset(self) -> None:
+		self.status.jobs.clear()
+		self.status.active_job = None
+		self.started.clear()
+		self.cancelled.clear()
+
 	async def get_status(self) -> ModelStatusEnvelope:
 		return self.status
 
@@ -109,19 +126,30 @@ class DummyManager:
 		return
 
 
-@pytest.fixture(name="client")
-def client_fixture(monkeypatch: pytest.MonkeyPatch) -> tuple[TestClient, DummyManager]:
-	"""Provide a TestClient with the model manager swapped for a stub."""
+@pytest.fixture(scope="module")
+def app_client() -> Iterator[tuple[TestClient, DummyManager]]:
+	"""Start the voice app once per module with the model manager swapped for a stub."""
 
 	manager = DummyManager()
 
 	def fake_manager(*args: Any, **kwargs: Any) -> DummyManager:  # noqa: ANN401 - generic factory
 		return manager
 
-	monkeypatch.setattr(voice_main, "ModelDownloadManager", fake_manager)
+	with pytest.MonkeyPatch.context() as monkeypatch:
+		monkeypatch.setattr(voice_main, "ModelDownloadManager", fake_manager)
+		monkeypatch.setattr(voice_main, "PRELOAD_STT", False)
+
+		with TestClient(voice_main.app) as test_client:
+			yield test_client, manager
+
+
+@pytest.fixture(name="client")
+def client_fixture(app_client: tuple[TestClient, DummyManager]) -> tuple[TestClient, DummyManager]:
+	"""Provide the shared TestClient with the stub's recorded calls reset."""
 
-	with TestClient(voice_main.app) as test_client:
-		yield test_client, manager
+	test_client, manager = app_client
+	manager.reset()
+	return test_client, manager
 
 
 def test_get_model_status_returns_payload(client: tuple[TestClient, DummyManager]) -> None:
@@ -159,3 +187,267 @@ def test_cancel_model_download_invokes_manager(client: tuple[TestClient, DummyMa
 	assert response.status_code == 200
 	assert manager.cancelled == ["job-xyz"]
 	assert response.json()["status"] == JobState.CANCELLED.value
+
+
+class CountingIntentEngine:
+	"""Intent engine stub that counts Ollama model listings."""
+
+	def __init__(self) -> None:
+		self.calls = 0
+
+	async def list_models(self) -> list[OllamaModelInfo]:
+		self.calls += 1
+		await asyncio.sleep(0)
+		return [OllamaModelInfo(name="llama3.2:1b")]
+
+
+@pytest.mark.asyncio
+async def test_list_intent_models_coalesces_and_caches(monkeypatch: pytest.MonkeyPatch) -> None:
+	engine = CountingIntentEngine()
+	monkeypatch.setattr(voice_main, "_models_cache", None)
+	monkeypatch.setattr(voice_main, "_models_inflight", None)
+
+	results = await asyncio.gather(*(voice_main._list_intent_models(engine) for _ in range(5)))
+	assert engine.calls == 1
+	assert all(result is results[0] for result in results)
+
+	assert await voice_main._list_intent_models(engine) is results[0]
+	assert engine.calls == 1
+
+	monkeypatch.setattr(voice_main, "MODELS_CACHE_TTL", 0.0)
+	await voice_main._list_intent_models(engine)
+	assert engine.calls == 2
+
+
+def test_compute_directory_size_walks_nested_files(tmp_path: Path) -> None:
+	model_dir = tmp_path / "small"
+	(model_dir / "blobs" / "nested").mkdir(parents=True)
+	(model_dir / "model.bin").write_bytes(b"x" * 100)
+	(model_dir / "blobs" / "shard").write_bytes(b"x" * 20)
+	(model_dir / "blobs" / "nested" / "config.json").write_bytes(b"x" * 3)
+	(model_dir / "link").symlink_to(model_dir / "model.bin")
+
+	assert ModelDownloadManager._compute_directory_size(model_dir) == 123
+
+
+class _ListingEngine:
+	def __init__(self, names: tuple[str, ...] = ("llama3.2:1b",)) -> None:
+		self.calls = 0
+		self.names = names
+		self.unreachable = False
+
+	async def list_models(self, *, raise_errors: bool = False) -> list[OllamaModelInfo]:
+		self.calls += 1
+		if self.unreachable:
+			if raise_errors:
+				raise httpx.ConnectError("Ollama is down")
+			return []
+		return [OllamaModelInfo(name=name, size=10) for name in self.names]
+
+
+async def _build_manager(tmp_path: Path, engine: _ListingEngine) -> ModelDownloadManager:
+	settings = SettingsManager(tmp_path / "settings.json")
+	await settings.load()
+
+	async def provider() -> _ListingEngine:
+		return engine
+
+	return ModelDownloadManager(
+		settings_manager=settings,
+		intent_engine_provider=provider,
+		voice_models_dir=tmp_path / "voice",
+		ollama_models_dir=tmp_path / "ollama",
+	)
+
+
+@pytest.mark.asyncio
+async def test_get_status_reuses_cached_inventory(
+	tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+	monkeypatch.setattr(voice_model_manager, "LLM_MODELS_CACHE_TTL", 3600.0)
+	engine = _ListingEngine()
+	manager = await _build_manager(tmp_path, engine)
+	(tmp_path / "voice" / "tiny").mkdir()
+	(tmp_path / "voice" / "tiny" / "model.bin").write_bytes(b"x" * 10)
+
+	sizes: list[Path] = []
+	compute = ModelDownloadManager._compute_directory_size
+
+	def counting_size(path: Path) -> int:
+		sizes.append(path)
+		return compute(path)
+
+	monkeypatch.setattr(manager, "_compute_directory_size", counting_size)
+
+	for _ in range(2):
+		status = await manager.get_status()
+		tiny = next(model for model in status.voice.models if model.name == "tiny")
+		assert tiny.installed and tiny.installed_size_bytes == 10
+		installed_llms = [model.name for model in status.llm.models if model.installed]
+		assert installed_llms == ["llama3.2:1b"]
+
+	assert sizes == [tmp_path / "voice" / "tiny"]
+	assert engine.calls == 1
+
+	# Once the snapshot is older than the TTL the next poll fetches it again
+	monkeypatch.setattr(voice_model_manager, "LLM_MODELS_CACHE_TTL", 0.0)
+	await manager.get_status()
+	assert engine.calls == 2
+	await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_llm_models_survive_unreachable_ollama(
+	tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+	monkeypatch.setattr(voice_model_manager, "LLM_MODELS_CACHE_TTL", 0.0)
+	engine = _ListingEngine()
+	manager = await _build_manager(tmp_path, engine)
+	assert await manager._is_llm_model_installed("llama3.2:1b")
+
+	# A failed listing keeps the last good snapshot instead of emptying it
+	engine.unreachable = True
+	assert await manager._is_llm_model_installed("llama3.2:1b")
+	assert engine.calls == 2
+
+	# Concurrent polls share one fetch
+	monkeypatch.setattr(voice_model_manager, "LLM_MODELS_CACHE_TTL", 3600.0)
+	manager._llm_models_fetched_at = 0.0
+	await asyncio.gather(*(manager._installed_llm_models() for _ in range(3)))
+	assert engine.calls == 3
+	await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_discard_directory_frees_path_before_deleting(tmp_path: Path) -> None:
+	manager = await _build_manager(tmp_path, _ListingEngine())
+	target = tmp_path / "voice" / "small"
+	(target / "nested").mkdir(parents=True)
+	(target / "nested" / "model.bin").write_bytes(b"x")
+
+	await manager._discard_directory(target)
+	assert not target.exists()
+	await manager._discard_directory(target)
+
+	await manager.aclose()
+	assert list((tmp_path / "voice").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_llm_download_tracks_streamed_progress(tmp_path: Path) -> None:
+	manager = await _build_manager(tmp_path, _ListingEngine())
+	body = (
+		b'{"status": "pulling manifest"}\n\n'
+		b'{"status": "downloading", "total": 200, "completed": 50}\n'
+		b"not json\n"
+		b'{"status": "downloading", "total": 200, "completed": 200}\n'
+		b'{"status": "success"}'
+	)
+
+	async def stream() -> AsyncIterator[bytes]:
+		# Split mid-line to exercise reassembly across chunks
+		for start in range(0, len(body), 7):
+			yield body[start : start + 7]
+
+	def handler(request: httpx.Request) -> httpx.Response:
+		assert request.url.path == "/api/pull"
+		return httpx.Response(200, content=stream())
+
+	manager._ollama_client = httpx.AsyncClient(
+		base_url="http://ollama", transport=httpx.MockTransport(handler)
+	)
+	job = ModelDownloadJob(id="job-1", model="phi", display_name="Phi", model_type=ModelType.LLM)
+
+	await manager._download_llm_model(job)
+
+	assert (job.downloaded_bytes, job.total_bytes, job.progress) == (200, 200, 1.0)
+	await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_status_groups_are_sorted_by_display_name(tmp_path: Path) -> None:
+	manager = await _build_manager(tmp_path, _ListingEngine(("Zephyr", "llama3.2:1b", "aya")))
+
+	status = await manager.get_status()
+
+	voice_names = [model.display_name for model in status.voice.models]
+	llm_names = [model.display_name for model in status.llm.models]
+	assert voice_names == sorted(voice_names, key=str.lower)
+	assert llm_names == sorted(llm_names, key=str.lower)
+	assert {"Zephyr", "aya"} <= set(llm_names)
+	await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_disk_info_is_cached_per_filesystem(
+	tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+	manager = await _build_manager(tmp_path, _ListingEngine())
+	calls: list[str] = []
+	statvfs = os.statvfs
+
+	def counting_statvfs(path: os.PathLike[str]) -> os.statvfs_result:
+		calls.append(os.fspath(path))
+		return statvfs(path)
+
+	monkeypatch.setattr(voice_model_manager.os, "statvfs", counting_statvfs)
+
+	voice_disk = manager._disk_info(tmp_path / "voice")
+	llm_disk = manager._disk_info(tmp_path / "ollama")
+	assert (voice_disk.path, llm_disk.path) == (str(tmp_path / "voice"), str(tmp_path / "ollama"))
+	assert voice_disk.free_bytes == llm_disk.free_bytes
+	assert len(calls) == 1
+
+	monkeypatch.setattr(voice_model_manager, "DISK_INFO_CACHE_TTL", 0.0)
+	manager._disk_info(tmp_path / "voice")
+	assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_status_tracks_latest_job_per_model(
+	tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+	manager = await _build_manager(tmp_path, _ListingEngine())
+
+	async def no_download(job: ModelDownloadJob) -> None:
+		return None
+
+	monkeypatch.setattr(manager, "_run_job", no_download)
+
+	first = await manager.start_download(ModelType.VOICE, "tiny")
+	manager._jobs[first.id].status = JobState.FAILED
+	retry = await manager.start_download(ModelType.VOICE, "tiny")
+
+	status = await manager.get_status()
+	tiny = next(model for model in status.voice.models if model.name == "tiny")
+	assert tiny.download_job_id == retry.id
+	assert tiny.status is VariantStatus.DOWNLOADING
+
+	with pytest.raises(DownloadInProgressError):
+		await manager.start_download(ModelType.VOICE, "tiny")
+	await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_move_directory_copies_across_filesystems(
+	tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+	manager = await _build_manager(tmp_path, _ListingEngine())
+	source = tmp_path / "voice" / ".tiny.tmp-job"
+	target = tmp_path / "voice" / "tiny"
+	(source / "nested").mkdir(parents=True)
+	(source / "nested" / "model.bin").write_bytes(b"weights")
+	rename = os.rename
+
+	def cross_device_rename(src: os.PathLike[str], dst: os.PathLike[str]) -> None:
+		if Path(dst) == target:
+			raise OSError(errno.EXDEV, "Invalid cross-device link")
+		rename(src, dst)
+
+	monkeypatch.setattr(voice_model_manager.os, "rename", cross_device_rename)
+
+	await manager._move_directory(source, target)
+	await manager.aclose()
+
+	assert (target / "nested" / "model.bin").read_bytes() == b"weights"
+	assert [path.name for path in (tmp_path / "voice").iterdir()] == ["tiny"]
@@ -3,12 +3,22 @@ Tests for server-side audio capture module.
 """
 
 import asyncio
+import struct
+import time
+import wave
+from io import BytesIO
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
-from voice.server_audio import AudioBuffer, ServerAudioCapture, get_server_audio
+from voice.server_audio import (
+    AudioBuffer,
+    ServerAudioCapture,
+    get_server_audio,
+    pcm_to_wav_bytes,
+    read_pcm_wav,
+)
 
 
 class TestAudioBuffer:
@@ -21,7 +31,7 @@ class TestAudioBuffer:
         assert buffer.sample_rate == 16000
         assert buffer.channels == 1
         assert buffer.sample_width == 2
-        assert len(buffer.chunks) == 0
+        assert buffer.get_audio_bytes() == b""
 
     def test_add_chunk(self):
         """Test adding audio chunks."""
@@ -30,11 +40,10 @@ class TestAudioBuffer:
         chunk2 = b"\x02\x03" * 100
 
         buffer.add_chunk(chunk1)
-        assert len(buffer.chunks) == 1
-        assert buffer.chunks[0] == chunk1
+        assert buffer.get_audio_bytes() == chunk1
 
         buffer.add_chunk(chunk2)
-        assert len(buffer.chunks) == 2
+        assert buffer.get_audio_bytes() == chunk1 + chunk2
 
     def test_add_chunk_max_duration(self):
         """Test buffer limits based on max_duration."""
@@ -48,10 +57,35 @@ class TestAudioBuffer:
         for _ in range(10):
             buffer.add_chunk(chunk)
 
-        # Buffer should have limited chunks (oldest removed)
-        total_bytes = sum(len(c) for c in buffer.chunks)
+        # Buffer keeps only the most recent max_duration of audio
         max_bytes = int(buffer.sample_rate * buffer.channels * buffer.sample_width * 0.001)
-        assert total_bytes <= max_bytes * 1.5  # Allow some overflow
+        assert buffer.get_audio_bytes() == chunk[-max_bytes:]
+        assert buffer.get_duration_seconds() == pytest.approx(0.001)
+
+    @pytest.mark.perf
+    def test_add_chunk_scaling(self):
+        """Test 100k appends to a full buffer stay linear (no per-append copies)."""
+        buffer = AudioBuffer(max_duration_seconds=30.0)
+        chunk = b"\x01\x00" * 160  # 10ms @ 16kHz mono
+
+        start = time.perf_counter()
+        for _ in range(100_000):
+            buffer.add_chunk(chunk)
+        elapsed = time.perf_counter() - start
+
+        assert buffer.get_duration_seconds() == pytest.approx(30.0)
+        assert elapsed < 1.0
+
+    def test_add_chunk_wraps_around(self):
+        """Test the oldest audio is overwritten once the buffer is full."""
+        buffer = AudioBuffer(max_duration_seconds=0.0005)  # 16 bytes
+        buffer.add_chunk(bytes(range(10)))
+        buffer.add_chunk(bytes(range(10, 20)))
+
+        assert buffer.get_audio_bytes() == bytes(range(4, 20))
+
+        buffer.add_chunk(bytes(range(20, 25)))
+        assert buffer.get_audio_bytes() == bytes(range(9, 25))
 
     def test_get_audio_bytes(self):
         """Test getting concatenated audio."""
@@ -65,6 +99,20 @@ class TestAudioBuffer:
         audio = buffer.get_audio_bytes()
         assert audio == b"\x00\x01\x02\x03"
 
+    def test_get_audio_view(self):
+        """Test the view is zero-copy until the buffer wraps."""
+        buffer = AudioBuffer(max_duration_seconds=0.0005)  # 16 bytes
+        buffer.add_chunk(bytes(range(10)))
+
+        view = buffer.get_audio_view()
+        assert view.obj is buffer._buf
+        assert view == bytes(range(10))
+
+        buffer.add_chunk(bytes(range(10, 20)))
+        view = buffer.get_audio_view()
+        assert view.obj is not buffer._buf
+        assert view == bytes(range(4, 20))
+
     def test_get_duration_seconds(self):
         """Test duration calculation."""
         buffer = AudioBuffer()
@@ -86,8 +134,8 @@ class TestAudioBuffer:
         buffer.add_chunk(b"\x02\x03")
 
         buffer.clear()
-        assert len(buffer.chunks) == 0
         assert buffer.get_audio_bytes() == b""
+        assert buffer.get_duration_seconds() == 0.0
 
     def test_to_wav_bytes(self):
         """Test WAV conversion."""
@@ -118,6 +166,20 @@ class TestAudioBuffer:
         assert output_file.exists()
         assert output_file.stat().st_size > 2000  # Header + data
 
+    def test_save_wav_wrapped(self, tmp_path: Path):
+        """Test a wrapped buffer is saved oldest audio first."""
+        buffer = AudioBuffer(max_duration_seconds=0.0005)  # 16 bytes
+        buffer.add_chunk(bytes(range(10)))
+        buffer.add_chunk(bytes(range(10, 20)))
+
+        output_file = tmp_path / "wrapped.wav"
+        buffer.save_wav(output_file)
+
+        with wave.open(str(output_file), "rb") as wav_file:
+            assert wav_file.getnframes() == 8
+            assert wav_file.readframes(8) == bytes(range(4, 20))
+        assert buffer.to_wav_bytes() == output_file.read_bytes()
+
     def test_save_wav_empty(self, tmp_path: Path):
         """Test saving empty buffer (should not create file)."""
         buffer = AudioBuffer()
@@ -139,9 +201,52 @@ class TestServerAudioCapture:
         assert capture.channels == 2
         assert capture.chunk_size == 2048
         assert capture.device_index == 1
+        assert capture.bytes_per_second == 44100 * 2 * 2
         assert capture._pyaudio is None
         assert not capture._is_recording
 
+    def test_duration_seconds(self):
+        """Test duration of captured PCM audio."""
+        capture = ServerAudioCapture(sample_rate=16000, channels=1)
+        assert capture.duration_seconds(b"\x00" * 32000) == 1.0
+        assert capture.duration_seconds(b"") == 0.0
+
+    def test_to_wav_bytes_matches_wave_module(self):
+        """Test the precomputed header matches what the wave module writes."""
+        capture = ServerAudioCapture(sample_rate=44100, channels=2)
+        audio_data = b"\x00\x01" * 1000
+
+        expected = BytesIO()
+        with wave.open(expected, "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(44100)
+            wav_file.writeframes(audio_data)
+
+        assert capture.to_wav_bytes(audio_data) == expected.getvalue()
+
+    def test_read_pcm_wav(self):
+        """Test samples and format are read back from a canonical WAV."""
+        capture = ServerAudioCapture(sample_rate=16000, channels=2)
+        wav_bytes = capture.to_wav_bytes(b"\x00\x01" * 5)
+
+        pcm, sample_rate, channels, sample_width = read_pcm_wav(wav_bytes)
+        assert (sample_rate, channels, sample_width) == (16000, 2, 2)
+        assert pcm == b"\x00\x01" * 4  # the trailing partial frame is dropped
+
+        assert read_pcm_wav(b"ID3" + bytes(64)) is None
+
+    def test_read_pcm_wav_placeholder_sizes(self):
+        """Test streamed WAVs with a 0 or 0xFFFFFFFF data size keep all their samples."""
+        pcm = b"\x00\x01" * 8
+        for placeholder in (0, 0xFFFFFFFF):
+            wav_bytes = bytearray(pcm_to_wav_bytes(pcm, 16000, 1, 2))
+            struct.pack_into("<I", wav_bytes, 40, placeholder)
+
+            samples, sample_rate, channels, sample_width = read_pcm_wav(wav_bytes)
+            assert samples == pcm
+            assert (sample_rate, channels, sample_width) == (16000, 1, 2)
+
     def test_is_available_success(self):
         """Test availability check when PyAudio available."""
         with patch("builtins.__import__") as mock_import:
@@ -282,7 +387,6 @@ class TestServerAudioCapture:
         with patch("builtins.__import__") as mock_import:
             mock_pa = Mock()
             mock_stream = Mock()
-            mock_stream.read.return_value = b"\x00\x01" * 100
             mock_pa.open.return_value = mock_stream
 
             def import_side_effect(name, *args, **kwargs):
@@ -298,14 +402,16 @@ class TestServerAudioCapture:
             capture = ServerAudioCapture()
             await capture.start_recording()
 
-            # Simulate some recording
-            capture._audio_chunks = [b"\x00\x01" * 100]
+            # Simulate PortAudio delivering two chunks
+            callback = mock_pa.open.call_args.kwargs["stream_callback"]
+            for _ in range(2):
+                assert callback(b"\x00\x01" * 50, 50, {}, 0)[0] is None
 
             # Stop recording
             audio_data = await capture.stop_recording()
 
             assert not capture._is_recording
-            assert len(audio_data) == 200
+            assert audio_data == b"\x00\x01" * 100
             mock_stream.stop_stream.assert_called_once()
             mock_stream.close.assert_called_once()
 
@@ -364,6 +470,23 @@ class TestServerAudioCapture:
             assert capture._stream is None
             assert capture._pyaudio is None
 
+    async def test_async_context_stops_recording(self):
+        """Test leaving the context stops recording and releases PyAudio."""
+        mock_pa = Mock()
+        mock_stream = Mock()
+        mock_stream.is_active.return_value = False
+        mock_pa.open.return_value = mock_stream
+
+        async with ServerAudioCapture() as capture:
+            capture._pyaudio = mock_pa
+            capture._stream = mock_stream
+            capture._is_recording = True
+
+        assert not capture._is_recording
+        mock_stream.stop_stream.assert_called_once()
+        mock_pa.terminate.assert_called_once()
+        assert capture._pyaudio is None
+
 
 def test_get_server_audio_singleton():
     """Test global singleton."""
@@ -3,14 +3,25 @@ Tests for Whisper STT module.
 """
 
 import asyncio
+import os
 import wave
 from io import BytesIO
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
-from voice.stt import ModelSize, WhisperSTT
+from voice import stt as stt_module
+from voice.stt import ModelSize, WhisperSTT, prefetch_model_files
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_models():
+    """Keep models loaded by one test from leaking into the next."""
+    stt_module._shared_models.clear()
+    yield
+    stt_module._shared_models.clear()
 
 
 class TestWhisperSTT:
@@ -32,7 +43,7 @@ class TestWhisperSTT:
         assert stt.compute_type == "float16"
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_load_model(self, mock_model_class):
         """Test model loading."""
         mock_model = MagicMock()
@@ -43,11 +54,11 @@ class TestWhisperSTT:
 
         assert stt.model is not None
         mock_model_class.assert_called_once_with(
-            "tiny", device="cpu", compute_type="int8"
+            "tiny", device="cpu", compute_type="int8", cpu_threads=0, num_workers=1
         )
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_load_model_once(self, mock_model_class):
         """Test model loads only once."""
         mock_model = MagicMock()
@@ -63,7 +74,7 @@ class TestWhisperSTT:
         mock_model_class.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_load_model_concurrent(self, mock_model_class):
         """Test concurrent model loading."""
         mock_model = MagicMock()
@@ -77,6 +88,19 @@ class TestWhisperSTT:
         # Should only call once
         mock_model_class.assert_called_once()
 
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_load_model_shared_between_instances(self, mock_model_class):
+        """Test instances with the same configuration share one model."""
+        first = WhisperSTT(model_size=ModelSize.TINY)
+        second = WhisperSTT(model_size=ModelSize.TINY)
+        other = WhisperSTT(model_size=ModelSize.TINY, compute_type="float32")
+
+        await asyncio.gather(first.load_model(), second.load_model(), other.load_model())
+
+        assert first.model is second.model
+        assert mock_model_class.call_count == 2
+
     @pytest.mark.asyncio
     async def test_load_model_import_error(self):
         """Test model loading with import error."""
@@ -87,7 +111,7 @@ class TestWhisperSTT:
                 await stt.load_model()
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_transcribe_file(self, mock_model_class, tmp_path: Path):
         """Test file transcription."""
         # Create mock model
@@ -117,7 +141,7 @@ class TestWhisperSTT:
         assert result["language_probability"] == 0.95
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_transcribe_file_not_found(self, mock_model_class):
         """Test transcription with non-existent file."""
         mock_model = MagicMock()
@@ -130,7 +154,7 @@ class TestWhisperSTT:
             await stt.transcribe_file(Path("/nonexistent/file.wav"))
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_transcribe_file_multi_segment(self, mock_model_class, tmp_path: Path):
         """Test transcription with multiple segments."""
         mock_model = MagicMock()
@@ -157,7 +181,35 @@ class TestWhisperSTT:
         assert result["text"] == "Hello   world"
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_file_stream(self, mock_model_class, tmp_path: Path):
+        """Test segments are yielded one at a time as Whisper decodes them."""
+        decoded: list[str] = []
+
+        def lazy_segments():
+            for text in (" Hello", " world"):
+                decoded.append(text)
+                segment = MagicMock()
+                segment.text = text
+                yield segment
+
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = (lazy_segments(), MagicMock())
+        mock_model_class.return_value = mock_model
+
+        audio_file = tmp_path / "test.wav"
+        audio_file.write_bytes(b"RIFF")
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        stream = stt.transcribe_file_stream(audio_file)
+        first = await anext(stream)
+        assert first.text == " Hello"
+        assert decoded == [" Hello"]
+
+        assert [segment.text async for segment in stream] == [" world"]
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_transcribe_bytes(self, mock_model_class):
         """Test transcription from bytes."""
         mock_model = MagicMock()
@@ -182,9 +234,109 @@ class TestWhisperSTT:
 
         assert result["text"] == "Test"
         assert result["duration"] > 0
+        # A 16 kHz PCM WAV is read straight into a float32 array
+        audio = mock_model.transcribe.call_args.args[0]
+        assert audio.dtype == np.float32
+        assert audio.shape == (1000,)
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_bytes_decodes_other_formats(self, mock_model_class):
+        """Test audio that is not a 16 kHz PCM WAV is left to the decoder."""
+        mock_model = MagicMock()
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.9
+        mock_model.transcribe.return_value = ([], mock_info)
+        mock_model_class.return_value = mock_model
+
+        wav_buffer = BytesIO()
+        with wave.open(wav_buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(44100)
+            wav.writeframes(b"\x00\x01" * 1000)
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        await stt.transcribe_bytes(wav_buffer.getvalue())
+
+        audio = mock_model.transcribe.call_args.args[0]
+        assert audio.getvalue() == wav_buffer.getvalue()
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_bytes_sync(self, mock_model_class):
+        """Test blocking transcription from bytes in a worker thread."""
+        mock_model = MagicMock()
+        mock_segment = MagicMock()
+        mock_segment.text = "Long clip"
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.9
+        mock_model.transcribe.return_value = ([mock_segment], mock_info)
+        mock_model_class.return_value = mock_model
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        with pytest.raises(RuntimeError, match="not loaded"):
+            stt.transcribe_bytes_sync(b"RIFF")
+
+        await stt.load_model()
+        result = await asyncio.to_thread(stt.transcribe_bytes_sync, b"RIFF")
+
+        assert result["text"] == "Long clip"
+        audio = mock_model.transcribe.call_args.args[0]
+        assert isinstance(audio, BytesIO)
+        assert audio.getvalue() == b"RIFF"
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_stream_sync(self, mock_model_class):
+        """Test transcription straight from a file object."""
+        mock_model = MagicMock()
+        mock_segment = MagicMock()
+        mock_segment.text = "Streamed"
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.9
+        mock_model.transcribe.return_value = ([mock_segment], mock_info)
+        mock_model_class.return_value = mock_model
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        audio_file = BytesIO(b"RIFF")
+        with pytest.raises(RuntimeError, match="not loaded"):
+            stt.transcribe_stream_sync(audio_file)
+
+        await stt.load_model()
+        result = await asyncio.to_thread(stt.transcribe_stream_sync, audio_file)
+
+        assert result["text"] == "Streamed"
+        assert mock_model.transcribe.call_args.args[0] is audio_file
+
+    @pytest.mark.asyncio
+    @patch("faster_whisper.BatchedInferencePipeline")
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_bytes_sync_batched(self, mock_model_class, mock_pipeline_class):
+        """Test batched transcription reuses one BatchedInferencePipeline."""
+        mock_segment = MagicMock()
+        mock_segment.text = "Batched"
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.9
+        mock_pipeline = mock_pipeline_class.return_value
+        mock_pipeline.transcribe.return_value = ([mock_segment], mock_info)
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        await stt.load_model()
+        for _ in range(2):
+            result = await asyncio.to_thread(stt.transcribe_bytes_sync, b"RIFF", 4)
+
+        assert result["text"] == "Batched"
+        mock_pipeline_class.assert_called_once_with(model=mock_model_class.return_value)
+        assert mock_pipeline.transcribe.call_args.kwargs["batch_size"] == 4
+        mock_model_class.return_value.transcribe.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_transcribe_pcm(self, mock_model_class):
         """Test transcription from PCM data."""
         mock_model = MagicMock()
@@ -205,9 +357,142 @@ class TestWhisperSTT:
 
         assert result["text"] == "PCM test"
         assert result["duration"] > 0
+        audio = mock_model.transcribe.call_args.args[0]
+        assert audio.dtype == np.float32
+        assert audio.shape == (16000,)
+        assert audio[0] == pytest.approx(256 / 32768)
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_pcm_array_downmix(self, mock_model_class):
+        """Test interleaved stereo samples are downmixed to mono."""
+        mock_model = MagicMock()
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.85
+        mock_model.transcribe.return_value = ([], mock_info)
+        mock_model_class.return_value = mock_model
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        await stt.load_model()
+        samples = np.array([16384, 0, -16384, 0], dtype=np.int16)
+        await asyncio.to_thread(stt.transcribe_pcm_array, samples, 2)
+
+        audio = mock_model.transcribe.call_args.args[0]
+        np.testing.assert_allclose(audio, [0.25, -0.25])
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_pcm_array_reuses_buffer(self, mock_model_class):
+        """Test repeated transcriptions on one thread reuse the float32 buffer."""
+        received = []
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.85
+        mock_model = MagicMock()
+        mock_model.transcribe.side_effect = lambda audio, **_: (
+            received.append((audio, audio.copy())) or ([], mock_info)
+        )
+        mock_model_class.return_value = mock_model
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        await stt.load_model()
+        stt.transcribe_pcm_array(np.array([16384, -16384, 8192], dtype=np.int16))
+        stt.transcribe_pcm_array(np.array([-8192, 16384], dtype=np.int16))
+
+        (first, first_values), (second, second_values) = received
+        assert np.shares_memory(first, second)
+        np.testing.assert_allclose(first_values, [0.5, -0.5, 0.25])
+        np.testing.assert_allclose(second_values, [-0.25, 0.5])
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_pcm_array_scratch_limits(self, mock_model_class, monkeypatch):
+        """Test long clips and concurrent calls get their own array, not the scratch."""
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.85
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = ([], mock_info)
+        mock_model_class.return_value = mock_model
+        monkeypatch.setattr(stt_module, "SCRATCH_MAX_SAMPLES", 2)
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        await stt.load_model()
+        stt.transcribe_pcm_array(np.array([1, 2, 3], dtype=np.int16))
+        assert stt._float_scratch is None
+
+        with stt._float_scratch_lock:
+            stt.transcribe_pcm_array(np.array([1, 2], dtype=np.int16))
+        assert stt._float_scratch is None
+
+        stt.transcribe_pcm_array(np.array([1, 2], dtype=np.int16))
+        assert stt._float_scratch is not None
+        assert not stt._float_scratch_lock.locked()
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_pcm_skips_silence(self, mock_model_class):
+        """Test audio below the silence threshold never reaches the model."""
+        mock_model = MagicMock()
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.85
+        mock_model.transcribe.return_value = ([], mock_info)
+        mock_model_class.return_value = mock_model
+
+        stt = WhisperSTT(model_size=ModelSize.TINY, silence_rms_threshold=300)
+        quiet = np.full(16000, 50, dtype=np.int16)
+        result = await stt.transcribe_pcm(quiet.tobytes())
+
+        assert result["text"] == ""
+        mock_model.transcribe.assert_not_called()
+
+        # One loud 30 ms frame is enough to run the model
+        quiet[8000:8480] = 2000
+        await stt.transcribe_pcm(quiet.tobytes())
+        mock_model.transcribe.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_detected_language_is_reused(self, mock_model_class):
+        """Test the language is detected once and passed on later calls."""
+        mock_model = MagicMock()
+        mock_info = MagicMock()
+        mock_info.language = "de"
+        mock_info.language_probability = 0.9
+        mock_model.transcribe.return_value = ([], mock_info)
+        mock_model_class.return_value = mock_model
+
+        stt = WhisperSTT(model_size=ModelSize.TINY, language=None)
+        await stt.transcribe_bytes(b"RIFF")
+        assert mock_model.transcribe.call_args.kwargs["language"] is None
+
+        await stt.transcribe_bytes(b"RIFF")
+        assert mock_model.transcribe.call_args.kwargs["language"] == "de"
+
+        stt.reset_language()
+        assert stt.transcribe_language is None
 
     @pytest.mark.asyncio
-    @patch("faster_whisper.WhisperModel")
+    @patch.object(WhisperSTT, "_model_factory")
+    async def test_transcribe_pcm_resamples_via_wav(self, mock_model_class):
+        """Test PCM at another sample rate goes through the WAV decoder."""
+        mock_model = MagicMock()
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_info.language_probability = 0.85
+        mock_model.transcribe.return_value = ([], mock_info)
+        mock_model_class.return_value = mock_model
+
+        stt = WhisperSTT(model_size=ModelSize.TINY)
+        await stt.transcribe_pcm(b"\x00\x01" * 44100, sample_rate=44100)
+
+        audio = mock_model.transcribe.call_args.args[0]
+        assert audio.getvalue()[:4] == b"RIFF"
+
+    @pytest.mark.asyncio
+    @patch.object(WhisperSTT, "_model_factory")
     async def test_transcribe_error(self, mock_model_class, tmp_path: Path):
         """Test transcription error handling."""
         mock_model = MagicMock()
@@ -225,3 +510,12 @@ class TestWhisperSTT:
 
         with pytest.raises(RuntimeError, match="Transcription error"):
             await stt.transcribe_file(audio_file)
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise unavailable")
+def test_prefetch_model_files(tmp_path: Path):
+    """Weight files are scheduled for readahead; other files are ignored."""
+    (tmp_path / "model.bin").write_bytes(b"\x00" * 4096)
+    (tmp_path / "config.json").write_text("{}")
+
+    assert prefetch_model_files(tmp_path) == 4096
@@ -0,0 +1,124 @@
+"""Tests for STT engine selection in the voice service."""
+
+import wave
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from common.settings import SettingsManager
+from voice import main as voice_main
+from voice.stt import ModelSize
+
+
+@pytest.fixture
+async def settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SettingsManager:
+    """Point the voice service at a fresh settings file with no cached engine."""
+    manager = SettingsManager(tmp_path / "settings.json")
+    await manager.load()
+    monkeypatch.setattr(voice_main, "settings_manager", manager)
+    monkeypatch.setattr(voice_main, "stt_engine", None)
+    monkeypatch.setattr(voice_main, "current_voice_model", None)
+    monkeypatch.setattr(voice_main, "_stt_pool", OrderedDict())
+    monkeypatch.setattr(voice_main, "_stt_device", "cpu")
+    monkeypatch.setattr(voice_main, "_settings_refreshed_at", 0.0)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_get_stt_engine_reuses_engine(settings: SettingsManager) -> None:
+    """The engine is built once and reused while the model setting is unchanged."""
+    engine = await voice_main.get_stt_engine()
+    assert engine.model_size == ModelSize.SMALL
+    assert (engine.cpu_threads, engine.num_workers) == (
+        voice_main.STT_CPU_THREADS,
+        voice_main.STT_CONCURRENCY,
+    )
+    assert await voice_main.get_stt_engine() is engine
+
+
+@pytest.mark.asyncio
+async def test_get_stt_engine_refreshes_settings_after_ttl(
+    settings: SettingsManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Settings are only re-read from disk once the refresh TTL has elapsed."""
+    engine = await voice_main.get_stt_engine()
+
+    # Another service switches the model on disk
+    other = SettingsManager(settings.settings_path)
+    await other.load()
+    await other.set("voice_model", "tiny")
+
+    assert await voice_main.get_stt_engine() is engine
+
+    monkeypatch.setattr(voice_main, "_settings_refreshed_at", 0.0)
+    switched = await voice_main.get_stt_engine()
+    assert switched is not engine
+    assert switched.model_size == ModelSize.TINY
+
+
+@pytest.mark.asyncio
+async def test_get_stt_engine_reloads_on_compute_type_change(settings: SettingsManager) -> None:
+    """Switching the compute type rebuilds the engine; unsupported types fall back."""
+    engine = await voice_main.get_stt_engine()
+    assert engine.compute_type == "int8"
+
+    await settings.set("voice_compute_type", "float32")
+    switched = await voice_main.get_stt_engine()
+    assert switched is not engine
+    assert switched.compute_type == "float32"
+
+    await settings.set("voice_compute_type", "int4")
+    fallback = await voice_main.get_stt_engine()
+    assert fallback.compute_type == "int8"
+    assert await voice_main.get_stt_engine() is fallback
+
+
+@pytest.mark.asyncio
+async def test_get_stt_engine_defaults_to_int8_float16_on_gpu(
+    settings: SettingsManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """With a GPU the default compute type is int8_float16; the env var overrides it."""
+    monkeypatch.setattr(voice_main, "_stt_device", "cuda")
+    engine = await voice_main.get_stt_engine()
+    assert (engine.device, engine.compute_type) == ("cuda", "int8_float16")
+
+    monkeypatch.setattr(voice_main, "VOICE_COMPUTE_TYPE", "float16")
+    override = await voice_main.get_stt_engine()
+    assert (override.device, override.compute_type) == ("cuda", "float16")
+
+
+@pytest.mark.asyncio
+async def test_get_stt_engine_keeps_recent_engines(settings: SettingsManager) -> None:
+    """Switching back to a recently used model reuses its engine; older ones are evicted."""
+    small = await voice_main.get_stt_engine()
+
+    await settings.set("voice_model", "tiny")
+    tiny = await voice_main.get_stt_engine()
+
+    await settings.set("voice_model", "small")
+    assert await voice_main.get_stt_engine() is small
+    assert voice_main.current_voice_model == ModelSize.SMALL
+
+    # tiny is now the least recently used engine and makes way for base
+    await settings.set("voice_model", "base")
+    await voice_main.get_stt_engine()
+    await settings.set("voice_model", "tiny")
+    assert await voice_main.get_stt_engine() is not tiny
+
+
+def test_silence_wav_is_one_second_of_mono_pcm() -> None:
+    """The warmup clip is a valid one-second 16 kHz WAV."""
+    with wave.open(BytesIO(voice_main._silence_wav()), "rb") as wav_file:
+        assert wav_file.getnchannels() == 1
+        assert wav_file.getframerate() == 16000
+        assert wav_file.getnframes() == 16000
+
+
+@pytest.mark.asyncio
+async def test_get_stt_engine_accepts_distilled_models(settings: SettingsManager) -> None:
+    """Distil-Whisper variants from the model catalog are valid voice_model values."""
+    await settings.set("voice_model", "distil-large-v3")
+    engine = await voice_main.get_stt_engine()
+    assert engine.model_size == ModelSize.DISTIL_LARGE_V3
@@ -0,0 +1,171 @@
+"""Tests for the voice transcription endpoints."""
+
+import base64
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import pytest
+from fastapi.testclient import TestClient
+
+from voice import main as voice_main
+from voice.stt import ModelSize
+from voice.test_history import override_history_dir
+
+
+class _FakeEngine:
+    """Stands in for WhisperSTT and records the audio it was given."""
+
+    def __init__(self) -> None:
+        self.audio: list[bytes] = []
+        self.threaded: list[bytes] = []
+        self.batch_sizes: list[int] = []
+        self.streamed: list[bytes] = []
+        self.language_resets = 0
+
+    async def load_model(self) -> None:
+        return None
+
+    async def transcribe_bytes(self, audio_bytes: bytes) -> dict[str, Any]:
+        self.audio.append(audio_bytes)
+        return {"text": "hello", "duration": 1.0, "language": "en"}
+
+    def transcribe_bytes_sync(self, audio_bytes: bytes, batch_size: int = 1) -> dict[str, Any]:
+        self.threaded.append(audio_bytes)
+        self.batch_sizes.append(batch_size)
+        return {"text": "hello long", "duration": 20.0, "language": "en"}
+
+    def transcribe_stream_sync(self, audio_file: BinaryIO, batch_size: int = 1) -> dict[str, Any]:
+        self.streamed.append(audio_file.read())
+        self.batch_sizes.append(batch_size)
+        return {"text": "hello file", "duration": 1.0, "language": "en"}
+
+    def reset_language(self) -> None:
+        self.language_resets += 1
+
+
+class _FakeServerAudio:
+    """Stands in for ServerAudioCapture without opening a device."""
+
+    device_index = None
+
+    async def start_recording(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+@pytest.fixture
+def engine(monkeypatch: pytest.MonkeyPatch) -> _FakeEngine:
+    fake = _FakeEngine()
+
+    async def get_fake_engine() -> _FakeEngine:
+        return fake
+
+    monkeypatch.setattr(voice_main, "get_stt_engine", get_fake_engine)
+    return fake
+
+
+@pytest.fixture
+def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(voice_main, "PRELOAD_STT", False)
+    with override_history_dir(tmp_path):
+        with TestClient(voice_main.app) as test_client:
+            yield test_client
+
+
+def test_transcribe_raw_body(client: TestClient, engine: _FakeEngine) -> None:
+    response = client.post(
+        "/v1/voice/stt/raw",
+        content=b"RIFF-audio",
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert response.status_code == 200
+    assert response.json()["text"] == "hello"
+    assert engine.audio == [b"RIFF-audio"]
+
+    history = client.get("/v1/voice/history").json()
+    assert [entry["source"] for entry in history["entries"]] == ["raw-upload"]
+
+
+def test_transcribe_raw_rejects_empty_body(client: TestClient, engine: _FakeEngine) -> None:
+    response = client.post("/v1/voice/stt/raw", content=b"")
+    assert response.status_code == 400
+    assert engine.audio == []
+
+
+def test_transcribe_base64_matches_raw(client: TestClient, engine: _FakeEngine) -> None:
+    audio_data = base64.b64encode(b"RIFF-audio").decode()
+    response = client.post("/v1/voice/stt", json={"audio_data": audio_data})
+    assert response.status_code == 200
+    assert engine.audio == [b"RIFF-audio"]
+
+
+def test_transcribe_base64_decodes_large_payload_in_thread(
+    client: TestClient, engine: _FakeEngine
+) -> None:
+    audio = bytes(range(256)) * 512
+    audio_data = base64.b64encode(audio).decode()
+    assert len(audio_data) >= voice_main.INLINE_BASE64_LIMIT
+
+    response = client.post("/v1/voice/stt", json={"audio_data": audio_data})
+    assert response.status_code == 200
+    assert engine.audio == [audio]
+
+
+def test_transcribe_base64_rejects_invalid_payload(client: TestClient, engine: _FakeEngine) -> None:
+    response = client.post("/v1/voice/stt", json={"audio_data": "not-base64!"})
+    assert response.status_code == 400
+    assert engine.audio == []
+
+
+def test_transcribe_raw_long_audio_runs_in_thread(
+    client: TestClient, engine: _FakeEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(voice_main, "STT_LONG_THRESHOLD_BYTES", 4)
+
+    response = client.post("/v1/voice/stt/raw", content=b"RIFF-audio")
+    assert response.status_code == 200
+    assert response.json()["text"] == "hello long"
+    assert engine.threaded == [b"RIFF-audio"]
+    assert engine.batch_sizes == [voice_main.STT_BATCH_SIZE]
+    assert engine.audio == []
+
+
+def test_transcribe_file_streams_upload(client: TestClient, engine: _FakeEngine) -> None:
+    response = client.post(
+        "/v1/voice/stt/file", files={"file": ("clip.wav", b"RIFF-upload", "audio/wav")}
+    )
+    assert response.status_code == 200
+    assert response.json()["text"] == "hello file"
+    assert engine.streamed == [b"RIFF-upload"]
+    assert engine.batch_sizes == [1]
+    assert engine.audio == []
+
+    response = client.post("/v1/voice/stt/file", files={"file": ("empty.wav", b"", "audio/wav")})
+    assert response.status_code == 400
+
+
+def test_server_recording_start_resets_language(
+    client: TestClient, engine: _FakeEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(voice_main, "server_audio", _FakeServerAudio())
+
+    response = client.post("/v1/voice/server-audio/start", json={})
+    assert response.status_code == 200
+    assert engine.language_resets == 1
+
+
+def test_build_transcription_outputs(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(voice_main, "current_voice_model", ModelSize.TINY)
+    result = {"text": "hi", "duration": 0.5, "language": "en", "language_probability": 0.9}
+
+    history_entry, response = voice_main._build_transcription_outputs(
+        result, "server-audio", audio_duration_seconds=2.0
+    )
+
+    assert history_entry["source"] == "server-audio"
+    assert history_entry["model"] == response["model"] == "tiny"
+    assert history_entry["audio_duration_seconds"] == response["audio_duration_seconds"] == 2.0
+    assert "language_probability" not in history_entry
+    assert voice_main.StopRecordingResponse.model_validate(response).text == "hi"
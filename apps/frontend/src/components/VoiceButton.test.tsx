@@ -91,26 +91,6 @@ describe('VoiceButton', () => {
       } as unknown as MediaDevices,
     });
 
-    // Mock FileReader
-    class MockFileReader {
-      result: string | null = null;
-      onloadend: (() => void) | null = null;
-
-      readAsDataURL() {
-        // Simulate base64 audio data
-        this.result = 'data:audio/wav;base64,UklGRiQAAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YQAAAAA=';
-        if (this.onloadend) {
-          setTimeout(() => {
-            if (this.onloadend) {
-              this.onloadend();
-            }
-          }, 0);
-        }
-      }
-    }
-
-    global.FileReader = MockFileReader as unknown as typeof FileReader;
-
     // Mock fetch
     global.fetch = vi.fn(async () => ({
       ok: true,
@@ -206,11 +186,11 @@ describe('VoiceButton', () => {
 
     await waitFor(() => {
       expect(fetch).toHaveBeenCalledWith(
-        'http://localhost:3003/v1/voice/stt',
+        'http://localhost:3003/v1/voice/stt/raw',
         expect.objectContaining({
           method: 'POST',
           headers: {
-            'Content-Type': 'application/json',
+            'Content-Type': 'audio/wav',
           },
         })
       );
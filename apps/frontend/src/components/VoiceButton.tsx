@@ -152,37 +152,26 @@ export const VoiceButton: React.FC<VoiceButtonProps> = ({
       // Convert to 16-bit PCM WAV
       const wavBlob = audioBufferToWav(decodedAudio);
       
-      // Convert to base64
-      const reader = new FileReader();
-      reader.readAsDataURL(wavBlob);
-      
-      reader.onloadend = async () => {
-        const base64Audio = reader.result as string;
-        const base64Data = base64Audio.split(',')[1];
-
-        // Send to STT endpoint
-        const response = await fetch(`${VOICE_API_URL}/v1/voice/stt`, {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            audio_data: base64Data
-          })
-        });
+      // Send the WAV bytes as-is; the raw endpoint skips base64 encoding
+      const response = await fetch(`${VOICE_API_URL}/v1/voice/stt/raw`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'audio/wav',
+        },
+        body: wavBlob
+      });
 
-        if (!response.ok) {
-          throw new Error(`Transcription failed: ${response.statusText}`);
-        }
+      if (!response.ok) {
+        throw new Error(`Transcription failed: ${response.statusText}`);
+      }
 
-        const result = await response.json() as { text: string };
-        const normalizedText = result.text.trim();
-        setTranscript(normalizedText);
+      const result = await response.json() as { text: string };
+      const normalizedText = result.text.trim();
+      setTranscript(normalizedText);
 
-        if (normalizedText && onTranscript) {
-          onTranscript(normalizedText);
-        }
-      };
+      if (normalizedText && onTranscript) {
+        onTranscript(normalizedText);
+      }
 
       await audioContext.close();
 
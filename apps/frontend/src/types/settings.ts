@@ -1,6 +1,7 @@
 export interface Settings {
   // Voice/AI models
   voice_model: string;
+  voice_compute_type?: string;
   llm_model: string | null;
   stt_enabled: boolean;
   tts_enabled: boolean;
@@ -110,7 +110,7 @@ User=womcast
 WorkingDirectory=$INSTALL_DIR/apps/backend
 Environment="PATH=$INSTALL_DIR/.venv/bin:/usr/local/bin:/usr/bin:/bin"
 Environment="WHISPER_CACHE_DIR=$DATA_DIR/models/whisper"
-ExecStart=$INSTALL_DIR/.venv/bin/uvicorn voice.main:app --host 0.0.0.0 --port 3003
+ExecStart=$INSTALL_DIR/.venv/bin/uvicorn voice.main:app --host 0.0.0.0 --port 3003 --loop uvloop
 Restart=always
 RestartSec=5
 
@@ -5,27 +5,58 @@ Tests USB auto-mount functionality and permissions.
 """
 
 import os
+import re
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Set, Tuple
 
 
-def check_mount_point(path: str) -> Tuple[bool, str]:
+MOUNTINFO = "/proc/self/mountinfo"
+
+
+def _unescape_mount_path(field: str) -> str:
+    """Decode the octal escapes (e.g. \\040 for space) used in mountinfo."""
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+def mounted_paths() -> Optional[Set[str]]:
+    """Read every mount point in one pass, or None if mountinfo is unavailable."""
+    try:
+        with open(MOUNTINFO, encoding="utf-8", errors="surrogateescape") as f:
+            return {_unescape_mount_path(line.split()[4]) for line in f}
+    except OSError:
+        return None
+
+
+def _is_mount(path: str, mounts: Optional[Set[str]]) -> bool:
+    if mounts is None:
+        return Path(path).is_mount()
+    return path in mounts
+
+
+def check_mount_point(path: str, mounts: Optional[Set[str]] = None) -> Tuple[bool, str]:
     """Check if path is mounted and accessible."""
-    path_obj = Path(path)
+    if mounts is None:
+        mounts = mounted_paths()
     
-    if not path_obj.exists():
+    try:
+        os.stat(path)
+    except FileNotFoundError:
         return False, f"Path does not exist: {path}"
     
-    if not path_obj.is_mount():
+    if not _is_mount(path, mounts):
         return False, f"Path is not a mount point: {path}"
     
     # Check read access
     if not os.access(path, os.R_OK):
         return False, f"No read access to: {path}"
     
+    # A read-only mount can never pass the write probe
+    if os.statvfs(path).f_flag & os.ST_RDONLY:
+        return False, f"Mounted read-only: {path}"
+    
     # Check write access (for womcast user)
-    test_file = path_obj / ".womcast_test"
+    test_file = Path(path) / ".womcast_test"
     try:
         test_file.touch()
         test_file.unlink()
@@ -36,29 +67,33 @@ def check_mount_point(path: str) -> Tuple[bool, str]:
         return False, f"Error testing write access: {e}"
 
 
-def list_usb_mounts() -> List[str]:
+def list_usb_mounts(mounts: Optional[Set[str]] = None) -> List[str]:
     """List all USB mount points in /media/."""
-    media_dir = Path("/media")
+    media_dir = "/media"
     
-    if not media_dir.exists():
+    try:
+        entries = list(os.scandir(media_dir))
+    except FileNotFoundError:
         print("WARNING: /media directory does not exist")
         return []
     
-    mounts = []
-    for item in media_dir.iterdir():
-        if item.is_dir() and item.is_mount():
-            mounts.append(str(item))
+    if mounts is None:
+        mounts = mounted_paths()
     
-    return mounts
+    # A mount point is always a directory, so no separate is_dir() check
+    return [entry.path for entry in entries if _is_mount(entry.path, mounts)]
 
 
-def check_system_exclusions() -> List[str]:
+def check_system_exclusions(mounts: Optional[Set[str]] = None) -> List[str]:
     """Check that system directories are not included in media mounts."""
     forbidden_mounts = ["/boot", "/", "/home", "/usr", "/var", "/etc"]
     
+    if mounts is None:
+        mounts = mounted_paths()
+    
     issues = []
     for mount in forbidden_mounts:
-        if Path(mount).exists() and Path(mount).is_mount():
+        if _is_mount(mount, mounts):
             # Check if it's in our media directory (shouldn't be)
             media_path = Path("/media") / Path(mount).name
             if media_path.exists():
@@ -78,9 +113,12 @@ def main() -> int:
     if user != "womcast" and os.geteuid() != 0:
         print("WARNING: Should run as 'womcast' user or root\n")
     
+    # Read the mount table once and share it between the checks
+    mount_table = mounted_paths()
+    
     # List all USB mounts
     print("\n--- Detected USB Mounts ---")
-    mounts = list_usb_mounts()
+    mounts = list_usb_mounts(mount_table)
     
     if not mounts:
         print("No USB drives mounted in /media/")
@@ -92,7 +130,7 @@ def main() -> int:
     
     all_ok = True
     for mount in mounts:
-        ok, message = check_mount_point(mount)
+        ok, message = check_mount_point(mount, mount_table)
         status = "✓" if ok else "✗"
         print(f"  {status} {message}")
         if not ok:
@@ -100,7 +138,7 @@ def main() -> int:
     
     # Check system exclusions
     print("\n--- System Directory Exclusions ---")
-    issues = check_system_exclusions()
+    issues = check_system_exclusions(mount_table)
     
     if issues:
         print("✗ Issues found:")